@@ -1,35 +1,97 @@
+import argparse
 import cv2
+import socket
 import face_recognition
-import numpy as np
-import os
 import time
-import pickle
 from datetime import datetime, date
-from gtts import gTTS
-import threading
 import json
 import sqlite3
-from picamera2 import Picamera2
-import subprocess
 from collections import deque
 from pathlib import Path
-from threading import Lock
+from matcher import GalleryMatcher
+from hot_reload import HotReloader
+from tracker import FaceTracker
+from voting import IdentityVoter
+from scheduler import RecognitionScheduler
+from recog_worker import RecognitionWorker, RecognitionResult
+from frame_ring import FrameRing
+from frame_source import open_source
+from capture import CaptureThread
+from detector import MotionGate, make_detector
+from display import DisplayPower
+from db_writer import AttendanceWriter
+from sync import SyncClient
+from tts import AudioOutput, Speaker, make_engine, phrases_for
+from tts_cache import TTSCache
+from metrics import Registry, MetricsServer, JsonDumper
+from compositor import Compositor, Sprite
 
 # ----------------- CONFIG -----------------
 DB_PATH = "/home/telkom/absensi/data.db"
 ENCODING_FILE = "/home/telkom/absensi/encodings.pkl"
+GALLERY_FILE = "/home/telkom/absensi/encodings.gal"    # format memmap, dipakai kalau ada
 USERS_FILE = "/home/telkom/absensi/users.json"
-TTS_CACHE_DIR = "/tmp/tts_cache_absen"    # cached tts files per name+mode
+DB_QUEUE_MAX = 1000     # record antre maksimal sebelum submit menunggu (back-pressure)
+DB_BATCH = 64           # record per commit
+DB_FLUSH_SEC = 0.2      # batch ditulis paling lambat setelah segini detik
+# SYNC multi-kiosk (sync.py / sync_server.py): outbox lokal dikirim ke aggregation service
+SYNC_URL = ""           # http://<server>:9200 atau unix:/run/absensi-sync.sock, kosong = mati
+KIOSK_ID = socket.gethostname()
+SYNC_INTERVAL = 2.0     # detik antar sync (backlog dikirim beruntun tanpa menunggu)
+SYNC_BATCH = 500        # baris outbox per round trip
+TTS_CACHE_DIR = "/home/telkom/absensi/tts_cache"    # clip TTS persisten (content-addressed)
+TTS_CACHE_MB = 64       # batas ukuran cache di disk (LRU)
+TTS_CACHE_MAX_DAYS = 180    # clip yang tidak dipakai selama ini dibuang
 TTS_LANG = "id"
+TTS_ENGINE = "espeak"   # espeak (offline) / gtts (online) / stub
+TTS_LRU_MB = 32         # PCM kalimat yang disimpan di memory
 
 # DISPLAY / PERFORMANCE
 SCREEN_W = 1024
 SCREEN_H = 600
 CAM_WIDTH = 640    # camera capture width
 CAM_HEIGHT = 480  # camera capture height
-PROCESS_SCALE = 0.25    # scale for recognition (0.25 => 160x120 if camera 640x480)
-RECOG_EVERY_N_FRAMES = 6  # 1 recognition every N frames
+FRAME_SOURCE = "picamera"   # picamera / cv:0 / replay:<folder|video> / synthetic (lihat frame_source.py)
+FRAME_RING_SLOTS = 4   # slot ring buffer kamera (consumer boleh tertinggal slot-2 frame)
+FRAME_WAIT = 0.1       # detik, UI loop menunggu frame baru paling lama segini
+# SLEEP MODE: kamera pindah ke stream kecil & jarang, hanya motion detector yang jalan
+SLEEP_AFTER_NO_FACE = 8     # deteksi berturut-turut tanpa wajah sebelum layar dimatikan
+IDLE_SIZE = (160, 120)
+IDLE_FPS = 5.0              # wake latency <= 1/IDLE_FPS + ganti mode kamera
+IDLE_MOTION_FRACTION = 0.01 # porsi pixel berubah untuk bangun
+IDLE_SETTLE_FRAMES = 3      # frame pertama setelah ganti mode diabaikan (auto-exposure)
+BACKLIGHT = ""              # path bl_power, kosong = cari di /sys/class/backlight
+PROCESS_SCALE = 0.25    # scale awal for recognition (0.25 => 160x120 if camera 640x480)
+RECOG_EVERY_N_FRAMES = 6  # cadence awal: 1 recognition every N frames
+# batas untuk adaptive scheduler (cadence & scale diubah otomatis saat jalan)
+RECOG_MIN_EVERY = 2
+RECOG_MAX_EVERY = 15
+PROCESS_SCALE_MIN = 0.2
+PROCESS_SCALE_MAX = 0.35
+TARGET_IDENTIFY_MS = 400   # target latency wajah muncul -> teridentifikasi
+RECOG_CPU_BUDGET = 0.5     # maksimal porsi waktu loop untuk detect+encode+match
 DIST_TOLERANCE = 0.45
+# identitas per track diputuskan dari beberapa encoding (voting.py, bench/bench_vote.py)
+VOTE_WINDOW = 5             # maks sample evidence per track
+VOTE_WINDOW_SEC = 3.0       # sample lebih lama dari ini dibuang
+VOTE_MIN = 2                # minimal match ke nama yang sama sebelum di-commit
+VOTE_RATIO = 0.6            # porsi jendela yang harus setuju
+VOTE_ACCEPT_DIST = 0.42     # rata-rata distance maksimal nama pemenang
+VOTE_INSTANT_DIST = 0.35    # satu match sedekat ini langsung di-commit
+VOTE_REJECT = 3             # sample UNKNOWN sebelum track ditolak
+MARK_COOLDOWN_SEC = 3.0     # orang yang sama tidak diproses ulang di mode yang sama selama N detik
+DETECTOR = "hog"        # hog / yunet / haar (lihat detector.py & bench/bench_detector.py)
+YUNET_MODEL = "/home/telkom/absensi/models/face_detection_yunet_2023mar.onnx"
+MOTION_GATE = True      # scene diam & tidak ada track -> deteksi dilewati
+MOTION_MIN_FRACTION = 0.005   # porsi pixel thumbnail yang harus berubah
+MOTION_KEEPALIVE_SEC = 2.0    # deteksi tetap jalan minimal sekali per N detik
+MATCH_INDEX = "auto"    # exact / ivf / auto (ivf kalau gallery >= 20k encodings)
+IVF_NPROBE = 8          # cluster yang discan per query (lihat bench/bench_ann.py)
+GALLERY_COMPACT = False  # True: encoding per orang diringkas jadi prototype saat load (gallery_compact.py)
+RELOAD_INTERVAL = 2.0   # detik, cek perubahan encodings / users.json
+METRICS_PORT = 9108     # http://127.0.0.1:9108/metrics (Prometheus) & /metrics.json, 0 = mati
+METRICS_JSON = ""       # path dump JSON periodik (kosong = mati)
+METRICS_JSON_SEC = 10.0
 
 # UI buttons
 BTN_W = 260
@@ -38,6 +100,36 @@ BTN_Y = SCREEN_H - BTN_H - 20
 BTN_MASUK = (80, BTN_Y, 80 + BTN_W, BTN_Y + BTN_H)
 BTN_PULANG = (SCREEN_W - BTN_W - 80, BTN_Y, SCREEN_W - 80, BTN_Y + BTN_H)
 
+# ----------------- CLI -----------------
+parser = argparse.ArgumentParser(description="Kiosk absensi wajah")
+parser.add_argument("--source", default=FRAME_SOURCE,
+                    help="sumber frame: picamera, cv:0, replay:<folder|video>, synthetic[:N]")
+parser.add_argument("--fps", type=float, default=None,
+                    help="laju replay/synthetic (default: secepat mungkin)")
+parser.add_argument("--loop", action="store_true", help="replay diulang terus")
+parser.add_argument("--headless", action="store_true",
+                    help="tanpa window & tanpa kontrol layar (benchmark / server)")
+parser.add_argument("--seconds", type=float, default=None, help="berhenti otomatis setelah N detik")
+parser.add_argument("--detector", default=DETECTOR, help="hog / yunet / haar")
+parser.add_argument("--metrics-port", type=int, default=METRICS_PORT, help="port endpoint metrics (0 = mati)")
+parser.add_argument("--sync", default=SYNC_URL, help="URL aggregation service (kosong = sync mati)")
+parser.add_argument("--kiosk-id", default=KIOSK_ID, help="nama kiosk ini di aggregation service")
+parser.add_argument("--metrics-json", default=METRICS_JSON, help="dump metrics JSON periodik ke file ini")
+ARGS = parser.parse_args()
+HEADLESS = ARGS.headless
+
+# ----------------- METRICS -----------------
+# Histogram bucket tetap per stage (perf_counter, detik). Biaya per observasi
+# ~1 us, jauh di bawah 1% frame time (lihat bench/bench_metrics.py).
+metrics = Registry()
+STAGE_SECONDS = metrics.histogram("absensi_stage_seconds", "durasi per stage pipeline", labels=("stage",))
+RECOG_LATENCY = metrics.histogram("absensi_recog_latency_seconds", "frame ditangkap -> hasil recognition siap")
+FRAMES_TOTAL = metrics.counter("absensi_frames_total", "frame per sisi pipeline", labels=("side",))
+TAPS_TOTAL = metrics.counter("absensi_attendance_total", "hasil tap absensi", labels=("result",))
+
+def observe_stage(stage, seconds):
+    STAGE_SECONDS.observe(seconds, stage=stage)
+
 # Ensure cache dir
 Path(TTS_CACHE_DIR).mkdir(parents=True, exist_ok=True)
 
@@ -46,215 +138,147 @@ if not Path(USERS_FILE).exists():
     print("❌ users.json tidak ditemukan:", USERS_FILE)
     raise SystemExit(1)
 
-with open(USERS_FILE, "r") as f:
-    INFO_ORANG = json.load(f)
+def load_users():
+    with open(USERS_FILE, "r") as f:
+        return json.load(f)
 
-if not Path(ENCODING_FILE).exists():
-    print("❌ encodings.pkl tidak ditemukan:", ENCODING_FILE)
-    raise SystemExit(1)
+def load_matcher():
+    # encodings.gal (memmap, tanpa pickle) lebih diutamakan; encodings.pkl sebagai fallback
+    path = GALLERY_FILE if Path(GALLERY_FILE).exists() else ENCODING_FILE
+    return GalleryMatcher.load(path, compact=GALLERY_COMPACT, index=MATCH_INDEX, nprobe=IVF_NPROBE)
 
-with open(ENCODING_FILE, "rb") as f:
-    data = pickle.load(f)
+if not Path(GALLERY_FILE).exists() and not Path(ENCODING_FILE).exists():
+    print("❌ encodings.gal / encodings.pkl tidak ditemukan:", ENCODING_FILE)
+    raise SystemExit(1)
 
-encodeListKnown = data.get("encodings", [])
-names = data.get("names", [])
+# gallery di-load sekali ke matrix float32, dipakai untuk semua wajah per frame.
+# Setelah train.py / edit users.json, data baru di-load di background thread
+# dan di-swap di antara frame (tidak perlu restart kiosk).
+users_reloader = HotReloader([USERS_FILE], load_users, RELOAD_INTERVAL, name="users").start()
+gallery_reloader = HotReloader([GALLERY_FILE, ENCODING_FILE], load_matcher, RELOAD_INTERVAL,
+                               name="gallery").start()
 
 # ----------------- THREAD-SAFE FRAME CAPTURE -----------------
-frame_lock = Lock()
-latest_frame = None       # Frame RGB (dari Picam) untuk Display & Recognition
-capture_running = True
-
-def camera_thread_func():
-    global latest_frame, capture_running
-    picam = Picamera2()
-    # Kembali ke RGB888, dan TIDAK ADA KONVERSI
-    config = picam.create_preview_configuration(main={"size": (CAM_WIDTH, CAM_HEIGHT), "format": "RGB888"})
-    picam.configure(config)
-    picam.start()
-    try:
-        while capture_running:
-            arr = picam.capture_array()    # <-- RGB asli (Picamera2)
-            if arr is None:
-                continue
-
-            with frame_lock:
-                # Hanya simpan array RGB mentah
-                latest_frame = arr.copy()            
-
-            time.sleep(0.001)
-
-    except Exception as e:
-        print("❌ Camera thread error:", e)
-    finally:
-        try:
-            picam.stop()
-        except:
-            pass
-
-# Start camera thread
-cam_thread = threading.Thread(target=camera_thread_func, daemon=True)
-cam_thread.start()
-
-# ----------------- DATABASE HELPERS (threaded writes) -----------------
-def init_db():
-    try:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS absensi (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                nama TEXT NOT NULL,
-                date TEXT NOT NULL,
-                time TEXT NOT NULL,
-                mode TEXT NOT NULL,
-                status TEXT NOT NULL
-            );
-        """)
-        conn.commit()
-        conn.close()
-    except Exception as e:
-        print("❌ Init DB Error:", e)
-
-def db_insert_worker(record):
-    try:
-        conn = sqlite3.connect(DB_PATH, timeout=5)
-        cursor = conn.cursor()
-        cursor.execute("""
-            INSERT INTO absensi (nama, date, time, mode, status)
-            VALUES (?, ?, ?, ?, ?)
-        """, (record['name'], record['date'], record['time'], record['mode'], record['status']))
-        conn.commit()
-        conn.close()
-        # print minimal log
-        print(f"[DB] {record['date']} {record['time']} | {record['name']} | {record['mode']} | {record['status']}")
-    except Exception as e:
-        print("❌ SQLite Error (thread):", e)
+# Frame RGB (dari Picam) untuk Display & Recognition: ring buffer yang dialokasikan
+# sekali, consumer dapat view read-only per sequence (tanpa copy per frame).
+frame_ring = FrameRing(FRAME_RING_SLOTS, (CAM_HEIGHT, CAM_WIDTH, 3))
+# Picamera2 RGB888 di Pi; kamera USB / file replay / sintetis untuk test & benchmark
+frame_source = open_source(ARGS.source, (CAM_WIDTH, CAM_HEIGHT), fps=ARGS.fps, loop=ARGS.loop)
+# replay/synthetic tanpa --fps: camera thread menunggu UI mengambil tiap frame (tidak ada frame terlewat)
+lockstep = not frame_source.live and not ARGS.fps
+# sleep mode: camera thread pindah ke stream idle (motion detector saja) sampai ada gerakan
+capture = CaptureThread(frame_source, frame_ring, lockstep=lockstep, idle_size=IDLE_SIZE, idle_fps=IDLE_FPS,
+                        idle_motion=IDLE_MOTION_FRACTION, idle_settle=IDLE_SETTLE_FRAMES,
+                        timer=lambda stage: STAGE_SECONDS.time(stage=stage),
+                        on_frame=lambda: FRAMES_TOTAL.inc(side="camera")).start()
+
+# ----------------- DATABASE (single writer thread) -----------------
+# Satu koneksi writer + queue terbatas, WAL, group commit per batch
+db_writer = AttendanceWriter(DB_PATH, max_queue=DB_QUEUE_MAX, batch_size=DB_BATCH,
+                             flush_interval=DB_FLUSH_SEC).start()
+# absensi hari ini di-load sekali ke memory: cek duplikat per tap tidak baca disk
+db_writer.warm(date.today().isoformat())
+db_writer.observer = observe_stage
+
+# offline-first: tap selalu masuk data.db lokal dulu; outbox dikirim di background dan
+# absensi kiosk lain (hari ini) masuk ke ledger, jadi cek duplikat berlaku lintas pintu
+sync_client = None
+if ARGS.sync:
+    print(f"[sync] kiosk {ARGS.kiosk_id} -> {ARGS.sync}")
+    sync_client = SyncClient(DB_PATH, ARGS.kiosk_id, ARGS.sync, interval=SYNC_INTERVAL, batch=SYNC_BATCH,
+                             on_ledger=db_writer.mark_remote).start()
 
 def save_to_sqlite_async(name, date_, time_, mode, status):
-    record = {'name': name, 'date': date_, 'time': time_, 'mode': mode, 'status': status}
-    t = threading.Thread(target=db_insert_worker, args=(record,), daemon=True)
-    t.start()
+    return db_writer.submit(name, date_, time_, mode, status)
 
 def check_already_absent(name, date_, mode):
+    # hari ini: dari ledger di memory (termasuk record yang belum ter-commit)
     try:
-        conn = sqlite3.connect(DB_PATH, timeout=3)
-        cursor = conn.cursor()
-        cursor.execute("""
-            SELECT 1 FROM absensi
-            WHERE nama = ? AND date = ? AND mode = ?
-            LIMIT 1
-        """, (name, date_, mode))
-        row = cursor.fetchone()
-        conn.close()
-        return row is not None
-    except Exception as e:
+        with STAGE_SECONDS.time(stage="db_check"):
+            return db_writer.exists(name, date_, mode)
+    except sqlite3.Error as e:
         print("❌ SQLite check error:", e)
         return False
 
-init_db()
-
-# ----------------- TTS: cached generation + non-blocking playback -----------------
-def tts_filename_for(name, mode):
-    safe = name.replace(" ", "_").lower()
-    fn = f"tts_{safe}_{mode.lower()}.mp3"
-    return os.path.join(TTS_CACHE_DIR, fn)
-
-def generate_tts_file(text, filepath):
-    try:
-        tts = gTTS(text=text, lang=TTS_LANG)
-        tts.save(filepath)
-        # small sleep to ensure file visible to player
-        time.sleep(0.05)
-    except Exception as e:
-        print("❌ gTTS generation error:", e)
-
-def play_audio_nonblocking(filepath):
-    # Using mpg123 in background (non-blocking)
-    try:
-        subprocess.Popen(["mpg123", "-q", filepath], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except Exception as e:
-        try:
-            os.system(f"mpg123 '{filepath}' >/dev/null 2>&1 &")
-        except:
-            pass
-
-def speak_cached(name, mode, fallback_text=None):
-    """
-    Play cached TTS for (name,mode). If file missing, start generating in background and play
-    after generation (background). If generation takes too long, fallback to a short generic beep speech.
-    """
-    filepath = tts_filename_for(name, mode)
-    if os.path.exists(filepath):
-        # fast path: play immediately non-blocking
-        play_audio_nonblocking(filepath)
-        return
-
-    # prepare message
-    if fallback_text is None:
-        if mode.upper() == "MASUK":
-            text = f"Terima kasih, absensi masuk {name} berhasil"
-        else:
-            text = f"Terima kasih, absensi pulang {name} berhasil. Hati-hati di jalan."
-    else:
-        text = fallback_text
-
-    # generate in background and play when done
-    def gen_and_play():
-        try:
-            generate_tts_file(text, filepath)
-            play_audio_nonblocking(filepath)
-        except Exception as e:
-            print("❌ TTS gen+play error:", e)
-
-    t = threading.Thread(target=gen_and_play, daemon=True)
-    t.start()
-
-# Small helper to force-generate & play a one-off TTS (used for duplicate notices)
-def speak_force(text):
-    try:
-        # use a temp filename with timestamp to avoid race/collision
-        ts = int(time.time() * 1000)
-        filepath = os.path.join("/tmp", f"tts_force_{ts}.mp3")
-        generate_tts_file(text, filepath)
-        play_audio_nonblocking(filepath)
-    except Exception as e:
-        print("❌ speak_force error:", e)
+# ----------------- TTS: pre-render offline + satu output audio -----------------
+# Kalimat semua user di-render di background saat start & saat users.json berubah,
+# PCM disimpan di LRU; tap hanya mengantrekan PCM ke satu proses aplay.
+try:
+    tts_engine = make_engine(TTS_ENGINE, TTS_LANG)
+except Exception as e:
+    print(f"❌ TTS engine {TTS_ENGINE} tidak bisa dipakai ({e}), pakai nada (stub)")
+    tts_engine = make_engine("stub")
+tts_cache = TTSCache(TTS_CACHE_DIR, max_bytes=TTS_CACHE_MB * 1024 * 1024, max_age_days=TTS_CACHE_MAX_DAYS)
+speaker = Speaker(tts_engine, tts_cache,
+                  output=AudioOutput("null" if HEADLESS else "aplay"),
+                  lru_bytes=TTS_LRU_MB * 1024 * 1024).start()
+speaker.observer = observe_stage
+
+def prerender_users(users):
+    speaker.prerender_async(text for name in users for text in phrases_for(name).values())
+
+prerender_users(users_reloader.current())
+users_reloader.on_change = prerender_users
+
+def speak_cached(name, mode):
+    with STAGE_SECONDS.time(stage="tts_enqueue"):
+        speaker.speak(phrases_for(name)[mode])
 
 # ----------------- UI helpers (lightweight popup) -----------------
 POPUP_TEXT = ""
 POPUP_COLOR = (0, 255, 0)
 POPUP_EXPIRE = 0
 
-def show_popup_overlay(display_frame, text, color):
-    # lightweight semi-transparent rectangle with text (no heavy blur)
-    h, w, _ = display_frame.shape
-    box_w, box_h = min(700, w-40), 140
-    x1 = (w - box_w) // 2
-    y1 = 10
-    x2 = x1 + box_w
-    y2 = y1 + box_h
-    overlay = display_frame.copy()
-    alpha = 0.55
-    cv2.rectangle(overlay, (x1, y1), (x2, y2), (30,30,30), -1)
-    cv2.addWeighted(overlay, alpha, display_frame, 1 - alpha, 0, display_frame)
-    cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
-
-    # draw text lines
+# tombol & popup di-render sekali sebagai sprite BGRA (compositor.py); per frame hanya
+# region-nya yang di-blend, teks popup di-render ulang hanya kalau isinya berubah
+ui = Compositor()
+
+def render_popup(text, border, w):
     lines = text.split("\n")
-    for i, line in enumerate(lines):
-        cv2.putText(display_frame, line, (x1 + 20, y1 + 35 + i*30),
-                    cv2.FONT_HERSHEY_SIMPLEX, 0.75, (255,255,255), 2, cv2.LINE_AA)
+    box_w, box_h = min(700, w-40), max(140, 50 + 30 * len(lines))
+
+    def draw(color, alpha):
+        # semi-transparent rectangle (alpha 0.55) + border + text lines
+        for img, bg, fg in ((color, (30, 30, 30), border), (alpha, 140, 255)):
+            cv2.rectangle(img, (1, 1), (box_w + 1, box_h + 1), bg, -1)
+            cv2.rectangle(img, (1, 1), (box_w + 1, box_h + 1), fg, 2)
+            for i, line in enumerate(lines):
+                cv2.putText(img, line, (21, 36 + i*30), cv2.FONT_HERSHEY_SIMPLEX, 0.75,
+                            (255, 255, 255) if img is color else 255, 2, cv2.LINE_AA)
+    return Sprite.render((box_w + 3, box_h + 3), draw, pos=((w - box_w) // 2 - 1, 9))
+
+def render_button(coords, text, bg):
+    x1, y1, x2, y2 = coords
+    bw, bh = x2 - x1, y2 - y1
+
+    def draw(color, alpha):
+        (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.05, 3)
+        for img, shadow, fill, edge, ink in ((color, (30, 30, 30), bg, (40, 40, 40), (0, 0, 0)),
+                                             (alpha, 255, 255, 255, 255)):
+            cv2.rectangle(img, (4, 4), (bw + 4, bh + 4), shadow, -1)
+            cv2.rectangle(img, (1, 1), (bw + 1, bh + 1), fill, -1)
+            cv2.rectangle(img, (1, 1), (bw + 1, bh + 1), edge, 2)
+            cv2.putText(img, text, ((BTN_W - tw)//2 + 1, (BTN_H + th)//2 - 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.05, ink, 3)
+    return Sprite.render((bw + 5, bh + 5), draw, pos=(x1 - 1, y1 - 1))
+
+def show_popup_overlay(display_frame, text, color):
+    ui.draw(display_frame, "popup", (text, color, display_frame.shape[1]),
+            lambda: render_popup(text, color, display_frame.shape[1]))
+
+def draw_faces(frame, result):
+    # box + nama tiap wajah yang teridentifikasi (koordinat frame kecil -> layar)
+    fx = SCREEN_W / (CAM_WIDTH * result.scale)
+    fy = SCREEN_H / (CAM_HEIGHT * result.scale)
+    for (top, right, bottom, left), name in zip(result.boxes, result.names):
+        p1 = (int(left * fx), int(top * fy))
+        p2 = (int(right * fx), int(bottom * fy))
+        cv2.rectangle(frame, p1, p2, (255, 255, 0), 2)
+        cv2.putText(frame, name.upper(), (p1[0], max(p1[1] - 8, 20)),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 0), 2, cv2.LINE_AA)
 
 def draw_button(frame, coords, text, color):
-    x1, y1, x2, y2 = coords
-    # shadow
-    cv2.rectangle(frame, (x1+3, y1+3), (x2+3, y2+3), (30, 30, 30), -1)
-    cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
-    cv2.rectangle(frame, (x1, y1), (x2, y2), (40,40,40), 2)
-    (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.05, 3)
-    tx = x1 + (BTN_W - tw)//2
-    ty = y1 + (BTN_H + th)//2 - 6
-    cv2.putText(frame, text, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, 1.05, (0, 0, 0), 3)
+    ui.draw(frame, ("button", text), (coords, color), lambda: render_button(coords, text, color))
 
 # ----------------- Mouse callback -----------------
 MODE = None
@@ -263,174 +287,330 @@ def on_click(event, x, y, flags, param):
     if event == cv2.EVENT_LBUTTONDOWN:
         if BTN_MASUK[0] <= x <= BTN_MASUK[2] and BTN_MASUK[1] <= y <= BTN_MASUK[3]:
             MODE = "MASUK"
+            scheduler.boost()
         elif BTN_PULANG[0] <= x <= BTN_PULANG[2] and BTN_PULANG[1] <= y <= BTN_PULANG[3]:
             MODE = "PULANG"
+            scheduler.boost()
 
-cv2.namedWindow("ABSENSI", cv2.WINDOW_NORMAL)
-cv2.setWindowProperty("ABSENSI", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
-cv2.setMouseCallback("ABSENSI", on_click)
+if not HEADLESS:
+    cv2.namedWindow("ABSENSI", cv2.WINDOW_NORMAL)
+    cv2.setWindowProperty("ABSENSI", cv2.WND_PROP_FULLSCREEN, cv2.WINDOW_FULLSCREEN)
+    cv2.setMouseCallback("ABSENSI", on_click)
 
 # ----------------- Attendance logic -----------------
-ABSEN_LOG = {}    # memory check
 SLEEP = False
 NO_FACE_TIMER = 0
 
-def markAttendance(name):
-    global MODE, POPUP_TEXT, POPUP_COLOR, POPUP_EXPIRE, ABSEN_LOG
+def markAttendance(names):
+    """Semua orang yang teridentifikasi di frame saat tombol ditekan dicatat sekaligus
+    (identitas dari track yang sudah ada, tanpa deteksi tambahan)."""
+    global POPUP_TEXT, POPUP_COLOR, POPUP_EXPIRE
 
     if MODE is None:
         return
 
     today = date.today().isoformat()
+    now = datetime.now()
+    time_now = now.strftime("%H:%M:%S")
+    users = users_reloader.current()
+    marked = []
+
+    for name in names:
+        # CHECK DUPLICATE (day ledger, di-warm dari DB saat start)
+        if check_already_absent(name, today, MODE):
+            # only speak the duplicate message, no popup
+            # (kalimat duplikat juga sudah di-pre-render, tidak ada file sekali pakai)
+            speak_cached(name, f"SUDAH_{MODE}")
+            TAPS_TOTAL.inc(result="duplikat")
+            continue
 
-    if name not in ABSEN_LOG or ABSEN_LOG[name].get("date") != today:
-        ABSEN_LOG[name] = {"date": today, "MASUK": False, "PULANG": False}
-
-    # CHECK DUPLICATE IN DB
-    if check_already_absent(name, today, MODE):
-        # only speak the duplicate message, no popup
-        speak_force(f"{name} sudah absen {MODE} hari ini")
-        # ensure popup disabled
-        POPUP_EXPIRE = 0
-        return
+        if MODE == "MASUK":
+            batas = now.replace(hour=8, minute=15, second=0)
+            status = "Tepat waktu" if now <= batas else "Terlambat"
+        else:
+            batas = now.replace(hour=17, minute=0, second=0)
+            status = "Pulang" if now >= batas else "Pulang sebelum waktunya"
+        # speak (cached); beberapa orang -> kalimat diantrekan berurutan di satu output audio
+        speak_cached(name, MODE)
+
+        # Save to sqlite in background
+        # (ledger langsung ditandai; kalau queue DB penuh record ditolak dan bisa tap ulang)
+        if save_to_sqlite_async(name, today, time_now, MODE, status):
+            TAPS_TOTAL.inc(result="tercatat")
+        else:
+            TAPS_TOTAL.inc(result="ditolak")
+        marked.append((name, users.get(name, {"instansi":"-", "status":"-"}), status))
 
-    # CHECK DUPLICATE IN MEMORY
-    if ABSEN_LOG[name][MODE]:
-        speak_force(f"{name} sudah absen {MODE} hari ini")
+    if not marked:
+        # ensure popup disabled (semua sudah absen)
         POPUP_EXPIRE = 0
         return
 
-    now = datetime.now()
-    time_now = now.strftime("%H:%M:%S")
-    info = INFO_ORANG.get(name, {"instansi":"-", "status":"-"})
-
-    popup_msg = (f"Name    : {name}\n"
-                 f"Instansi: {info.get('instansi','-')}\n"
-                 f"Status : {info.get('status','-')}")
-
-    if MODE == "MASUK":
-        batas = now.replace(hour=8, minute=15, second=0)
-        status = "Tepat waktu" if now <= batas else "Terlambat"
-        POPUP_COLOR = (0,200,0)
-        # speak (cached)
-        speak_cached(name, "MASUK")
-    elif MODE == "PULANG":
-        batas = now.replace(hour=17, minute=0, second=0)
-        status = "Pulang" if now >= batas else "Pulang sebelum waktunya"
-        POPUP_COLOR = (0,0,200)
-        speak_cached(name, "PULANG")
+    if len(marked) == 1:
+        name, info, _ = marked[0]
+        popup_msg = (f"Name    : {name}\n"
+                     f"Instansi: {info.get('instansi','-')}\n"
+                     f"Status : {info.get('status','-')}")
+    else:
+        popup_msg = "\n".join(f"{name} ({info.get('instansi','-')}) - {status}"
+                               for name, info, status in marked)
 
+    POPUP_COLOR = (0,200,0) if MODE == "MASUK" else (0,0,200)
     POPUP_TEXT = popup_msg
     POPUP_EXPIRE = time.time() + 4.5
 
-    # Save to sqlite in background
-    save_to_sqlite_async(name, today, time_now, MODE, status)
-    ABSEN_LOG[name][MODE] = True
-
 # ----------------- Display power (sleep mode) -----------------
+# sysfs bl_power (tanpa shell); vcgencmd langsung tanpa /bin/sh kalau tidak ada backlight
+display = DisplayPower(BACKLIGHT or None, enabled=not HEADLESS)
+
 def set_display(on):
+    display.set(on)
+
+def enter_sleep():
+    global SLEEP
+    SLEEP = True
+    set_display(False)
+    capture.sleep()    # camera thread pindah ke stream idle
+    print(f"[IDLE] layar mati, kamera {IDLE_SIZE[0]}x{IDLE_SIZE[1]} @ {IDLE_FPS:g} fps sampai ada gerakan")
+
+def wake_up():
+    global SLEEP, NO_FACE_TIMER, pending_wake
+    SLEEP = False
+    NO_FACE_TIMER = 0
+    set_display(True)
+    scheduler.set_idle(False)
+    scheduler.boost()
+    pending_wake = capture.wake_ts    # latency dicatat saat frame penuh pertama tampil
+
+# ----------------- RECOGNITION WORKER -----------------
+try:
+    face_detector = make_detector(f"yunet:{YUNET_MODEL}" if ARGS.detector == "yunet" else ARGS.detector)
+except Exception as e:
+    print(f"❌ detector {ARGS.detector} tidak bisa dipakai ({e}), pakai hog")
+    face_detector = make_detector("hog")
+motion_gate = MotionGate(min_fraction=MOTION_MIN_FRACTION, keepalive=MOTION_KEEPALIVE_SEC) if MOTION_GATE else None
+voter = IdentityVoter(window=VOTE_WINDOW, window_sec=VOTE_WINDOW_SEC, min_votes=VOTE_MIN,
+                      ratio=VOTE_RATIO, accept_dist=VOTE_ACCEPT_DIST,
+                      instant_dist=VOTE_INSTANT_DIST, reject_votes=VOTE_REJECT)
+tracker = FaceTracker(voter=voter)
+scheduler = RecognitionScheduler(
+    every_n=RECOG_EVERY_N_FRAMES, scale=PROCESS_SCALE,
+    min_every=RECOG_MIN_EVERY, max_every=RECOG_MAX_EVERY,
+    min_scale=PROCESS_SCALE_MIN, max_scale=PROCESS_SCALE_MAX,
+    target_latency_ms=TARGET_IDENTIFY_MS, cpu_budget=RECOG_CPU_BUDGET)
+scheduler.observer = observe_stage    # resize/detect/encode/match/track/draw
+process_scale = PROCESS_SCALE
+detect_seq, detect_ts, detect_faces = 0, 0.0, 0
+
+def recognize_frame(frame, frame_id, frame_ts):
+    """Jalan di thread worker: detect/encode/match atau tracking, tergantung scheduler."""
+    global process_scale, detect_seq, detect_ts, detect_faces
+
+    # recognition only on some frames (cadence diatur scheduler)
+    do_recog = scheduler.should_run()
+    if scheduler.scale != process_scale:
+        tracker.rescale(scheduler.scale / process_scale)
+        process_scale = scheduler.scale
+
+    # create small frame for recognition (scale down once)
+    with scheduler.stage("resize"):
+        small = cv2.resize(frame, (0,0), fx=process_scale, fy=process_scale, interpolation=cv2.INTER_LINEAR)
+    # `frame` adalah view ke slot ring; kalau slot sempat ditimpa kamera saat resize, frame dibuang
+    if not frame_ring.is_valid(frame_id):
+        return None
+
+    # *** TIDAK ADA KONVERSI WARNA SAMA SEKALI UNTUK FACE_RECOGNITION ***
+    # Diharapkan small (yang isinya RGB) dapat langsung digunakan oleh face_recognition.
+    rgb_small = small # Ini adalah pengganti cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+
+    faces = []
+    # scene diam & tidak ada wajah yang sedang di-track: deteksi tidak perlu jalan
+    gated = False
+    if do_recog and motion_gate is not None and not tracker.tracks:
+        with scheduler.stage("motion"):
+            gated = not motion_gate.check(rgb_small)
+    if gated:
+        # dihitung sebagai deteksi tanpa wajah, supaya timer sleep mode tetap jalan
+        detect_seq, detect_ts, detect_faces = detect_seq + 1, frame_ts, 0
+    elif do_recog:
+        # backend dipilih per deployment (DETECTOR / --detector), box format face_recognition
+        # Menggunakan RGB_small yang aslinya adalah frame RGB (atau apa pun yang dikeluarkan Picam)
+        with scheduler.stage("detect"):
+            faces = face_detector.detect(rgb_small)
+        tracks = tracker.associate(rgb_small, faces)
+        # encoding hanya untuk track baru / voting belum memutuskan / confidence turun /
+        # sudah waktunya verifikasi ulang
+        todo = [i for i, t in enumerate(tracks) if tracker.needs_encoding(t)]
+        if todo:
+            with scheduler.stage("encode"):
+                encodings = face_recognition.face_encodings(rgb_small, [faces[i] for i in todo])
+            matcher = gallery_reloader.current()    # snapshot per frame
+            # score all faces against the whole gallery in one batch (best distance per person)
+            with scheduler.stage("match"):
+                results = matcher.match(encodings, DIST_TOLERANCE)
+            # satu match = satu sample evidence; nama baru tampil setelah voter commit
+            for i, (name, dist) in zip(todo, results):
+                tracker.set_identity(tracks[i], name, dist)
+        detect_seq, detect_ts, detect_faces = detect_seq + 1, frame_ts, len(faces)
+    else:
+        with scheduler.stage("track"):
+            tracker.update(rgb_small)
+    scheduler.end_frame()
+
+    # identitas yang sudah di-commit voter & di-cache di track
+    identified = tracker.identified()
+    done_ts = time.perf_counter()
+    RECOG_LATENCY.observe(done_ts - frame_ts)
+    return RecognitionResult(
+        frame_id=frame_id, frame_ts=frame_ts, done_ts=done_ts,
+        detect_seq=detect_seq, detect_ts=detect_ts, faces=detect_faces,
+        boxes=[t.box for t in identified],
+        names=[t.name for t in identified],
+        distances=[t.distance for t in identified],
+        scale=process_scale,
+    )
+
+recog_worker = RecognitionWorker(recognize_frame).start()
+
+# nilai yang sudah dihitung komponen lain dibaca saat scrape saja (0 biaya di jalur frame)
+metrics.gauge("absensi_recog_dropped", "frame dibuang worker (masih sibuk)", fn=lambda: recog_worker.stats["dropped"])
+metrics.gauge("absensi_db_queue", "record menunggu commit", fn=db_writer.queue_size)
+metrics.gauge("absensi_db_written", "record tertulis sejak start", fn=lambda: db_writer.stats["written"])
+metrics.gauge("absensi_db_errors", "batch gagal ditulis", fn=lambda: db_writer.stats["errors"])
+metrics.gauge("absensi_sync_backlog", "baris outbox belum di-ack aggregation service",
+              fn=lambda: sync_client.stats["backlog"] if sync_client else 0)
+metrics.gauge("absensi_tts_cache_hit_ratio", "hit rate cache TTS di disk", fn=tts_cache.hit_rate)
+metrics.gauge("absensi_motion_skipped", "deteksi dilewati motion gate",
+              fn=lambda: motion_gate.stats["skipped"] if motion_gate else 0)
+metrics.gauge("absensi_identity_accepted", "identitas di-commit voter", fn=lambda: voter.stats["accepted"])
+metrics.gauge("absensi_identity_rejected", "track ditolak voter (UNKNOWN)", fn=lambda: voter.stats["rejected"])
+metrics.gauge("absensi_sleep", "layar mati (sleep mode)", fn=lambda: int(SLEEP))
+# state scheduler (sama dengan scheduler.stats() / log [SCHED]): cadence efektif termasuk boost & idle
+metrics.gauge("absensi_recog_every_n", "cadence recognition saat ini (boost / idle ikut)", fn=scheduler.current_every)
+metrics.gauge("absensi_recog_base_every_n", "cadence hasil adaptasi scheduler (mode normal)",
+              fn=lambda: scheduler.every_n)
+metrics.gauge("absensi_process_scale", "skala deteksi saat ini", fn=lambda: scheduler.scale)
+
+metrics_server = metrics_dumper = None
+if ARGS.metrics_port:
     try:
-        if on:
-            os.system("vcgencmd display_power 1")
-            os.system("echo 0 > /sys/class/backlight/rpi_backlight/bl_power")
-        else:
-            os.system("vcgencmd display_power 0")
-            os.system("echo 1 > /sys/class/backlight/rpi_backlight/bl_power")
-    except Exception:
-        pass
+        metrics_server = MetricsServer(metrics, ARGS.metrics_port).start()
+        print(f"[metrics] http://127.0.0.1:{ARGS.metrics_port}/metrics")
+    except OSError as e:
+        print(f"❌ [metrics] port {ARGS.metrics_port} tidak bisa dipakai:", e)
+if ARGS.metrics_json:
+    metrics_dumper = JsonDumper(metrics, ARGS.metrics_json, METRICS_JSON_SEC).start()
 
 # ----------------- MAIN LOOP (NON-BLOCKING) -----------------
 FRAME_COUNT = 0
-last_detected_name = "UNKNOWN"
+last_detect_seq = 0
+last_seq = 0
+last_pick = None
+pending_wake = None
+last_marked = {}    # (nama, mode) -> waktu terakhir diproses (cooldown per orang)
 t0 = time.time()
 
 try:
     while True:
-        # read latest frame produced by camera thread
-        with frame_lock:
-            # Mengambil frame yang isinya RGB dari Picam
-            frame = None if latest_frame is None else latest_frame.copy()
-
-        if frame is None:
-            # no frame yet; small wait
-            time.sleep(0.01)
+        if SLEEP:
+            # pipeline penuh berhenti; camera thread hanya menjalankan motion detector di stream idle
+            if ARGS.seconds and time.time() - t0 >= ARGS.seconds:
+                break
+            if capture.wake_event.wait(FRAME_WAIT):
+                wake_up()
+            elif capture.done.is_set():
+                break
+            # still allow exit key
+            if not HEADLESS and cv2.waitKey(1) == 27:
+                break
             continue
 
-        FRAME_COUNT += 1
+        # tunggu frame baru dari camera thread (view read-only ke slot ring, tanpa copy)
+        seq, frame, frame_ts = frame_ring.wait_newer(last_seq, timeout=FRAME_WAIT)
+        if frame is None or (seq == last_seq and capture.done.is_set()):
+            if capture.done.is_set():
+                break    # replay/synthetic selesai
+            # no frame yet
+            continue
+        if ARGS.seconds and time.time() - t0 >= ARGS.seconds:
+            break
+        new_frame = seq != last_seq
+        last_seq = seq
+        if lockstep:
+            frame_ring.consumed(seq)
 
-        # create small frame for recognition (scale down once)
-        small = cv2.resize(frame, (0,0), fx=PROCESS_SCALE, fy=PROCESS_SCALE, interpolation=cv2.INTER_LINEAR)
-        
-        # *** TIDAK ADA KONVERSI WARNA SAMA SEKALI UNTUK FACE_RECOGNITION ***
-        # Diharapkan small (yang isinya RGB) dapat langsung digunakan oleh face_recognition.
-        rgb_small = small # Ini adalah pengganti cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
-
-        # recognition only on some frames
-        do_recog = (FRAME_COUNT % RECOG_EVERY_N_FRAMES) == 0
-
-        faces = []
-        encodings = []
-        if do_recog:
-            # use hog model (faster on CPU) — can switch to 'cnn' if you have GPU
-            # Menggunakan RGB_small yang aslinya adalah frame RGB (atau apa pun yang dikeluarkan Picam)
-            faces = face_recognition.face_locations(rgb_small, model="hog")
-            if faces:
-                encodings = face_recognition.face_encodings(rgb_small, faces)
-
-        # recognition result
-        detected_name = "UNKNOWN"
-        if encodings:
-            # compare each face encoding to known encodings
-            for enc in encodings:
-                matches = face_recognition.compare_faces(encodeListKnown, enc, tolerance=DIST_TOLERANCE)
-                dist = face_recognition.face_distance(encodeListKnown, enc)
-                if len(dist) > 0:
-                    best = np.argmin(dist)
-                    if matches[best] and dist[best] < DIST_TOLERANCE:
-                        detected_name = names[best].upper()
-                        break
-
-        # Sleep mode logic
-        if do_recog:
-            if len(faces) == 0:
+        FRAME_COUNT += 1
+        FRAMES_TOTAL.inc(side="ui")
+        # frame time UI (jarak antar frame yang diambil) = penyebut overhead metrics
+        now_pick = time.perf_counter()
+        if last_pick is not None:
+            observe_stage("ui_frame", now_pick - last_pick)
+        last_pick = now_pick
+
+        # recognition jalan di worker; UI tidak pernah menunggu hasilnya
+        if new_frame:
+            recog_worker.submit(frame, frame_ts, frame_id=seq)
+        result = recog_worker.latest()
+
+        # recognition result: semua orang yang teridentifikasi di frame (urut confidence)
+        detected_names = []
+        if result is not None and result.names:
+            detected_names = list(dict.fromkeys(n.upper() for n in result.names))
+
+        # Sleep mode logic (hanya untuk hasil deteksi yang baru)
+        if result is not None and result.detect_seq != last_detect_seq:
+            last_detect_seq = result.detect_seq
+            if result.faces == 0:
                 NO_FACE_TIMER += 1
             else:
                 NO_FACE_TIMER = 0
 
-            if NO_FACE_TIMER > 8 and not SLEEP:
-                SLEEP = True
-                set_display(False)
-            if SLEEP and len(faces) >= 1:
-                SLEEP = False
-                set_display(True)
-
-        if SLEEP:
-            # still allow exit key
-            if cv2.waitKey(1) == 27:
-                break
-            continue
+            if NO_FACE_TIMER > SLEEP_AFTER_NO_FACE:
+                enter_sleep()
+                continue
+            # lama tidak ada wajah -> recognition dijarangkan
+            scheduler.set_idle(NO_FACE_TIMER > 3)
 
         # Draw UI on a copy for display
         # Menggunakan frame RGB (dari Picam) langsung untuk display, berharap OpenCV mau menampilkannya dengan benar.
-        display_frame = cv2.resize(frame, (SCREEN_W, SCREEN_H), interpolation=cv2.INTER_LINEAR)
-
-        draw_button(display_frame, BTN_MASUK, "MASUK", (0,200,0))
-        draw_button(display_frame, BTN_PULANG, "PULANG", (0,0,200))
-
-        # Popup
-        if time.time() < POPUP_EXPIRE:
-            show_popup_overlay(display_frame, POPUP_TEXT, POPUP_COLOR)
-
-        cv2.imshow("ABSENSI", display_frame)
+        with scheduler.stage("draw"):
+            display_frame = cv2.resize(frame, (SCREEN_W, SCREEN_H), interpolation=cv2.INTER_LINEAR)
+
+            if result is not None and result.boxes:
+                draw_faces(display_frame, result)
+            draw_button(display_frame, BTN_MASUK, "MASUK", (0,200,0))
+            draw_button(display_frame, BTN_PULANG, "PULANG", (0,0,200))
+
+            # Popup
+            if time.time() < POPUP_EXPIRE:
+                show_popup_overlay(display_frame, POPUP_TEXT, POPUP_COLOR)
+
+        if not HEADLESS:
+            cv2.imshow("ABSENSI", display_frame)
+        if pending_wake is not None:
+            # gerakan di stream idle -> frame penuh pertama tampil lagi
+            wake_ms = (time.perf_counter() - pending_wake) * 1000
+            observe_stage("wake", wake_ms / 1000)
+            print(f"[IDLE] bangun dalam {wake_ms:.0f} ms")
+            pending_wake = None
 
         # if button pressed (MODE set via mouse callback) and face detected -> mark attendance
-        if MODE in ["MASUK", "PULANG"] and detected_name != "UNKNOWN":
-            markAttendance(detected_name)
+        # (semua wajah yang teridentifikasi, bukan hanya yang pertama)
+        if MODE in ["MASUK", "PULANG"] and detected_names:
+            # cooldown per orang (tanpa sleep): orang yang baru diproses di mode ini dilewati,
+            # UI & recognition tetap jalan
+            now_mark = time.monotonic()
+            last_marked = {k: v for k, v in last_marked.items() if now_mark - v < MARK_COOLDOWN_SEC}
+            names = [n for n in detected_names if (n, MODE) not in last_marked]
+            if names:
+                with STAGE_SECONDS.time(stage="mark"):
+                    markAttendance(names)
+                last_marked.update(((n, MODE), now_mark) for n in names)
             MODE = None
-            # short sleep avoid double mark quickly
-            time.sleep(0.55)
 
         # Key handling
+        if HEADLESS:
+            continue
         key = cv2.waitKey(1)
         if key == 27:  # ESC
             break
@@ -439,10 +619,25 @@ except KeyboardInterrupt:
     pass
 finally:
     # stop camera thread
-    capture_running = False
-    try:
-        cam_thread.join(timeout=1.0)
-    except:
-        pass
-    cv2.destroyAllWindows()
+    capture.stop()
+    recog_worker.stop()
+    db_writer.stop()    # sisa antrean ditulis dulu
+    if sync_client is not None:
+        sync_client.stop()    # yang belum terkirim tetap di outbox, dikirim saat start berikutnya
+    speaker.stop()    # index cache TTS ikut disimpan
+    users_reloader.stop()
+    gallery_reloader.stop()
+    if metrics_dumper is not None:
+        metrics_dumper.stop()    # dump terakhir
+    if metrics_server is not None:
+        metrics_server.stop()
+    if not HEADLESS:
+        cv2.destroyAllWindows()
+    elapsed = max(time.time() - t0, 1e-9)
+    print(f"[STATS] {FRAME_COUNT} frame / {elapsed:.1f}s ({FRAME_COUNT / elapsed:.1f} fps), "
+          f"recognition {recog_worker.stats}, voting {voter.stats}")
+    print(f"[tts] cache hit rate {tts_cache.hit_rate():.0%} {tts_cache.stats}, speaker {speaker.stats}")
+    for stage, s in sorted(metrics.to_dict()["absensi_stage_seconds"].items()):
+        p95 = f"<= {s['p95_ms']:g} ms" if s["p95_ms"] is not None else "> 5 s"
+        print(f"[metrics] {stage:>15}: n={s['count']:<6} mean {s['mean_ms']:8.2f} ms, p95 {p95}")
     print("Exiting...")
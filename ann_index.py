@@ -0,0 +1,103 @@
+import numpy as np
+
+# di bawah ukuran ini brute force lebih cepat & selalu exact
+ANN_MIN_SIZE = 20_000
+
+
+def _sq_norms(x):
+    return np.einsum("ij,ij->i", x, x)
+
+
+class ExactIndex:
+    """Brute force: satu matmul query x seluruh gallery."""
+
+    def __init__(self, encodings, sq_norms=None):
+        self.encodings = encodings
+        self.sq_norms = _sq_norms(encodings) if sq_norms is None else sq_norms
+
+    def search(self, queries):
+        """Return (index sample terdekat, squared distance) per query."""
+        d2 = queries @ self.encodings.T
+        d2 *= -2.0
+        d2 += self.sq_norms[None, :]
+        idx = np.argmin(d2, axis=1)
+        best = d2[np.arange(len(queries)), idx] + _sq_norms(queries)
+        return idx, np.maximum(best, 0.0)
+
+
+class IVFIndex:
+    """
+    Inverted file index (IVF-flat): gallery dibagi ke `nlist` cluster k-means,
+    query hanya discan di `nprobe` cluster terdekat. Jarak di dalam cluster tetap
+    exact (float32), jadi yang bisa meleset hanya kalau tetangga terdekat ada di
+    cluster yang tidak diprobe.
+    """
+
+    def __init__(self, encodings, nlist=None, nprobe=8, iters=12, seed=0):
+        n = len(encodings)
+        # gallery kecil: cluster tidak boleh lebih banyak dari sample
+        self.nlist = max(1, min(nlist or int(round(4 * np.sqrt(n))), n))
+        self.nprobe = min(nprobe, self.nlist)
+        self.centroids = self._kmeans(encodings, self.nlist, iters, np.random.default_rng(seed))
+        self.centroid_norms = _sq_norms(self.centroids)
+
+        assign = self._assign(encodings)
+        # simpan sample per cluster secara contiguous: list i = perm[offsets[i]:offsets[i+1]]
+        self.perm = np.argsort(assign, kind="stable")
+        self.offsets = np.searchsorted(assign[self.perm], np.arange(self.nlist + 1))
+        self.encodings = np.ascontiguousarray(encodings[self.perm])
+        self.sq_norms = _sq_norms(self.encodings)
+
+    def _assign(self, x, chunk=65536):
+        out = np.empty(len(x), dtype=np.int32)
+        for s in range(0, len(x), chunk):
+            d = self.centroid_norms[None, :] - 2.0 * (x[s:s + chunk] @ self.centroids.T)
+            out[s:s + chunk] = np.argmin(d, axis=1)
+        return out
+
+    @staticmethod
+    def _kmeans(x, k, iters, rng):
+        # latih di subsample supaya build tetap cepat untuk gallery besar
+        train = x[rng.choice(len(x), size=min(len(x), 64 * k), replace=False)]
+        centroids = train[rng.choice(len(train), size=k, replace=False)].copy()
+        for _ in range(iters):
+            d = _sq_norms(centroids)[None, :] - 2.0 * (train @ centroids.T)
+            assign = np.argmin(d, axis=1)
+            counts = np.bincount(assign, minlength=k)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, train)
+            nonempty = counts > 0
+            centroids[nonempty] = sums[nonempty] / counts[nonempty, None]
+            # cluster kosong diisi ulang dengan titik acak
+            if not nonempty.all():
+                centroids[~nonempty] = train[rng.choice(len(train), size=int((~nonempty).sum()))]
+        return centroids
+
+    def search(self, queries):
+        q_norms = _sq_norms(queries)
+        cd = self.centroid_norms[None, :] - 2.0 * (queries @ self.centroids.T)
+        probe = np.argpartition(cd, self.nprobe - 1, axis=1)[:, :self.nprobe]
+
+        idx = np.empty(len(queries), dtype=np.intp)
+        best = np.empty(len(queries), dtype=np.float32)
+        for i, lists in enumerate(probe):
+            cand = np.concatenate([np.arange(self.offsets[c], self.offsets[c + 1]) for c in lists])
+            if len(cand) == 0:
+                idx[i], best[i] = 0, np.inf
+                continue
+            d2 = self.sq_norms[cand] - 2.0 * (self.encodings[cand] @ queries[i])
+            j = np.argmin(d2)
+            idx[i] = self.perm[cand[j]]
+            best[i] = max(d2[j] + q_norms[i], 0.0)
+        return idx, best
+
+
+def build_index(encodings, kind="auto", sq_norms=None, **opts):
+    """kind: 'exact', 'ivf', atau 'auto' (ivf hanya untuk gallery >= ANN_MIN_SIZE)."""
+    if kind == "auto":
+        kind = "ivf" if len(encodings) >= ANN_MIN_SIZE else "exact"
+    if kind == "exact":
+        return ExactIndex(encodings, sq_norms)
+    if kind == "ivf":
+        return IVFIndex(encodings, **opts)
+    raise ValueError(f"index tidak dikenal: {kind}")
@@ -0,0 +1,81 @@
+"""
+Recall vs latency IVF index dibandingkan matcher exact.
+
+Gallery sintetis dibuat mirip distribusi encoding face_recognition: jarak antar
+orang ~0.9, antar foto orang yang sama ~0.35. Query = foto baru orang terdaftar
+ditambah sebagian wajah asing (tidak terdaftar). "Keputusan" = nama hasil match
+dengan DIST_TOLERANCE (atau None), dan dibandingkan dengan hasil exact.
+
+    python3 bench/bench_ann.py --people 5000 --per-person 5
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from matcher import GalleryMatcher  # noqa: E402
+
+DIST_TOLERANCE = 0.45
+PERSON_STD = 0.056   # sqrt(2*128) * 0.056 ~ 0.9 antar orang
+SAMPLE_STD = 0.022   # sqrt(2*128) * 0.022 ~ 0.35 antar foto orang yang sama
+
+
+def synthetic_gallery(people, per_person, rng):
+    centers = rng.normal(0, PERSON_STD, size=(people, 128)).astype(np.float32)
+    enc = np.repeat(centers, per_person, axis=0) + rng.normal(0, SAMPLE_STD, size=(people * per_person, 128))
+    names = [f"P{i:06d}" for i in range(people) for _ in range(per_person)]
+    return centers, enc.astype(np.float32), names
+
+
+def make_queries(centers, n, rng, unknown_frac=0.2):
+    n_unknown = int(n * unknown_frac)
+    known = centers[rng.integers(0, len(centers), size=n - n_unknown)]
+    unknown = rng.normal(0, PERSON_STD, size=(n_unknown, 128))
+    q = np.vstack([known, unknown]) + rng.normal(0, SAMPLE_STD, size=(n, 128))
+    return q.astype(np.float32)
+
+
+def run(matcher, queries, batch):
+    out = []
+    t = time.perf_counter()
+    for s in range(0, len(queries), batch):
+        out.extend(name for name, _ in matcher.match(queries[s:s + batch], DIST_TOLERANCE))
+    return out, (time.perf_counter() - t) * 1000 / len(queries)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--people", type=int, default=5000)
+    ap.add_argument("--per-person", type=int, default=5)
+    ap.add_argument("--queries", type=int, default=2000)
+    ap.add_argument("--batch", type=int, default=3, help="wajah per frame")
+    ap.add_argument("--nlist", type=int, nargs="*", default=[0])
+    ap.add_argument("--nprobe", type=int, nargs="*", default=[1, 2, 4, 8, 16, 32])
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    centers, enc, names = synthetic_gallery(args.people, args.per_person, rng)
+    queries = make_queries(centers, args.queries, rng)
+    print(f"gallery: {len(enc)} encodings, {args.people} orang | queries: {len(queries)}")
+
+    exact = GalleryMatcher(enc, names, index="exact")
+    ref, exact_ms = run(exact, queries, args.batch)
+    print(f"{'exact':>14} | {'agree %':>8} | {exact_ms:>8.3f} ms/face | build -")
+
+    for nlist in args.nlist:
+        for nprobe in args.nprobe:
+            t = time.perf_counter()
+            ivf = GalleryMatcher(enc, names, index="ivf", nlist=nlist or None, nprobe=nprobe)
+            build_s = time.perf_counter() - t
+            got, ms = run(ivf, queries, args.batch)
+            agree = np.mean([a == b for a, b in zip(ref, got)]) * 100
+            label = f"ivf {ivf.index.nlist}/{ivf.index.nprobe}"
+            flag = " <- >=99.9%" if agree >= 99.9 else ""
+            print(f"{label:>14} | {agree:>8.2f} | {ms:>8.3f} ms/face | build {build_s:.1f}s{flag}")
+
+
+if __name__ == "__main__":
+    main()
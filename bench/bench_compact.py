@@ -0,0 +1,182 @@
+"""
+Gallery penuh vs hasil gallery_compact.py di encodings.pkl asli (berlabel).
+
+Per split (--splits kali, seed berbeda): --impostors orang dikeluarkan
+seluruhnya dari gallery (encodingnya jadi query orang tak dikenal), dari
+orang lain --holdout porsi encoding per orang disisihkan sebagai query.
+Gallery = sisanya, penuh atau di-compact. Match satu encoding per query di
+DIST_TOLERANCE (seperti absensi.py tanpa voting):
+
+    benar      query orang terdaftar -> nama yang benar
+    salah      query orang terdaftar -> nama orang lain
+    ditolak    query orang terdaftar -> tidak ada yang < tolerance
+    FA tamu    query orang tak dikenal -> diterima sebagai seseorang
+
+Akurasi dihitung terhadap label asli encodings.pkl (nama folder). Config
+"buang outlier" menunjukkan biaya membuang kelompok yang oleh gallery_compact
+dianggap wajah orang lain (default mati).
+
+Latency = GalleryMatcher.match untuk --faces wajah per frame (index exact),
+median; compact = waktu compaction saat load (GALLERY_COMPACT = True). Di
+gallery kecil latency didominasi overhead, jadi diukur juga di gallery --tile
+kali lebih banyak orang: salinan gallery asli yang ruang encodingnya diputar
+acak (struktur per orang sama, orangnya "baru").
+
+    python3 bench/bench_compact.py
+    python3 bench/bench_compact.py --encodings encodings.pkl --splits 50 --holdout 0.5
+"""
+import argparse
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gallery_compact import compact_gallery, load_encodings  # noqa: E402
+from matcher import GalleryMatcher  # noqa: E402
+
+DIST_TOLERANCE = 0.45
+CONFIGS = {
+    "penuh": None,
+    "medoid, cover 0.25, max 5": {},
+    "medoid, cover 0.15, max 8": {"cover": 0.15, "max_protos": 8},
+    "centroid, cover 0.25, max 5": {"centroid": True},
+    "centroid saja (max 1)": {"centroid": True, "max_protos": 1},
+    "medoid 0.25/5 + buang outlier": {"drop_outliers": True},
+}
+
+
+def split(names, rng, holdout, impostors):
+    people = sorted(set(names))
+    guests = set(rng.choice(people, impostors, replace=False))
+    train, genuine, guest = [], [], []
+    by_person = {}
+    for i, n in enumerate(names):
+        by_person.setdefault(n, []).append(i)
+    for person, idx in by_person.items():
+        if person in guests:
+            guest += idx
+            continue
+        idx = rng.permutation(idx)
+        k = max(1, int(round(len(idx) * holdout)))
+        genuine += list(idx[:k])
+        train += list(idx[k:])
+    return np.array(train), np.array(genuine), np.array(guest)
+
+
+def evaluate(matcher, enc, names, genuine, guest, tolerance, confusions):
+    res = matcher.match(enc[genuine], tolerance)
+    ok = sum(r[0] == names[i] for r, i in zip(res, genuine))
+    rejected = sum(r[0] is None for r in res)
+    for (name, _), i in zip(res, genuine):
+        if name is not None and name != names[i]:
+            confusions[(names[i], name)] += 1
+    fa = sum(r[0] is not None for r in matcher.match(enc[guest], tolerance)) if len(guest) else 0
+    return ok, len(genuine) - ok - rejected, rejected, fa
+
+
+def latency_ms(matcher, queries, faces, repeat):
+    times = []
+    for i in range(repeat):
+        q = queries[(i * faces) % (len(queries) - faces):][:faces]
+        t = time.perf_counter()
+        matcher.match(q, DIST_TOLERANCE)
+        times.append(time.perf_counter() - t)
+    return statistics.median(times) * 1e3
+
+
+def tile(enc, names, times, rng):
+    """Gallery `times` x lebih banyak orang: tiap salinan = rotasi ortogonal acak."""
+    out_enc, out_names = [enc], list(names)
+    for t in range(1, times):
+        q, _ = np.linalg.qr(rng.normal(size=(enc.shape[1], enc.shape[1])))
+        out_enc.append((enc @ q).astype(np.float32))
+        out_names += [f"{n}#{t}" for n in names]
+    return np.concatenate(out_enc), out_names
+
+
+def scaled_latency(enc, names, args):
+    big_enc, big_names = tile(enc, names, args.tile, np.random.default_rng(0))
+    queries = big_enc[np.random.default_rng(1).permutation(len(big_enc))[:200]]
+    print(f"\nlatency di gallery besar: {len(set(big_names))} orang, {args.faces} wajah per frame")
+    print(f"{'gallery':<30} | {'encodings':>9} | {'match ms':>8} | {'compact saat load':>17}")
+    base = None
+    for label, opts in CONFIGS.items():
+        t = time.perf_counter()
+        g_enc, g_names = big_enc, big_names
+        if opts is not None:
+            g_enc, g_names, _ = compact_gallery(big_enc, big_names, **opts)
+        compact_s = time.perf_counter() - t
+        matcher = GalleryMatcher(g_enc, g_names, index="exact")
+        ms = latency_ms(matcher, queries, args.faces, 200)
+        base = base or ms
+        print(f"{label:<30} | {len(g_names):9d} | {ms:8.3f} | {compact_s:8.2f} s ({base / ms:4.1f}x)")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--encodings", default=str(Path(__file__).resolve().parent.parent / "encodings.pkl"))
+    ap.add_argument("--splits", type=int, default=20)
+    ap.add_argument("--holdout", type=float, default=0.3, help="porsi encoding per orang untuk query")
+    ap.add_argument("--impostors", type=int, default=4, help="orang yang tidak dimasukkan ke gallery")
+    ap.add_argument("--tolerance", type=float, default=DIST_TOLERANCE)
+    ap.add_argument("--faces", type=int, default=3, help="wajah per frame untuk latency")
+    ap.add_argument("--repeat", type=int, default=2000)
+    ap.add_argument("--tile", type=int, default=100, help="faktor gallery besar untuk latency (0 = lewati)")
+    args = ap.parse_args()
+
+    enc, names = load_encodings(args.encodings)
+    names = np.array(names, dtype=object)
+    print(f"{args.encodings}: {len(names)} encodings, {len(set(names))} orang | {args.splits} split, "
+          f"holdout {args.holdout:g}, {args.impostors} orang tak dikenal, tolerance {args.tolerance:g}")
+
+    totals = {label: dict.fromkeys(("n", "benar", "salah", "ditolak", "fa", "ms", "compact_ms"), 0.0)
+              for label in CONFIGS}
+    confusions = {label: Counter() for label in CONFIGS}
+    n_gen = n_guest = 0
+    for seed in range(args.splits):
+        rng = np.random.default_rng(seed)
+        train, genuine, guest = split(list(names), rng, args.holdout, args.impostors)
+        n_gen += len(genuine)
+        n_guest += len(guest)
+        for label, opts in CONFIGS.items():
+            t = time.perf_counter()
+            g_enc, g_names = enc[train], list(names[train])
+            if opts is not None:
+                g_enc, g_names, _ = compact_gallery(g_enc, g_names, **opts)
+            compact_ms = (time.perf_counter() - t) * 1e3
+            matcher = GalleryMatcher(g_enc, g_names, index="exact")
+            ok, wrong, rejected, fa = evaluate(matcher, enc, names, genuine, guest, args.tolerance,
+                                                confusions[label])
+            row = totals[label]
+            row["n"] += len(g_names)
+            row["benar"] += ok
+            row["salah"] += wrong
+            row["ditolak"] += rejected
+            row["fa"] += fa
+            row["compact_ms"] += compact_ms if opts is not None else 0.0
+            row["ms"] += latency_ms(matcher, enc[genuine], args.faces, args.repeat // args.splits)
+
+    base = totals["penuh"]
+    print(f"\n{'gallery':<30} | {'encodings':>9} | {'match ms':>8} | {'compact':>8} | {'benar':>6} "
+          f"| {'salah':>6} | {'ditolak':>7} | {'FA tamu':>7}")
+    for label, row in totals.items():
+        n = row["n"] / args.splits
+        print(f"{label:<30} | {n:5.0f} {100 * n / (base['n'] / args.splits):3.0f}% "
+              f"| {row['ms'] / args.splits:8.3f} | {row['compact_ms'] / args.splits:5.1f} ms "
+              f"| {100 * row['benar'] / n_gen:5.1f}% | {100 * row['salah'] / n_gen:5.2f}% "
+              f"| {100 * row['ditolak'] / n_gen:6.1f}% | {100 * row['fa'] / max(n_guest, 1):6.1f}%")
+    # pasangan (label -> hasil match) yang paling sering salah
+    print("\nsalah terbanyak (label -> hasil match): " + " | ".join(
+        f"{label}: " + ", ".join(f"{a}->{b} {n}" for (a, b), n in confusions[label].most_common(2))
+        for label in ("penuh", "medoid, cover 0.25, max 5", "medoid 0.25/5 + buang outlier")))
+
+    if args.tile:
+        scaled_latency(enc, names, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,143 @@
+"""
+Stress test penulisan absensi: thread + koneksi baru per record (versi lama)
+vs AttendanceWriter (satu writer, WAL, group commit).
+
+Beberapa "kiosk" (thread) mensimulasikan jam sibuk 08:00-08:15: tiap check-in
+menjalankan cek duplikat lalu submit record. Dilaporkan record/menit yang
+tertulis, latency di sisi UI (cek + submit), error "database is locked",
+puncak jumlah thread, dan jumlah baris akhir.
+
+    python3 bench/bench_db.py --rate 6000 --seconds 10 --producers 4
+"""
+import argparse
+import sqlite3
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from db_writer import SCHEMA, AttendanceWriter  # noqa: E402
+
+
+class LegacyDB:
+    """Salinan perilaku absensi.py lama: thread + sqlite3.connect per record."""
+
+    def __init__(self, path):
+        self.path = path
+        self.errors = 0
+        conn = sqlite3.connect(path)
+        conn.execute(SCHEMA)
+        conn.commit()
+        conn.close()
+
+    def _insert(self, record):
+        try:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("INSERT INTO absensi (nama, date, time, mode, status) VALUES (?, ?, ?, ?, ?)", record)
+            conn.commit()
+            conn.close()
+        except Exception:
+            self.errors += 1
+
+    def submit(self, *record):
+        threading.Thread(target=self._insert, args=(record,), daemon=True).start()
+        return True
+
+    def exists(self, name, date_, mode):
+        try:
+            conn = sqlite3.connect(self.path, timeout=3)
+            row = conn.execute("SELECT 1 FROM absensi WHERE nama = ? AND date = ? AND mode = ? LIMIT 1",
+                               (name, date_, mode)).fetchone()
+            conn.close()
+            return row is not None
+        except Exception:
+            self.errors += 1
+            return False
+
+    def flush(self):
+        while threading.active_count() > self.base_threads:
+            time.sleep(0.01)
+
+    def stop(self):
+        pass
+
+
+def producer(db, rate, offset, lat, stop):
+    period = 1.0 / rate
+    deadline = time.perf_counter()
+    i = 0
+    while not stop.is_set():
+        deadline += period
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)
+        name = f"user{offset}_{i}"
+        t = time.perf_counter()
+        if not db.exists(name, "2024-01-15", "MASUK"):
+            db.submit(name, "2024-01-15", "08:05:00", "MASUK", "Tepat waktu")
+        lat.append((time.perf_counter() - t) * 1000)
+        i += 1
+
+
+def run(kind, args):
+    with tempfile.TemporaryDirectory() as tmp:
+        path = str(Path(tmp) / "data.db")
+        if kind == "legacy":
+            db = LegacyDB(path)
+        else:
+            db = AttendanceWriter(path, batch_size=args.batch, flush_interval=args.flush, verbose=False).start()
+        db.base_threads = threading.active_count()
+
+        stop = threading.Event()
+        lats = [[] for _ in range(args.producers)]
+        threads = [threading.Thread(target=producer, args=(db, args.rate / 60 / args.producers, k,
+                                                         lats[k], stop), daemon=True)
+                   for k in range(args.producers)]
+        t0 = time.perf_counter()
+        for t in threads:
+            t.start()
+        peak = 0
+        while time.perf_counter() - t0 < args.seconds:
+            peak = max(peak, threading.active_count())
+            time.sleep(0.01)
+        stop.set()
+        for t in threads:
+            t.join()
+        db.flush()
+        elapsed = time.perf_counter() - t0
+        db.stop()
+
+        rows = sqlite3.connect(path).execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+        lat = np.concatenate([np.array(x) for x in lats]) if any(lats) else np.array([np.nan])
+        errors = db.errors if kind == "legacy" else db.stats["errors"] + db.stats["rejected"]
+        return {
+            "rows": rows, "submitted": len(lat), "per_min": rows / elapsed * 60,
+            "p50": np.percentile(lat, 50), "p99": np.percentile(lat, 99), "max": lat.max(),
+            "errors": errors, "threads": peak,
+            "batches": db.stats["batches"] if kind == "writer" else rows,
+        }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rate", type=float, default=6000.0, help="check-in per menit (total)")
+    ap.add_argument("--seconds", type=float, default=10.0)
+    ap.add_argument("--producers", type=int, default=4)
+    ap.add_argument("--batch", type=int, default=64)
+    ap.add_argument("--flush", type=float, default=0.2)
+    args = ap.parse_args()
+
+    print(f"{args.rate:.0f} check-in/menit dari {args.producers} thread selama {args.seconds:.0f}s")
+    for kind in ("legacy", "writer"):
+        r = run(kind, args)
+        print(f"{kind:>6} | {r['rows']:>6}/{r['submitted']:<6} baris | {r['per_min']:>7.0f}/menit "
+              f"| UI p50 {r['p50']:>6.2f} ms p99 {r['p99']:>7.2f} ms max {r['max']:>7.1f} ms "
+              f"| error {r['errors']:>4} | thread puncak {r['threads']:>4} | commit {r['batches']}")
+
+
+if __name__ == "__main__":
+    main()
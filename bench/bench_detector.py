@@ -0,0 +1,123 @@
+"""
+Recall & latency backend detector (detector.py) vs jalur HOG sekarang,
+pada clip yang sama, plus efek motion gate.
+
+Referensi = HOG di resolusi penuh clip (lebih teliti dari HOG di
+PROCESS_SCALE). Box detector dianggap benar kalau IoU >= --iou dengan box
+referensi. Dilaporkan per backend: recall, precision, latency p50/p95 di
+--scale, dan untuk motion gate: porsi frame yang dilewati serta wajah
+referensi yang terlewat karena gate (tanpa track aktif). Butuh face_recognition
+untuk referensi & backend hog.
+
+    python3 bench/bench_detector.py replay:clips --detectors hog,yunet,haar --scale 0.25
+    python3 bench/bench_detector.py replay:rekaman/pagi.mp4 --every 6 --max-frames 600
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from detector import MotionGate, make_detector  # noqa: E402
+from frame_source import open_source  # noqa: E402
+from tracker import iou  # noqa: E402
+
+
+def load_frames(specs, size, every, max_frames):
+    frames = []
+    for spec in specs:
+        source = open_source(spec, size, fps=None).start()
+        n = 0
+        try:
+            while max_frames is None or len(frames) < max_frames:
+                frame = source.read()
+                if frame is None:
+                    break
+                n += 1
+                if n % every == 0:
+                    frames.append(frame.copy())    # synthetic memakai ulang buffer yang sama
+        finally:
+            source.stop()
+    return frames
+
+
+def scale_box(box, f):
+    return tuple(int(round(v * f)) for v in box)
+
+
+def matched(ref, found, thr):
+    """Jumlah box referensi yang punya pasangan IoU >= thr (greedy, satu-satu)."""
+    used = set()
+    hits = 0
+    for r in ref:
+        best = max(((iou(r, b), i) for i, b in enumerate(found) if i not in used), default=(0.0, None))
+        if best[0] >= thr:
+            used.add(best[1])
+            hits += 1
+    return hits
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sources", nargs="+", help="replay:<folder|video> (path biasa = replay)")
+    ap.add_argument("--detectors", default="hog,yunet,haar")
+    ap.add_argument("--reference", default="hog", help="detector referensi, dijalankan di resolusi penuh")
+    ap.add_argument("--scale", type=float, default=0.25, help="PROCESS_SCALE untuk backend yang diuji")
+    ap.add_argument("--every", type=int, default=1, help="ambil 1 dari N frame (RECOG_EVERY_N_FRAMES)")
+    ap.add_argument("--iou", type=float, default=0.3)
+    ap.add_argument("--fps", type=float, default=30.0, help="fps asli clip (jam keepalive motion gate)")
+    ap.add_argument("--size", type=lambda s: tuple(int(x) for x in s.split("x")), default=(640, 480))
+    ap.add_argument("--max-frames", type=int, default=None)
+    args = ap.parse_args()
+    specs = [s if ":" in s else f"replay:{s}" for s in args.sources]
+
+    frames = load_frames(specs, args.size, args.every, args.max_frames)
+    if not frames:
+        raise SystemExit("❌ tidak ada frame")
+    t = time.perf_counter()
+    ref_det = make_detector(args.reference)
+    reference = [ref_det.detect(f) for f in frames]
+    n_ref = sum(len(r) for r in reference)
+    print(f"{len(frames)} frame, referensi {args.reference} resolusi penuh: {n_ref} wajah "
+          f"({time.perf_counter() - t:.1f}s)")
+
+    smalls = [cv2.resize(f, (0, 0), fx=args.scale, fy=args.scale, interpolation=cv2.INTER_LINEAR) for f in frames]
+    for spec in args.detectors.split(","):
+        try:
+            det = make_detector(spec)
+        except Exception as e:
+            print(f"{spec:>8} | dilewati: {e}")
+            continue
+        det.detect(smalls[0])    # warm-up (alokasi, load model)
+        lat, hits, found_total = [], 0, 0
+        for small, ref in zip(smalls, reference):
+            t = time.perf_counter()
+            found = det.detect(small)
+            lat.append((time.perf_counter() - t) * 1000)
+            found = [scale_box(b, 1 / args.scale) for b in found]
+            hits += matched(ref, found, args.iou)
+            found_total += len(found)
+        lat = np.array(lat)
+        print(f"{spec:>8} @ {args.scale:g} | recall {hits / n_ref if n_ref else float('nan'):6.1%} "
+              f"precision {hits / found_total if found_total else float('nan'):6.1%} "
+              f"| p50 {np.percentile(lat, 50):7.2f} ms p95 {np.percentile(lat, 95):7.2f} ms")
+
+    # motion gate: frame yang dilewati & wajah referensi yang ikut terlewat (tanpa track aktif,
+    # jadi ini batas atas; di kiosk wajah yang sudah di-track tidak pernah di-gate)
+    clock = [0.0]
+    gate = MotionGate(clock=lambda: clock[0])
+    skipped, missed = 0, 0
+    for i, (small, ref) in enumerate(zip(smalls, reference)):
+        clock[0] = i * args.every / args.fps
+        if not gate.check(small):
+            skipped += 1
+            missed += len(ref)
+    print(f"{'motion':>8} | {skipped}/{len(frames)} frame dilewati ({skipped / len(frames):.0%}), "
+          f"wajah referensi di frame itu: {missed} ({missed / n_ref if n_ref else 0:.1%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,194 @@
+"""
+Waktu pendaftaran per orang & ukuran dataset di disk: mode still lama
+(foto 3280x2464 per SPACE + train.py) vs burst dari stream preview (enroll.py).
+
+Input: clip satu orang (`replay:clips/RAKA`, folder frame / video) atau satu
+foto (`--photo`) yang dijadikan burst sintetis 960x540: wajah bergerak,
+maju-mundur, miring, sebagian frame motion blur, supaya skor kualitas punya
+sesuatu untuk dipilih.
+
+    still   per foto: switch_mode + 2x sleep 0.2s (frame_source.py), JPEG full
+            res, lalu train.encode_image (load 8 MP, downscale, HOG, encode)
+    burst   BurstEnroller di laju kamera (--fps), encode jalan selama burst,
+            lalu save_enrolment (crop JPEG kecil + append gallery)
+
+Kalau --probe diisi (foto lain orang yang sama), dilaporkan juga jarak rata-rata
+encoding terpilih ke probe: K crop terbaik vs K frame berurutan tanpa skor.
+
+    python3 bench/bench_enroll.py --photo foto_raka.jpg --probe raka2.jpg
+    python3 bench/bench_enroll.py replay:clips/RAKA --photos 10 --k 8
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import cv2
+import face_recognition
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from daftar import PREVIEW_SIZE, STILL_SIZE  # noqa: E402
+from detector import make_detector  # noqa: E402
+from enroll import BURST_SEC, ENROLL_K, BurstEnroller, save_enrolment  # noqa: E402
+from frame_source import open_source  # noqa: E402
+from train import encode_image  # noqa: E402
+
+SWITCH_SLEEP = 0.4    # PicameraSource.capture_still: sleep 0.2s ke still mode + 0.2s kembali
+
+
+def synth_burst(photo, n, size=PREVIEW_SIZE, seed=0):
+    """Frame 960x540 dari satu foto: wajah bergerak, skala/roll berubah, sebagian blur."""
+    img = face_recognition.load_image_file(photo)
+    top, right, bottom, left = face_recognition.face_locations(img)[0]
+    fw = right - left
+    pad = fw
+    y0, y1 = max(top - pad, 0), min(bottom + pad, img.shape[0])
+    x0, x1 = max(left - pad, 0), min(right + pad, img.shape[1])
+    head = img[y0:y1, x0:x1]
+    rng = np.random.default_rng(seed)
+    bg = cv2.GaussianBlur(rng.integers(60, 120, (size[1], size[0], 3), dtype=np.uint8), (0, 0), 5)
+    frames = []
+    for i in range(n):
+        phase = i / max(n - 1, 1)
+        target = 90 + 160 * (0.5 + 0.5 * np.sin(phase * 2 * np.pi))    # lebar wajah 90..250 px
+        s = target / fw
+        h = cv2.resize(head, None, fx=s, fy=s, interpolation=cv2.INTER_AREA)
+        rot = cv2.getRotationMatrix2D((h.shape[1] / 2, h.shape[0] / 2), 28 * np.sin(phase * 5 * np.pi), 1.0)
+        h = cv2.warpAffine(h, rot, (h.shape[1], h.shape[0]), borderMode=cv2.BORDER_REPLICATE)
+        blur = int(rng.choice([0, 0, 0, 7, 15, 25]))
+        if blur:
+            kernel = np.zeros((blur, blur), np.float32)
+            kernel[blur // 2, :] = 1.0 / blur
+            h = cv2.filter2D(h, -1, kernel)
+        frame = bg.copy()
+        cx = int(size[0] / 2 + 200 * np.sin(phase * 3 * np.pi) - h.shape[1] / 2)
+        cy = int(size[1] / 2 - h.shape[0] / 2)
+        fx0, fy0 = max(cx, 0), max(cy, 0)
+        fx1, fy1 = min(cx + h.shape[1], size[0]), min(cy + h.shape[0], size[1])
+        frame[fy0:fy1, fx0:fx1] = h[fy0 - cy:fy1 - cy, fx0 - cx:fx1 - cx]
+        frames.append(np.clip(frame.astype(np.int16) + int(rng.integers(-25, 25)), 0, 255).astype(np.uint8))
+    return frames
+
+
+def load_frames(args, n):
+    if args.photo:
+        return synth_burst(args.photo, n)
+    cam = open_source(args.source, PREVIEW_SIZE)
+    cam.start()
+    frames = []
+    while len(frames) < n:
+        frame = cam.read()
+        if frame is None:
+            break
+        frames.append(frame.copy())
+    cam.stop()
+    return frames
+
+
+def dir_size(path):
+    return sum(f.stat().st_size for f in Path(path).rglob("*") if f.is_file())
+
+
+def run_still(frames, args, tmp):
+    """Mode lama: --photos foto full res (frame terbaik tidak dipilih, ambil tiap beberapa frame)."""
+    folder = os.path.join(tmp, "still", "ORANG")
+    os.makedirs(folder)
+    capture = 0.0
+    step = max(len(frames) // args.photos, 1)
+    for i in range(args.photos):
+        t = time.perf_counter()
+        full = cv2.resize(frames[(i * step) % len(frames)], STILL_SIZE, interpolation=cv2.INTER_LINEAR)
+        cv2.imwrite(os.path.join(folder, f"ORANG_{i:02d}.jpg"), full)
+        capture += time.perf_counter() - t + SWITCH_SLEEP
+    t = time.perf_counter()
+    encs = [e for p in sorted(Path(folder).iterdir()) for e in encode_image(str(p))]
+    train_s = time.perf_counter() - t
+    return {"seconds": capture + train_s, "capture": capture, "train": train_s,
+            "bytes": dir_size(folder), "files": args.photos, "encodings": encs}
+
+
+def run_burst(frames, args, tmp):
+    detector = make_detector(args.detector)
+    enroller = BurstEnroller(detector, k=args.k)
+    t0 = time.perf_counter()
+    last = -1
+    while True:
+        # kamera live: frame yang lewat selama feed() masih jalan hilang (tidak antre)
+        i = int((time.perf_counter() - t0) * args.fps)
+        if i >= len(frames):
+            break
+        if i == last:
+            time.sleep(t0 + (i + 1) / args.fps - time.perf_counter())
+            continue
+        enroller.feed(frames[i])
+        last = i
+    burst = time.perf_counter() - t0
+    picks = enroller.finish()
+    dataset = os.path.join(tmp, "burst")
+    saved = save_enrolment("ORANG", picks, dataset, os.path.join(tmp, "manifest.pkl"),
+                           os.path.join(tmp, "encodings.pkl"), os.path.join(tmp, "encodings.gal"))
+    return {"seconds": time.perf_counter() - t0, "burst": burst, "bytes": saved["bytes"],
+            "files": saved["files"], "encodings": [c.encoding for c in picks],
+            "stats": enroller.stats, "encode_s": enroller.worker.stats["encode_s"]}
+
+
+def baseline_first_k(frames, k):
+    """K frame berurutan dari awal burst, di-encode tanpa skor kualitas."""
+    encs = []
+    for frame in frames:
+        boxes = face_recognition.face_locations(frame)
+        if boxes:
+            encs += face_recognition.face_encodings(frame, boxes[:1])
+        if len(encs) == k:
+            break
+    return encs
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("source", nargs="?", default=None, help="replay:<folder|video> satu orang")
+    ap.add_argument("--photo", default=None, help="buat burst sintetis dari satu foto")
+    ap.add_argument("--probe", nargs="*", default=[], help="foto lain orang yang sama (cek kualitas encoding)")
+    ap.add_argument("--photos", type=int, default=10, help="jumlah foto mode still")
+    ap.add_argument("--k", type=int, default=ENROLL_K)
+    ap.add_argument("--fps", type=float, default=15.0)
+    ap.add_argument("--burst-sec", type=float, default=BURST_SEC)
+    ap.add_argument("--detector", default="hog")
+    args = ap.parse_args()
+    if not args.source and not args.photo:
+        ap.error("butuh source replay:... atau --photo")
+
+    frames = load_frames(args, int(args.fps * args.burst_sec))
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{len(frames)} frame {PREVIEW_SIZE[0]}x{PREVIEW_SIZE[1]} @ {args.fps:g} fps, K={args.k}, "
+              f"still {args.photos} foto {STILL_SIZE[0]}x{STILL_SIZE[1]}")
+
+        still = run_still(frames, args, tmp)
+        burst = run_burst(frames, args, tmp)
+        print(f"still | {still['seconds']:5.1f}s per orang (capture {still['capture']:.1f}s incl. "
+              f"{args.photos}x{SWITCH_SLEEP:g}s switch_mode, train.py {still['train']:.1f}s) "
+              f"| {still['files']} file {still['bytes'] / 1024:7.0f} KB | {len(still['encodings'])} encodings")
+        s = burst["stats"]
+        print(f"burst | {burst['seconds']:5.1f}s per orang (burst {burst['burst']:.1f}s, sisa encode + simpan "
+              f"{burst['seconds'] - burst['burst']:.1f}s) | {burst['files']} file {burst['bytes'] / 1024:7.0f} KB "
+              f"| {len(burst['encodings'])} encodings | ditolak kecil {s['kecil']} blur {s['blur']} pose {s['pose']}, "
+              f"{s['candidates']} kandidat di-encode ({burst['encode_s']:.1f}s CPU di worker)")
+
+        probes = [e for p in args.probe for e in face_recognition.face_encodings(face_recognition.load_image_file(p))]
+        if probes:
+            probes = np.asarray(probes)
+
+            def mean_dist(encs):
+                encs = np.asarray(encs)
+                return float(np.linalg.norm(encs[:, None, :] - probes[None, :, :], axis=2).mean()) if len(encs) else float("nan")
+
+            first = baseline_first_k(frames, args.k)
+            print(f"jarak ke probe ({len(probes)} wajah) | burst K terbaik {mean_dist(burst['encodings']):.3f} "
+                  f"| K frame pertama tanpa skor {mean_dist(first):.3f} | still {mean_dist(still['encodings']):.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+CPU & wake latency: pipeline aktif vs sleep mode lama vs idle stream baru.
+
+    aktif       640x480 @ fps, resize, deteksi tiap N frame, gambar UI 1024x600
+    sleep lama  sama tapi tanpa gambar UI (perilaku sebelum idle mode)
+    idle        stream 160x120 @ 5 fps + motion detector saja
+
+Wake latency: di mode idle, scene diam lalu tiba-tiba ada "orang" (kotak
+terang) pada waktu acak; diukur dari perubahan scene sampai frame penuh
+pertama siap (deteksi gerakan + ganti mode + frame pertama). Di Pi, ganti
+mode Picamera2 menambah ~100-300 ms; di sini mode diganti di software.
+
+    python3 bench/bench_idle.py --seconds 10 --trials 20 --detector hog
+"""
+import argparse
+import random
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from detector import MotionGate, make_detector  # noqa: E402
+from frame_source import FrameSource  # noqa: E402
+
+
+class SceneSource(FrameSource):
+    """Background diam; trigger() memunculkan kotak terang (orang datang)."""
+
+    def __init__(self, size=(640, 480), fps=30.0):
+        super().__init__(size, fps)
+        self.live = True
+        rng = np.random.default_rng(0)
+        self._base = rng.integers(0, 200, (size[1], size[0], 3), dtype=np.uint8)
+        self._scaled = {}
+        self.person = False
+
+    def trigger(self, on=True):
+        self.person = on
+
+    def read(self):
+        self._pace()
+        # frame langsung dibuat di ukuran stream (seperti sensor di mode kecil)
+        base = self._scaled.get(self.size)
+        if base is None:
+            base = self._scaled[self.size] = cv2.resize(self._base, self.size, interpolation=cv2.INTER_AREA)
+        frame = base.copy()
+        if self.person:
+            w, h = self.size
+            frame[h // 4:h * 3 // 4, w // 3:w * 2 // 3] = 230
+        self.frames += 1
+        return frame
+
+
+def cpu_run(fn, seconds):
+    wall, cpu = time.perf_counter(), time.process_time()
+    frames = fn(seconds)
+    wall, cpu = time.perf_counter() - wall, time.process_time() - cpu
+    return cpu / wall, frames / wall
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--seconds", type=float, default=10.0, help="durasi pengukuran CPU per mode")
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--every", type=int, default=6, help="deteksi tiap N frame (aktif & sleep lama)")
+    ap.add_argument("--scale", type=float, default=0.25)
+    ap.add_argument("--detector", default="hog")
+    ap.add_argument("--idle-size", type=lambda s: tuple(int(x) for x in s.split("x")), default=(160, 120))
+    ap.add_argument("--idle-fps", type=float, default=5.0)
+    ap.add_argument("--motion", type=float, default=0.01, help="IDLE_MOTION_FRACTION")
+    ap.add_argument("--trials", type=int, default=20)
+    args = ap.parse_args()
+
+    try:
+        det = make_detector(args.detector)
+    except Exception as e:
+        print(f"detector {args.detector} tidak tersedia ({e}); CPU aktif tanpa deteksi (batas bawah)")
+        det = None
+    ring = np.empty((480, 640, 3), np.uint8)
+
+    def full_loop(draw):
+        def run(seconds):
+            src = SceneSource(fps=args.fps)
+            end, n = time.perf_counter() + seconds, 0
+            while time.perf_counter() < end:
+                frame = src.read()
+                np.copyto(ring, frame)    # slot ring
+                small = cv2.resize(frame, (0, 0), fx=args.scale, fy=args.scale, interpolation=cv2.INTER_LINEAR)
+                if det is not None and n % args.every == 0:
+                    det.detect(small)
+                if draw:
+                    out = cv2.resize(frame, (1024, 600), interpolation=cv2.INTER_LINEAR)
+                    cv2.rectangle(out, (80, 510), (340, 580), (0, 200, 0), -1)
+                n += 1
+            return n
+        return run
+
+    def idle_loop(seconds):
+        src = SceneSource(fps=args.fps)
+        src.set_idle(True, args.idle_size, args.idle_fps)
+        gate = MotionGate(size=args.idle_size)
+        end, n = time.perf_counter() + seconds, 0
+        while time.perf_counter() < end:
+            gate.motion(src.read())
+            n += 1
+        return n
+
+    print(f"CPU per mode ({args.seconds:.0f}s, 100% = satu core penuh)")
+    for name, fn in (("aktif", full_loop(True)), ("sleep lama", full_loop(False)), ("idle", idle_loop)):
+        cpu, fps = cpu_run(fn, args.seconds)
+        print(f"{name:>10} | CPU {cpu:6.1%} | {fps:5.1f} frame/s")
+
+    # wake latency
+    lat = []
+    for _ in range(args.trials):
+        src = SceneSource(fps=args.fps)
+        src.set_idle(True, args.idle_size, args.idle_fps)
+        gate = MotionGate(size=args.idle_size)
+        gate.motion(src.read())    # frame referensi
+        t_event = [None]
+
+        def arrive():
+            t_event[0] = time.perf_counter()
+            src.trigger()
+
+        timer = threading.Timer(random.uniform(0.1, 0.6), arrive)
+        timer.start()
+        while gate.motion(src.read()) < args.motion:
+            pass
+        src.set_idle(False)
+        src.read()    # frame penuh pertama
+        lat.append((time.perf_counter() - t_event[0]) * 1000)
+        timer.cancel()
+    lat = np.array(lat)
+    print(f"wake latency | p50 {np.percentile(lat, 50):6.1f} ms p95 {np.percentile(lat, 95):6.1f} ms "
+          f"max {lat.max():6.1f} ms (batas ~{1000 / args.idle_fps + 1000 / args.fps:.0f} ms + ganti mode kamera)")
+
+
+if __name__ == "__main__":
+    main()
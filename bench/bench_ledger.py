@@ -0,0 +1,109 @@
+"""
+Cek duplikat absensi di DB multi-tahun: query tanpa index (versi lama) vs
+schema v2 (unique index) vs DayLedger di memory.
+
+DB dibuat dengan schema lama: --people orang x 2 mode x hari kerja x --years.
+Dilaporkan: latency cek per tap, lama migrasi, lama warm ledger, ukuran DB.
+
+    python3 bench/bench_ledger.py --years 3 --people 300
+"""
+import argparse
+import os
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from db_writer import SCHEMA, AttendanceWriter, connect, migrate  # noqa: E402
+
+
+def generate(path, years, people):
+    names = [f"USER{i:05d}" for i in range(people)]
+    conn = sqlite3.connect(path)
+    conn.execute(SCHEMA)
+    day = date.today() - timedelta(days=365 * years)
+    days = []
+    while day <= date.today():
+        if day.weekday() < 5:
+            days.append(day.isoformat())
+        day += timedelta(days=1)
+    rows = 0
+    with conn:
+        for d in days:
+            batch = [(n, d, "08:05:00" if m == "MASUK" else "17:02:00", m, "Tepat waktu")
+                     for n in names for m in ("MASUK", "PULANG")]
+            conn.executemany("INSERT INTO absensi (nama, date, time, mode, status) VALUES (?, ?, ?, ?, ?)", batch)
+            rows += len(batch)
+    conn.close()
+    return names, days, rows
+
+
+def timeit(fn, queries):
+    lat = []
+    for q in queries:
+        t = time.perf_counter()
+        fn(*q)
+        lat.append((time.perf_counter() - t) * 1000)
+    lat = np.array(lat)
+    return np.percentile(lat, 50), np.percentile(lat, 99)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--years", type=int, default=3)
+    ap.add_argument("--people", type=int, default=300)
+    ap.add_argument("--queries", type=int, default=200)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.db")
+        t = time.perf_counter()
+        names, days, rows = generate(path, args.years, args.people)
+        print(f"DB {args.years} tahun x {args.people} orang: {rows} baris, "
+              f"{os.path.getsize(path) / 1e6:.0f} MB ({time.perf_counter() - t:.1f}s generate)")
+
+        today = days[-1]
+        rng = random.Random(0)
+        queries = [(rng.choice(names), today, rng.choice(("MASUK", "PULANG"))) for _ in range(args.queries)]
+
+        def legacy(name, date_, mode):
+            # check_already_absent lama: koneksi baru + full scan
+            conn = sqlite3.connect(path, timeout=3)
+            conn.execute("SELECT 1 FROM absensi WHERE nama = ? AND date = ? AND mode = ? LIMIT 1",
+                         (name, date_, mode)).fetchone()
+            conn.close()
+
+        p50, p99 = timeit(legacy, queries[:max(10, args.queries // 10)])
+        print(f"{'lama (scan)':>14} | cek p50 {p50:>8.3f} ms p99 {p99:>8.3f} ms")
+
+        conn = connect(path)
+        t = time.perf_counter()
+        migrate(conn)
+        mig = time.perf_counter() - t
+        print(f"{'migrasi':>14} | {mig:.1f}s, DB {os.path.getsize(path) / 1e6:.0f} MB")
+
+        def indexed(name, date_, mode):
+            conn.execute("SELECT 1 FROM absensi a JOIN users u ON u.id = a.user_id "
+                         "WHERE u.nama = ? AND a.date = ? AND a.mode = ? LIMIT 1", (name, date_, mode)).fetchone()
+
+        p50, p99 = timeit(indexed, queries)
+        print(f"{'index':>14} | cek p50 {p50:>8.3f} ms p99 {p99:>8.3f} ms")
+
+        writer = AttendanceWriter(path, verbose=False)
+        t = time.perf_counter()
+        n = writer.warm(today)
+        warm = (time.perf_counter() - t) * 1000
+        p50, p99 = timeit(writer.exists, queries)
+        print(f"{'ledger':>14} | cek p50 {p50:>8.4f} ms p99 {p99:>8.4f} ms | warm {n} baris {warm:.1f} ms")
+        writer.stop()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
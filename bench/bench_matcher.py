@@ -0,0 +1,79 @@
+"""
+Micro-benchmark GalleryMatcher vs cara lama (compare_faces + face_distance per wajah).
+
+Cara lama disimulasikan dengan numpy persis seperti implementasi face_recognition:
+face_distance = np.linalg.norm(known - enc, axis=1), dan compare_faces memanggil
+face_distance sekali lagi. Jadi benchmark ini bisa jalan tanpa dlib.
+
+    python3 bench/bench_matcher.py [--faces 3] [--repeat 20]
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from matcher import GalleryMatcher  # noqa: E402
+
+SIZES = [100, 1_000, 10_000, 100_000]
+SAMPLES_PER_PERSON = 5
+DIST_TOLERANCE = 0.45
+
+
+def make_gallery(n, rng):
+    enc = rng.normal(0, 0.09, size=(n, 128))
+    names = [f"P{i // SAMPLES_PER_PERSON:06d}" for i in range(n)]
+    return [e for e in enc], names
+
+
+def legacy_match(encodeListKnown, names, encodings):
+    # replika loop lama di absensi.py
+    for enc in encodings:
+        matches = list(np.linalg.norm(np.array(encodeListKnown) - enc, axis=1) <= DIST_TOLERANCE)
+        dist = np.linalg.norm(np.array(encodeListKnown) - enc, axis=1)
+        if len(dist) > 0:
+            best = np.argmin(dist)
+            if matches[best] and dist[best] < DIST_TOLERANCE:
+                return names[best]
+    return None
+
+
+def timeit(fn, repeat):
+    times = []
+    for _ in range(repeat):
+        t = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t)
+    return np.median(times) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--faces", type=int, default=3, help="jumlah wajah per frame")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>8} | {'legacy ms':>10} | {'matcher ms':>10} | {'speedup':>7} | {'build ms':>8}")
+    for n in SIZES:
+        enc_list, names = make_gallery(n, rng)
+        # query = sample gallery + sedikit noise, pasti ada kandidat match
+        idx = rng.integers(0, n, size=args.faces)
+        queries = np.stack([enc_list[i] + rng.normal(0, 0.01, 128) for i in idx])
+
+        t = time.perf_counter()
+        matcher = GalleryMatcher(enc_list, names, index="exact")
+        build_ms = (time.perf_counter() - t) * 1000
+
+        # cara lama berhenti di wajah pertama yang cocok; pakai query yang tidak cocok
+        # supaya semua wajah ikut discan (worst case yang sama untuk keduanya)
+        far = queries + 1.0
+        legacy_ms = timeit(lambda: legacy_match(enc_list, names, far), args.repeat)
+        new_ms = timeit(lambda: matcher.match(far, DIST_TOLERANCE), args.repeat)
+        print(f"{n:>8} | {legacy_ms:>10.3f} | {new_ms:>10.3f} | {legacy_ms / new_ms:>6.1f}x | {build_ms:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,270 @@
+"""
+Benchmark end-to-end pipeline recognition (headless, tanpa kamera).
+
+Frame dari replay (folder gambar / video) atau sintetis dijalankan lewat
+pipeline yang sama dengan kiosk (resize -> detect -> tracker -> encode ->
+match) untuk setiap kombinasi konfigurasi. Tiap konfigurasi jalan di proses
+terpisah supaya angka memory (peak RSS) tidak saling tercampur.
+
+Dilaporkan per konfigurasi: frame/detik, latency p50/p95/p99 per stage,
+peak RSS, dan akurasi identifikasi kalau clip berlabel. Label = nama folder
+induk file (dataset/<NAMA>/foto.jpg, clips/<NAMA>/pagi.mp4); folder UNKNOWN
+berisi orang yang tidak terdaftar (harus ditolak). Hasil ditulis ke JSON
+(bench/results/pipeline-<commit>.json) untuk dibandingkan antar commit.
+Butuh face_recognition.
+
+    python3 bench/bench_pipeline.py replay:dataset --scale 0.2,0.25,0.35 --every 1,6
+    python3 bench/bench_pipeline.py replay:clips --tolerance 0.4,0.45,0.5 --model hog,yunet,haar
+    python3 bench/bench_pipeline.py synthetic:300
+    python3 bench/bench_pipeline.py --compare bench/results/pipeline-a1b2c3d.json bench/results/pipeline-e4f5a6b.json
+"""
+import argparse
+import itertools
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from detector import make_detector  # noqa: E402
+from frame_source import open_source  # noqa: E402
+from matcher import GalleryMatcher  # noqa: E402
+from tracker import FaceTracker  # noqa: E402
+
+STAGES = ("resize", "detect", "encode", "match", "track", "frame")
+UNKNOWN_LABEL = "UNKNOWN"
+
+
+def config_key(cfg):
+    return f"scale={cfg['scale']} every={cfg['every']} tol={cfg['tolerance']} model={cfg['model']}"
+
+
+def percentiles(values):
+    if not values:
+        return None
+    v = np.array(values) * 1000
+    return {"n": len(v), "mean": float(v.mean()), "p50": float(np.percentile(v, 50)),
+            "p95": float(np.percentile(v, 95)), "p99": float(np.percentile(v, 99))}
+
+
+def label_for(source):
+    current = getattr(source, "current", None)
+    return None if current is None else current.parent.name
+
+
+# ----------------- satu konfigurasi (proses anak) -----------------
+def run_config(cfg, args):
+    import face_recognition
+
+    matcher = GalleryMatcher.load(args.gallery, index="exact")
+    detector = make_detector(cfg["model"])
+    times = {s: [] for s in STAGES}
+    acc = {"evaluated": 0, "correct": 0, "wrong": 0, "missed": 0, "rejected": 0, "false_accept": 0}
+    frames = 0
+    elapsed = 0.0
+
+    def timed(stage, fn, *a, **kw):
+        t = time.perf_counter()
+        out = fn(*a, **kw)
+        times[stage].append(time.perf_counter() - t)
+        return out
+
+    for spec in args.sources:
+        source = open_source(spec, args.size, fps=None).start()
+        sim_time = [0.0]    # waktu kiosk dari fps clip, supaya interval verifikasi tracker realistis
+        tracker = FaceTracker(clock=lambda: sim_time[0])
+        n = 0
+        try:
+            while args.max_frames is None or frames < args.max_frames:
+                frame = source.read()
+                if frame is None:
+                    break
+                n += 1
+                frames += 1
+                sim_time[0] = n / args.fps
+                t0 = time.perf_counter()
+                small = timed("resize", cv2.resize, frame, (0, 0), fx=cfg["scale"], fy=cfg["scale"],
+                              interpolation=cv2.INTER_LINEAR)
+                if n % cfg["every"] == 0 or cfg["every"] == 1:
+                    faces = timed("detect", detector.detect, small)
+                    tracks = tracker.associate(small, faces)
+                    todo = [i for i, t in enumerate(tracks) if tracker.needs_encoding(t)]
+                    if todo:
+                        encodings = timed("encode", face_recognition.face_encodings, small,
+                                          [faces[i] for i in todo])
+                        results = timed("match", matcher.match, encodings, cfg["tolerance"])
+                        for i, (name, dist) in zip(todo, results):
+                            tracker.set_identity(tracks[i], name, dist)
+                    score(acc, label_for(source), tracker.identified())
+                else:
+                    timed("track", tracker.update, small)
+                times["frame"].append(time.perf_counter() - t0)
+                elapsed += times["frame"][-1]
+        finally:
+            source.stop()
+
+    known = acc["evaluated"] - acc["rejected"] - acc["false_accept"]
+    return {
+        "config": cfg,
+        "frames": frames,
+        "fps": frames / elapsed if elapsed else None,
+        "stages_ms": {s: percentiles(v) for s, v in times.items()},
+        "peak_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+        "gallery": len(matcher),
+        "accuracy": dict(acc, **{
+            "accuracy": acc["correct"] / known if known else None,
+            "far": (acc["wrong"] + acc["false_accept"]) / acc["evaluated"] if acc["evaluated"] else None,
+            "frr": acc["missed"] / known if known else None,
+        }),
+    }
+
+
+def score(acc, label, identified):
+    """Satu frame deteksi berlabel: nama pertama yang teridentifikasi (seperti kiosk) vs label."""
+    if label is None:
+        return
+    pred = identified[0].name if identified else None
+    acc["evaluated"] += 1
+    if label.upper() == UNKNOWN_LABEL:
+        acc["rejected" if pred is None else "false_accept"] += 1
+    elif pred is None:
+        acc["missed"] += 1
+    else:
+        acc["correct" if pred.upper() == label.upper() else "wrong"] += 1
+
+
+# ----------------- grid & output -----------------
+def git_info():
+    def git(*cmd):
+        try:
+            return subprocess.run(["git", *cmd], cwd=ROOT, capture_output=True, text=True).stdout.strip()
+        except OSError:
+            return ""
+    return {"commit": git("rev-parse", "--short", "HEAD") or "unknown",
+            "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+def run_child(cfg, argv):
+    cmd = [sys.executable, __file__, *argv, "--run", json.dumps(cfg)]
+    proc = subprocess.run(cmd, capture_output=True, text=True)
+    for line in proc.stdout.splitlines():
+        if line.startswith("RESULT "):
+            return json.loads(line[len("RESULT "):])
+    print(f"❌ {config_key(cfg)} gagal:\n{proc.stderr.strip()[-2000:]}")
+    return None
+
+
+def fmt(v, spec=".1f"):
+    return "-" if v is None else format(v, spec)
+
+
+def print_row(r):
+    st, a = r["stages_ms"], r["accuracy"]
+    print(f"{config_key(r['config']):<42} | {fmt(r['fps']):>6} fps "
+          f"| detect p50 {fmt(st['detect'] and st['detect']['p50']):>6} p95 {fmt(st['detect'] and st['detect']['p95']):>6} ms "
+          f"| encode p95 {fmt(st['encode'] and st['encode']['p95']):>6} ms "
+          f"| match p95 {fmt(st['match'] and st['match']['p95'], '.2f'):>6} ms "
+          f"| RSS {r['peak_rss_mb']:>5.0f} MB | akurasi {fmt(a['accuracy'], '.1%'):>6} FAR {fmt(a['far'], '.1%'):>6}")
+
+
+def compare(old_path, new_path, threshold):
+    old, new = (json.loads(Path(p).read_text()) for p in (old_path, new_path))
+    before = {config_key(r["config"]): r for r in old["results"]}
+    print(f"{old['git']['commit']} -> {new['git']['commit']} (ambang {threshold:.0%})")
+    regressions = 0
+    for r in new["results"]:
+        key = config_key(r["config"])
+        o = before.get(key)
+        if o is None:
+            print(f"{key:<42} | baru")
+            continue
+        notes = []
+        if o["fps"] and r["fps"] and r["fps"] < o["fps"] * (1 - threshold):
+            notes.append("fps turun")
+        for s in ("detect", "encode", "match"):
+            a, b = o["stages_ms"].get(s), r["stages_ms"].get(s)
+            if a and b and b["p95"] > a["p95"] * (1 + threshold):
+                notes.append(f"{s} p95 naik")
+        a, b = o["accuracy"]["accuracy"], r["accuracy"]["accuracy"]
+        if a is not None and b is not None and b < a - 0.01:
+            notes.append("akurasi turun")
+        regressions += bool(notes)
+        print(f"{key:<42} | fps {fmt(o['fps'])} -> {fmt(r['fps'])} "
+              f"| akurasi {fmt(a, '.1%')} -> {fmt(b, '.1%')} | {'REGRESI: ' + ', '.join(notes) if notes else 'ok'}")
+    return 1 if regressions else 0
+
+
+def floats(text):
+    return [float(x) for x in text.split(",")]
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sources", nargs="*", help="replay:<folder|video> / synthetic:N (path biasa = replay)")
+    ap.add_argument("--gallery", default=str(ROOT / "encodings.pkl"))
+    ap.add_argument("--scale", type=floats, default=[0.25], help="PROCESS_SCALE, dipisah koma")
+    ap.add_argument("--every", type=lambda s: [int(x) for x in s.split(",")], default=[6],
+                    help="RECOG_EVERY_N_FRAMES, dipisah koma")
+    ap.add_argument("--tolerance", type=floats, default=[0.45], help="DIST_TOLERANCE, dipisah koma")
+    ap.add_argument("--model", type=lambda s: s.split(","), default=["hog"],
+                    help="detector: hog / cnn / yunet[:onnx] / haar, dipisah koma")
+    ap.add_argument("--fps", type=float, default=15.0, help="fps asli clip (jam tracker)")
+    ap.add_argument("--size", type=lambda s: tuple(int(x) for x in s.split("x")), default=(640, 480))
+    ap.add_argument("--max-frames", type=int, default=None)
+    ap.add_argument("--out", default=None, help="default bench/results/pipeline-<commit>.json")
+    ap.add_argument("--compare", nargs=2, metavar=("LAMA", "BARU"))
+    ap.add_argument("--threshold", type=float, default=0.1, help="batas regresi relatif untuk --compare")
+    ap.add_argument("--run", default=None, help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.compare:
+        raise SystemExit(compare(*args.compare, args.threshold))
+    if not args.sources:
+        ap.error("butuh minimal satu source (atau --compare)")
+    args.sources = [s if ":" in s else f"replay:{s}" for s in args.sources]
+
+    if args.run:
+        print("RESULT " + json.dumps(run_config(json.loads(args.run), args)))
+        return
+
+    # argumen yang sama diteruskan ke proses anak (tanpa grid)
+    child_argv = [*args.sources, "--gallery", args.gallery, "--fps", str(args.fps),
+                  "--size", "x".join(map(str, args.size))]
+    if args.max_frames:
+        child_argv += ["--max-frames", str(args.max_frames)]
+
+    grid = [{"scale": s, "every": e, "tolerance": t, "model": m}
+            for s, e, t, m in itertools.product(args.scale, args.every, args.tolerance, args.model)]
+    git = git_info()
+    print(f"{len(grid)} konfigurasi, source {' '.join(args.sources)}, gallery {args.gallery} "
+          f"(commit {git['commit']}{' +dirty' if git['dirty'] else ''})")
+    results = []
+    for cfg in grid:
+        r = run_child(cfg, child_argv)
+        if r is not None:
+            results.append(r)
+            print_row(r)
+
+    out = Path(args.out) if args.out else ROOT / "bench" / "results" / f"pipeline-{git['commit']}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({
+        "git": git,
+        "timestamp": datetime.now().isoformat(timespec="seconds"),
+        "host": {"node": platform.node(), "machine": platform.machine(),
+                 "python": platform.python_version(), "opencv": cv2.__version__},
+        "sources": args.sources, "gallery": args.gallery, "fps": args.fps,
+        "results": results,
+    }, indent=1))
+    print(f"hasil: {out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+"""
+Hot-reload gallery: latency reload dan dampaknya ke frame time.
+
+Loop "frame" sintetis (resize 640x480 -> display + match 2 wajah) jalan terus
+sementara file gallery ditulis ulang beberapa kali (seperti train.py).
+Dilaporkan: durasi load, latency perubahan file -> matcher baru aktif, dan
+frame time p50/p99/max di luar vs selama reload.
+
+    python3 bench/bench_reload.py --size 100000 --format gal
+"""
+import argparse
+import os
+import pickle
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gallery_store import save_gallery  # noqa: E402
+from hot_reload import HotReloader  # noqa: E402
+from matcher import GalleryMatcher  # noqa: E402
+
+
+def write_gallery(path, fmt, n, rng):
+    enc = rng.normal(0, 0.09, size=(n, 128))
+    names = [f"P{i // 5:06d}" for i in range(n)]
+    if fmt == "gal":
+        save_gallery(path, enc, names)
+    else:
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump({"encodings": list(enc), "names": names}, f)
+        os.replace(tmp, path)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--size", type=int, default=10_000)
+    ap.add_argument("--format", choices=["gal", "pkl"], default="gal")
+    ap.add_argument("--reloads", type=int, default=3)
+    ap.add_argument("--index", default="exact")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    frame = rng.integers(0, 255, size=(480, 640, 3), dtype=np.uint8)
+    faces = rng.normal(0, 0.09, size=(2, 128)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, f"encodings.{args.format}")
+        write_gallery(path, args.format, args.size, rng)
+        reloader = HotReloader([path], lambda: GalleryMatcher.load(path, index=args.index),
+                               interval=0.05, settle=0.05, name="gallery").start()
+
+        stop = threading.Event()
+
+        def writer():
+            for _ in range(args.reloads):
+                time.sleep(1.0)
+                write_gallery(path, args.format, args.size, rng)
+            time.sleep(1.0)
+            stop.set()
+
+        threading.Thread(target=writer, daemon=True).start()
+        times = []
+        while not stop.is_set():
+            t = time.perf_counter()
+            busy = reloader.loading
+            matcher = reloader.current()
+            cv2.resize(frame, (1024, 600))
+            matcher.match(faces, 0.45)
+            times.append(((time.perf_counter() - t) * 1000, busy or reloader.loading))
+        reloader.stop()
+
+    print(f"gallery {args.size} ({args.format}, index={args.index}) | reloads: {reloader.reloads}")
+    print(f"load terakhir : {reloader.last_load_s * 1000:.1f} ms")
+    print(f"latency reload: {reloader.last_latency_s * 1000:.1f} ms (termasuk settle {reloader.settle * 1000:.0f} ms)")
+    for label, during in (("normal", False), ("reload", True)):
+        ft = np.array([t for t, b in times if b == during])
+        if len(ft):
+            print(f"frame {label:>6}: p50 {np.percentile(ft, 50):.2f} | p99 {np.percentile(ft, 99):.2f} | "
+                  f"max {ft.max():.2f} ms ({len(ft)} frame)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+"""
+Query laporan: SQL ad-hoc di tabel absensi mentah vs agregat (report.py).
+
+Dataset sintetis: --people orang di --instansi instansi, --years tahun hari
+kerja (Senin-Jumat), tiap hari ~90% hadir (15% terlambat), ~95% yang hadir
+juga PULANG (10% pulang awal). Default 5 tahun x 5000 orang ~ 11 juta baris.
+History di-bulk insert tanpa trigger lalu agregat di-backfill (= biaya
+migrasi v4 di DB lama); setelah itu diukur:
+
+- latency query per orang / per instansi / per tanggal untuk beberapa rentang
+  (median --repeat kali), hasil agregat dicek sama dengan hasil SQL mentah
+- overhead trigger agregat saat insert satu hari baru (batch 64 per commit,
+  seperti AttendanceWriter)
+- export streaming seluruh rentang ke CSV: baris/detik & peak RSS, vs
+  fetchall untuk 1 tahun
+
+    python3 bench/bench_report.py
+    python3 bench/bench_report.py --people 500 --years 1 --repeat 3
+"""
+import argparse
+import json
+import os
+import random
+import resource
+import statistics
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from db_writer import AGG_BACKFILL, connect, migrate  # noqa: E402
+from report import FIELDS, AttendanceReport  # noqa: E402
+
+RAW_TOTALS = """
+    SELECT user_id, SUM(mode = 'MASUK'), SUM(status = 'Terlambat'), SUM(mode = 'PULANG'),
+           SUM(status = 'Pulang sebelum waktunya')
+    FROM absensi WHERE date BETWEEN ? AND ? {user} GROUP BY user_id ORDER BY user_id
+"""
+RAW_DAILY = """
+    SELECT date, SUM(mode = 'MASUK'), SUM(status = 'Terlambat'), SUM(mode = 'PULANG'),
+           SUM(status = 'Pulang sebelum waktunya')
+    FROM absensi WHERE date BETWEEN ? AND ? GROUP BY date ORDER BY date
+"""
+INSERT_RAW = "INSERT INTO absensi (user_id, nama, date, time, mode, status) VALUES (?, ?, ?, ?, ?, ?)"
+
+
+def rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def workdays(start, years):
+    d, end = start, start.replace(year=start.year + years)
+    while d < end:
+        if d.weekday() < 5:
+            yield d.isoformat()
+        d += timedelta(days=1)
+
+
+def day_rows(day, names, rng):
+    rows = []
+    for uid, name in enumerate(names, 1):
+        if rng.random() >= 0.9:
+            continue
+        late = rng.random() < 0.15
+        rows.append((uid, name, day, f"{8 if late else 7:02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}",
+                     "MASUK", "Terlambat" if late else "Tepat waktu"))
+        if rng.random() < 0.95:
+            early = rng.random() < 0.1
+            rows.append((uid, name, day, f"{15 if early else 17:02d}:{rng.randrange(60):02d}:00",
+                         "PULANG", "Pulang sebelum waktunya" if early else "Pulang"))
+    return rows
+
+
+def generate(db, users_file, args):
+    rng = random.Random(0)
+    names = [f"ORANG{i:05d}" for i in range(args.people)]
+    with open(users_file, "w") as f:
+        json.dump({n: {"instansi": f"INSTANSI {rng.randrange(args.instansi):02d}", "status": "Pegawai"}
+                   for n in names}, f)
+    conn = connect(db)
+    migrate(conn)
+    triggers = conn.execute("SELECT name, sql FROM sqlite_master WHERE type = 'trigger'").fetchall()
+    for name, _ in triggers:
+        conn.execute(f"DROP TRIGGER {name}")
+    conn.execute("PRAGMA synchronous=OFF")
+    t = time.perf_counter()
+    days = list(workdays(date(2021, 1, 4), args.years))
+    with conn:
+        conn.executemany("INSERT INTO users (id, nama) VALUES (?, ?)", list(enumerate(names, 1)))
+        for day in days:
+            conn.executemany(INSERT_RAW, day_rows(day, names, rng))
+    n = conn.execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+    print(f"dataset: {args.people} orang, {args.instansi} instansi, {len(days)} hari kerja, {n} baris "
+          f"({time.perf_counter() - t:.0f}s generate, {os.path.getsize(db) / 2**20:.0f} MB)")
+
+    size = os.path.getsize(db)
+    t = time.perf_counter()
+    conn.executescript(f"BEGIN;\n{AGG_BACKFILL}\nCOMMIT;")
+    conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    print(f"backfill agregat (migrasi v4 di DB lama): {time.perf_counter() - t:.1f}s, "
+          f"+{(os.path.getsize(db) - size) / 2**20:.0f} MB "
+          + " | ".join(f"{tb} {conn.execute(f'SELECT COUNT(*) FROM {tb}').fetchone()[0]} baris"
+                       for tb in ("agg_harian", "agg_bulanan", "agg_tanggal")))
+    return conn, names, days, triggers
+
+
+def timed(fn, repeat):
+    lat, res = [], None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        res = fn()
+        lat.append((time.perf_counter() - t) * 1000)
+    return statistics.median(lat), res
+
+
+def raw_institutions(conn, users, start, end):
+    names = dict(conn.execute("SELECT id, nama FROM users"))
+    out = {}
+    for uid, *vals in conn.execute(RAW_TOTALS.format(user=""), (start, end)):
+        row = out.setdefault(users[names[uid]]["instansi"], dict.fromkeys(FIELDS, 0))
+        for f, v in zip(FIELDS, vals):
+            row[f] += v
+    return out
+
+
+def queries(conn, report, users, names, days, args):
+    first, last = days[0], days[-1]
+    last_year = (date.fromisoformat(last) - timedelta(days=365)).isoformat()
+    mid = date.fromisoformat(days[len(days) // 2]).replace(day=1)
+    month = (mid.isoformat(), ((mid + timedelta(days=31)).replace(day=1) - timedelta(days=1)).isoformat())
+    ranges = {"1 bulan": month, "1 tahun (tidak rata bulan)": (last_year, last), "seluruh": (first, last)}
+    name = names[len(names) // 3]
+    uid = report.user_id(name)
+
+    print(f"\n{'query':<40} | {'SQL mentah':>11} | {'agregat':>9} | speedup | hasil sama")
+    for label, (a, b) in ranges.items():
+        raw_ms, raw = timed(lambda: conn.execute(RAW_TOTALS.format(user="AND user_id = ?"), (a, b, uid)).fetchall(),
+                            args.repeat)
+        agg_ms, agg = timed(lambda: report.person(name, a, b), args.repeat)
+        same = list(raw[0][1:]) == [agg["total"][f] for f in FIELDS]
+        print(f"{'orang, ' + label:<40} | {raw_ms:8.2f} ms | {agg_ms:6.2f} ms | {raw_ms / agg_ms:6.0f}x | {same}")
+
+        raw_ms, raw = timed(lambda: raw_institutions(conn, users, a, b), args.repeat)
+        agg_ms, agg = timed(lambda: report.institutions(a, b), args.repeat)
+        same = all([agg[k][f] for f in FIELDS] == [v[f] for f in FIELDS] for k, v in raw.items())
+        print(f"{'instansi, ' + label:<40} | {raw_ms:8.1f} ms | {agg_ms:6.1f} ms | {raw_ms / agg_ms:6.0f}x | {same}")
+
+        raw_ms, raw = timed(lambda: conn.execute(RAW_DAILY, (a, b)).fetchall(), args.repeat)
+        agg_ms, agg = timed(lambda: report.daily(a, b), args.repeat)
+        print(f"{'per tanggal, ' + label:<40} | {raw_ms:8.1f} ms | {agg_ms:6.1f} ms | {raw_ms / agg_ms:6.0f}x "
+              f"| {raw == agg}")
+
+
+def insert_overhead(conn, names, days, triggers, args):
+    """Satu hari baru, batch 64 baris per commit: tanpa trigger vs dengan trigger (outbox + agregat)."""
+    rng = random.Random(1)
+    day = (date.fromisoformat(days[-1]) + timedelta(days=3)).isoformat()
+    rows = day_rows(day, names, rng)
+    conn.execute("PRAGMA synchronous=NORMAL")
+    result = {}
+    for label in ("tanpa trigger", "dengan trigger"):
+        if label == "dengan trigger":
+            for _, sql in triggers:
+                conn.execute(sql)
+        t = time.perf_counter()
+        for i in range(0, len(rows), 64):
+            with conn:
+                conn.executemany(INSERT_RAW, rows[i:i + 64])
+        result[label] = time.perf_counter() - t
+        if label == "tanpa trigger":
+            with conn:
+                conn.execute("DELETE FROM absensi WHERE date = ?", (day,))
+    ok = conn.execute("SELECT masuk FROM agg_tanggal WHERE date = ?", (day,)).fetchone()[0] \
+        == sum(r[4] == "MASUK" for r in rows)
+    base, trig = result["tanpa trigger"], result["dengan trigger"]
+    print(f"\ninsert 1 hari ({len(rows)} baris, batch 64) | tanpa trigger {len(rows) / base:8.0f} baris/s "
+          f"| dengan trigger {len(rows) / trig:8.0f} baris/s | {trig / len(rows) * 1e6 - base / len(rows) * 1e6:.0f} "
+          f"us/baris overhead | agregat hari baru benar: {ok}")
+
+
+def export(report, days, tmp):
+    first, last = days[0], days[-1]
+    out = os.path.join(tmp, "export.csv")
+    before = rss_mb()
+    t = time.perf_counter()
+    n = report.export_csv(out, first, last)
+    dt = time.perf_counter() - t
+    print(f"\nexport streaming {first}..{last} | {n} baris {os.path.getsize(out) / 2**20:.0f} MB CSV "
+          f"dalam {dt:.1f}s = {n / dt:.0f} baris/s | peak RSS {before:.0f} -> {rss_mb():.0f} MB")
+    os.unlink(out)
+
+    year = (date.fromisoformat(last) - timedelta(days=365)).isoformat()
+    before = rss_mb()
+    t = time.perf_counter()
+    rows = report.conn.execute("SELECT date, time, nama, mode, status FROM absensi WHERE date BETWEEN ? AND ? "
+                               "ORDER BY date, id", (year, last)).fetchall()
+    print(f"fetchall 1 tahun (cara naif)  | {len(rows)} baris dalam {time.perf_counter() - t:.1f}s "
+          f"| peak RSS {before:.0f} -> {rss_mb():.0f} MB")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--people", type=int, default=5000)
+    ap.add_argument("--years", type=int, default=5)
+    ap.add_argument("--instansi", type=int, default=40)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--keep", default=None, help="simpan DB sintetis di path ini")
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = args.keep or os.path.join(tmp, "report.db")
+        users_file = os.path.join(tmp, "users.json")
+        conn, names, days, triggers = generate(db, users_file, args)
+        report = AttendanceReport(db, users_file)
+        with open(users_file) as f:
+            users = json.load(f)
+        queries(conn, report, users, names, days, args)
+        insert_overhead(conn, names, days, triggers, args)
+        export(report, days, tmp)
+        report.close()
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
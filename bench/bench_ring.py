@@ -0,0 +1,163 @@
+"""
+Jalur frame kamera -> UI/recognition: copy + lock (versi lama) vs FrameRing.
+
+Source sintetis menghasilkan frame 640x480 RGB dengan laju --fps (seperti
+capture_array() yang blocking). Consumer:
+  - UI loop: ambil frame terbaru, resize ke layar, "waitKey" 1 ms
+  - recognition: thread terpisah, resize ke 0.25 lalu kerja --recog-ms
+Dilaporkan: MB/s yang di-copy, latency frame (commit -> UI ambil), loop UI
+per detik dan CPU proses.
+
+    python3 bench/bench_ring.py --fps 30 --seconds 5
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from frame_ring import FrameRing  # noqa: E402
+
+SHAPE = (480, 640, 3)
+SCREEN = (1024, 600)
+
+
+class CopySource:
+    """Versi lama: latest_frame = arr.copy() di bawah lock, consumer juga .copy()."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.frame = None
+        self.ts = 0.0
+        self.copies = 0
+
+    def write(self, arr, ts):
+        with self.lock:
+            self.frame = arr.copy()
+            self.ts = ts
+            self.copies += 1
+
+    def read(self, last_ts):
+        # UI lama: polling + copy setiap putaran, walau frame belum berubah
+        time.sleep(0.001)
+        with self.lock:
+            if self.frame is None:
+                return None, 0.0
+            self.copies += 1
+            return self.frame.copy(), self.ts
+
+
+class RingSource:
+    def __init__(self, slots):
+        self.ring = FrameRing(slots, SHAPE)
+        self.copies = 0
+        self.last_seq = 0
+        self.torn = 0
+
+    def write(self, arr, ts):
+        self.ring.write(arr, ts)
+        self.copies += 1
+
+    def read(self, last_ts):
+        seq, frame, ts = self.ring.wait_newer(self.last_seq, timeout=0.1)
+        self.last_seq = seq
+        return frame, ts
+
+
+def producer(src, fps, frames, stop):
+    period = 1.0 / fps
+    deadline = time.perf_counter()
+    n = 0
+    while not stop.is_set():
+        deadline += period
+        delay = deadline - time.perf_counter()
+        if delay > 0:
+            time.sleep(delay)    # capture_array() menunggu frame berikut
+        src.write(frames[n % len(frames)], time.perf_counter())
+        n += 1
+
+
+def recognizer(src, recog_ms, stop, counts):
+    while not stop.is_set():
+        if isinstance(src, RingSource):
+            seq, frame, _ = src.ring.latest()
+            if frame is None:
+                time.sleep(0.01)
+                continue
+            cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+            if not src.ring.is_valid(seq):
+                src.torn += 1
+        else:
+            frame, _ = src.read(None)
+            if frame is None:
+                continue
+            cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+        counts["recog"] += 1
+        time.sleep(recog_ms / 1000)
+
+
+def run(mode, args):
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 255, SHAPE, dtype=np.uint8) for _ in range(4)]
+    src = CopySource() if mode == "copy" else RingSource(args.slots)
+    stop = threading.Event()
+    counts = {"recog": 0}
+    threads = [threading.Thread(target=producer, args=(src, args.fps, frames, stop), daemon=True),
+               threading.Thread(target=recognizer, args=(src, args.recog_ms, stop, counts), daemon=True)]
+    for t in threads:
+        t.start()
+
+    latencies, loops, last_ts = [], 0, None
+    cpu0, t0 = time.process_time(), time.perf_counter()
+    end = t0 + args.seconds
+    while time.perf_counter() < end:
+        frame, ts = src.read(last_ts)
+        if frame is None:
+            continue
+        if ts != last_ts:
+            latencies.append((time.perf_counter() - ts) * 1000)
+            last_ts = ts
+        cv2.resize(frame, SCREEN, interpolation=cv2.INTER_LINEAR)
+        if mode == "ring":
+            time.sleep(0.001)    # cv2.waitKey(1)
+        loops += 1
+    elapsed = time.perf_counter() - t0
+    cpu = time.process_time() - cpu0
+    stop.set()
+    for t in threads:
+        t.join(timeout=1.0)
+
+    nbytes = frames[0].nbytes
+    lat = np.array(latencies) if latencies else np.array([np.nan])
+    return {
+        "mb_s": src.copies * nbytes / elapsed / 1e6,
+        "p50": np.percentile(lat, 50), "p95": np.percentile(lat, 95),
+        "loops": loops / elapsed,
+        "cpu": cpu / elapsed,
+        "recog": counts["recog"] / elapsed,
+        "torn": getattr(src, "torn", 0),
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--slots", type=int, default=4)
+    ap.add_argument("--recog-ms", type=float, default=50.0)
+    ap.add_argument("--seconds", type=float, default=5.0)
+    args = ap.parse_args()
+
+    print(f"source sintetis {SHAPE[1]}x{SHAPE[0]} @ {args.fps:.0f} fps, ring {args.slots} slot")
+    for mode in ("copy", "ring"):
+        r = run(mode, args)
+        print(f"{mode:>5} | copy {r['mb_s']:>7.1f} MB/s | latency p50 {r['p50']:>5.2f} ms, p95 {r['p95']:>5.2f} ms "
+              f"| UI loop {r['loops']:>6.0f}/s | CPU {r['cpu']:>4.0%} | recog {r['recog']:>4.1f}/s "
+              f"| torn {r['torn']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Start-up gallery: encodings.pkl (pickle list float64) vs encodings.gal (memmap).
+
+Tiap varian dijalankan di proses baru supaya waktu load & RSS tidak saling
+mempengaruhi (butuh /proc, Linux). Matcher dibuat dengan index='exact' agar yang terukur hanya
+biaya format (bukan build IVF).
+
+    python3 bench/bench_startup.py --sizes 10000 100000
+"""
+import argparse
+import multiprocessing as mp
+import os
+import pickle
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from gallery_store import save_gallery  # noqa: E402
+from matcher import GalleryMatcher  # noqa: E402
+
+
+def private_mb():
+    # RssAnon = memori privat proses; page memmap (file-backed) tidak ikut karena di-share
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("RssAnon:"):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+def _child(path, out):
+    mem0 = private_mb()
+    t = time.perf_counter()
+    m = GalleryMatcher.load(path, index="exact")
+    ready = time.perf_counter() - t
+    m.match(np.zeros((1, 128), dtype=np.float32), 0.45)
+    first = time.perf_counter() - t
+    out.put((ready, first, private_mb() - mem0))
+
+
+def measure(path):
+    ctx = mp.get_context("spawn")
+    q = ctx.Queue()
+    p = ctx.Process(target=_child, args=(path, q))
+    p.start()
+    res = q.get()
+    p.join()
+    return res
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="*", default=[10_000, 100_000])
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'N':>7} | {'format':>6} | {'file MB':>7} | {'load ms':>8} | {'1st match ms':>12} | {'private +MB':>11}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for n in args.sizes:
+            # sama seperti output train.py: list array float64 + list nama
+            encodings = list(rng.normal(0, 0.09, size=(n, 128)))
+            names = [f"P{i // 5:06d}" for i in range(n)]
+            pkl = os.path.join(tmp, f"g{n}.pkl")
+            gal = os.path.join(tmp, f"g{n}.gal")
+            with open(pkl, "wb") as f:
+                pickle.dump({"encodings": encodings, "names": names}, f)
+            save_gallery(gal, encodings, names)
+
+            for label, path in (("pickle", pkl), ("gal", gal)):
+                ready, first, mem = measure(path)
+                size = os.path.getsize(path) / 1e6
+                print(f"{n:>7} | {label:>6} | {size:>7.1f} | {ready * 1000:>8.1f} | {first * 1000:>12.1f} | {mem:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,204 @@
+"""
+Throughput sync & waktu catch-up setelah satu hari offline.
+
+Aggregation service (sync_server.py) dijalankan sebagai proses kedua, lewat
+TCP localhost atau Unix socket. Beberapa kiosk (DB lokal masing-masing)
+mencatat satu hari penuh absensi saat server mati: setiap orang MASUK +
+PULANG di salah satu pintu, sebagian (--overlap) tap juga di pintu lain
+(duplikat lintas kiosk). Lalu server dinyalakan dan semua kiosk catch-up
+bersamaan. Dilaporkan per ukuran batch: waktu catch-up, baris/detik, byte
+terkirim (zlib) vs JSON mentah, duplikat yang dibuang server, dan apakah
+ledger tiap kiosk sudah berisi absensi kiosk lain.
+
+Setelah itu kiosk berjalan normal (thread SyncClient, --interval) dan
+diukur latency propagasi: tap di kiosk A -> masuk ledger kiosk B.
+
+    python3 bench/bench_sync.py --kiosks 4 --people 5000 --batch 100,500,2000
+    python3 bench/bench_sync.py --transport unix
+"""
+import argparse
+import os
+import random
+import sqlite3
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import numpy as np
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+from db_writer import INSERT_SQL, INSERT_USER_SQL, AttendanceWriter, connect, migrate  # noqa: E402
+from sync import SyncClient, open_connection  # noqa: E402
+
+DAY = "2026-01-15"
+
+
+def offline_day(paths, people, overlap, seed=0):
+    """Isi DB tiap kiosk dengan satu hari absensi (server mati). Return jumlah baris per kiosk."""
+    rng = random.Random(seed)
+    per_kiosk = [[] for _ in paths]
+    for p in range(people):
+        name = f"ORANG{p:05d}"
+        for mode, hour in (("MASUK", 7), ("PULANG", 17)):
+            t = f"{hour:02d}:{rng.randrange(60):02d}:{rng.randrange(60):02d}"
+            status = "Tepat waktu" if mode == "MASUK" else "Pulang"
+            k = rng.randrange(len(paths))
+            per_kiosk[k].append((name, DAY, t, mode, status))
+            if rng.random() < overlap:
+                other = (k + 1 + rng.randrange(len(paths) - 1)) % len(paths) if len(paths) > 1 else k
+                per_kiosk[other].append((name, DAY, t, mode, status))
+    for path, rows in zip(paths, per_kiosk):
+        conn = connect(path)
+        migrate(conn)
+        rows.sort(key=lambda r: r[2])    # urutan tap sepanjang hari
+        with conn:
+            conn.executemany(INSERT_USER_SQL, [(r[0],) for r in rows])
+            conn.executemany(INSERT_SQL, [(r[0],) + r for r in rows])
+        conn.close()
+    return [len(r) for r in per_kiosk]
+
+
+def start_server(tmp, transport, port):
+    db = os.path.join(tmp, "pusat.db")
+    if transport == "unix":
+        sock = os.path.join(tmp, "sync.sock")
+        cmd, url = ["--unix", sock], f"unix:{sock}"
+    else:
+        cmd, url = ["--host", "127.0.0.1", "--port", str(port)], f"http://127.0.0.1:{port}"
+    proc = subprocess.Popen([sys.executable, str(ROOT / "sync_server.py"), "--db", db, *cmd],
+                            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            conn = open_connection(url, timeout=1.0)
+            conn.request("GET", "/status")
+            conn.getresponse().read()
+            conn.close()
+            return proc, url, db
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise SystemExit(f"❌ sync_server tidak bisa start ({url})")
+
+
+def run_batch(args, batch, tmp):
+    kiosk_dir = tempfile.mkdtemp(dir=tmp)
+    paths = [os.path.join(kiosk_dir, f"kiosk{k}.db") for k in range(args.kiosks)]
+    rows = offline_day(paths, args.people, args.overlap)
+    size_kb = sum(os.path.getsize(p) for p in paths) / 1024
+
+    proc, url, server_db = start_server(kiosk_dir, args.transport, args.port)
+    try:
+        clients = [SyncClient(p, f"kiosk{k}", url, batch=batch, today=lambda: DAY)
+                   for k, p in enumerate(paths)]
+        trips = [0] * len(clients)
+
+        def catch_up(i):
+            trips[i] = clients[i].catch_up()
+
+        t = time.perf_counter()
+        threads = [threading.Thread(target=catch_up, args=(i,)) for i in range(len(clients))]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        # putaran kedua: ledger dari kiosk yang selesai belakangan
+        for c in clients:
+            c.catch_up()
+        elapsed = time.perf_counter() - t
+
+        total = sum(rows)
+        sent = sum(c.stats["bytes_sent"] for c in clients)
+        raw = sum(c.stats["bytes_raw"] for c in clients)
+        central = sqlite3.connect(server_db).execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+        ledger_ok = all(
+            sqlite3.connect(p).execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+            + sqlite3.connect(p).execute("SELECT COUNT(*) FROM remote_ledger r WHERE NOT EXISTS "
+                                         "(SELECT 1 FROM absensi a WHERE a.nama = r.nama AND a.date = r.date "
+                                         "AND a.mode = r.mode)").fetchone()[0] == central
+            for p in paths)
+        print(f"batch {batch:>5} | catch-up {total} baris ({size_kb:.0f} KB DB) dalam {elapsed:6.2f}s "
+              f"= {total / elapsed:8.0f} baris/s | {max(trips)} round trip/kiosk "
+              f"| {sent / 1024:7.0f} KB terkirim (JSON {raw / 1024:.0f} KB, {raw / max(sent, 1):.1f}x) "
+              f"| pusat {central} unik ({total - central} duplikat) | ledger lengkap: {'ya' if ledger_ok else 'TIDAK'}")
+        return paths, url, proc
+    except BaseException:
+        proc.kill()
+        raise
+
+
+def propagation(paths, url, args):
+    """Kiosk jalan normal: tap di kiosk 0 (AttendanceWriter) -> muncul di ledger kiosk 1."""
+    seen = {}
+    got = threading.Event()
+
+    def on_ledger(entries):
+        for e in entries:
+            seen.setdefault(e[0], time.perf_counter())
+        got.set()
+
+    writer = AttendanceWriter(paths[0], flush_interval=0.05, verbose=False).start()
+    a = SyncClient(paths[0], "kiosk0", url, interval=args.interval, today=lambda: DAY).start()
+    b = SyncClient(paths[1], "kiosk1", url, interval=args.interval, today=lambda: DAY, on_ledger=on_ledger).start()
+    lat = []
+    try:
+        time.sleep(args.interval)
+        for i in range(args.taps):
+            name = f"TAMU{i:03d}"
+            t = time.perf_counter()
+            writer.submit(name, DAY, "12:00:00", "MASUK", "Terlambat")
+            deadline = t + 5 * args.interval + 5
+            while name not in seen and time.perf_counter() < deadline:
+                got.wait(0.01)
+                got.clear()
+            if name in seen:
+                lat.append((seen[name] - t) * 1000)
+            time.sleep(random.uniform(0, args.interval))
+    finally:
+        writer.stop()
+        a.stop()
+        b.stop()
+    if lat:
+        lat = np.array(lat)
+        print(f"propagasi A -> ledger B (interval {args.interval:g}s) | p50 {np.percentile(lat, 50):6.0f} ms "
+              f"p95 {np.percentile(lat, 95):6.0f} ms | {len(lat)}/{args.taps} tap")
+    else:
+        print("❌ propagasi: tidak ada tap yang sampai ke kiosk B")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--kiosks", type=int, default=4)
+    ap.add_argument("--people", type=int, default=5000)
+    ap.add_argument("--overlap", type=float, default=0.05, help="porsi tap yang juga tercatat di kiosk lain")
+    ap.add_argument("--batch", type=lambda s: [int(x) for x in s.split(",")], default=[100, 500, 2000])
+    ap.add_argument("--transport", choices=("tcp", "unix"), default="tcp")
+    ap.add_argument("--port", type=int, default=9299)
+    ap.add_argument("--interval", type=float, default=1.0, help="SYNC_INTERVAL untuk uji propagasi")
+    ap.add_argument("--taps", type=int, default=10)
+    args = ap.parse_args()
+    if args.kiosks < 2:
+        ap.error("butuh minimal 2 kiosk")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{args.kiosks} kiosk, {args.people} orang x MASUK+PULANG, overlap {args.overlap:.0%}, "
+              f"transport {args.transport}")
+        last = None
+        for batch in args.batch:
+            if last is not None:
+                last[2].terminate()
+                last[2].wait()
+            last = run_batch(args, batch, tmp)
+        paths, url, proc = last
+        try:
+            propagation(paths, url, args)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+
+if __name__ == "__main__":
+    main()
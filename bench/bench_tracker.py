@@ -0,0 +1,91 @@
+"""
+Recognition calls per menit & CPU: pipeline lama (encode semua wajah tiap
+RECOG_EVERY_N_FRAMES) vs FaceTracker (encode hanya track baru / perlu verifikasi).
+
+Clip direplay secepat mungkin, tapi waktu "kiosk" dihitung dari fps clip
+supaya interval verifikasi ulang tetap realistis. Butuh face_recognition.
+
+    python3 bench/bench_tracker.py clip.mp4 --gallery encodings.pkl --fps 30
+    python3 bench/bench_tracker.py folder_frame/ --fps 15
+"""
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import face_recognition
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from matcher import GalleryMatcher  # noqa: E402
+from tracker import FaceTracker  # noqa: E402
+
+PROCESS_SCALE = 0.25
+RECOG_EVERY_N_FRAMES = 6
+DIST_TOLERANCE = 0.45
+
+
+def read_clip(path):
+    """Frame RGB dari file video atau folder gambar (urut nama)."""
+    if os.path.isdir(path):
+        for name in sorted(os.listdir(path)):
+            img = cv2.imread(os.path.join(path, name))
+            if img is not None:
+                yield cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+        return
+    cap = cv2.VideoCapture(path)
+    while True:
+        ok, img = cap.read()
+        if not ok:
+            break
+        yield cv2.cvtColor(img, cv2.COLOR_BGR2RGB)
+    cap.release()
+
+
+def run(frames, matcher, fps, use_tracker):
+    sim_time = [0.0]
+    tracker = FaceTracker(clock=lambda: sim_time[0])
+    encodes = 0
+    cpu0 = time.process_time()
+    for n, frame in enumerate(frames, 1):
+        sim_time[0] = n / fps
+        small = cv2.resize(frame, (0, 0), fx=PROCESS_SCALE, fy=PROCESS_SCALE)
+        if n % RECOG_EVERY_N_FRAMES == 0:
+            faces = face_recognition.face_locations(small, model="hog")
+            if use_tracker:
+                tracks = tracker.associate(small, faces)
+                todo = [i for i, t in enumerate(tracks) if tracker.needs_encoding(t)]
+            else:
+                todo = list(range(len(faces)))
+            if todo:
+                encs = face_recognition.face_encodings(small, [faces[i] for i in todo])
+                encodes += len(encs)
+                results = matcher.match(encs, DIST_TOLERANCE)
+                if use_tracker:
+                    for i, (name, dist) in zip(todo, results):
+                        tracker.set_identity(tracks[i], name, dist)
+        elif use_tracker:
+            tracker.update(small)
+    cpu = time.process_time() - cpu0
+    minutes = len(frames) / fps / 60
+    return encodes / minutes, cpu / len(frames) * 1000
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("clip")
+    ap.add_argument("--gallery", default="encodings.pkl")
+    ap.add_argument("--fps", type=float, default=30.0, help="fps asli clip")
+    args = ap.parse_args()
+
+    frames = list(read_clip(args.clip))
+    matcher = GalleryMatcher.load(args.gallery)
+    print(f"{len(frames)} frame ({len(frames) / args.fps:.1f}s clip) | gallery {len(matcher)}")
+    for label, use_tracker in (("lama", False), ("tracker", True)):
+        per_min, cpu_ms = run(frames, matcher, args.fps, use_tracker)
+        print(f"{label:>8} | {per_min:>7.1f} encode/menit | CPU {cpu_ms:>6.2f} ms/frame")
+
+
+if __name__ == "__main__":
+    main()
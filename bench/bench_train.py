@@ -0,0 +1,49 @@
+"""
+Throughput train.py: cold build (tanpa manifest) vs no-op rebuild (tidak ada foto berubah).
+
+Butuh face_recognition (dlib). Dataset dicopy ke folder sementara supaya
+encodings.pkl / manifest asli tidak tersentuh.
+
+    python3 bench/bench_train.py --dataset dataset --workers 4
+"""
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import train  # noqa: E402
+
+
+def report(label, stats):
+    rate = stats["images"] / stats["seconds"] if stats["seconds"] > 0 else float("inf")
+    print(f"{label:>8} | {stats['images']:>6} foto | {stats['encoded']:>6} encode | "
+          f"{stats['seconds']:>7.2f}s | {rate:>9.1f} foto/s")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--dataset", default=train.DATASET_DIR)
+    ap.add_argument("--workers", type=int, default=None)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        dataset = os.path.join(tmp, "dataset")
+        shutil.copytree(args.dataset, dataset)
+        output = os.path.join(tmp, "encodings.pkl")
+        manifest = os.path.join(tmp, "manifest.pkl")
+        gallery = os.path.join(tmp, "encodings.gal")
+
+        report("cold", train.build(dataset, output, manifest, args.workers, full=True, gallery_file=gallery))
+        report("no-op", train.build(dataset, output, manifest, args.workers, gallery_file=gallery))
+
+        # satu foto baru (copy dengan nama lain) = kasus enrolment satu orang
+        first = next(Path(dataset).rglob("*.*"))
+        shutil.copy(first, first.with_name("bench_new" + first.suffix))
+        report("+1 foto", train.build(dataset, output, manifest, args.workers, gallery_file=gallery))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+"""
+Tap -> audio pertama: player baru per kalimat (versi lama) vs Speaker
+(pre-render + PCM LRU + satu output).
+
+Engine stub dengan waktu render --render-ms (espeak-ng di Pi 4 ~100-300 ms,
+gTTS lewat internet bisa > 1 detik). Output "null" tetap real-time, jadi
+antrean audio ikut terukur. Versi lama diukur sebagai biaya spawn proses
+player saja (batas bawah; decode mp3 & buka device ALSA belum termasuk).
+
+    python3 bench/bench_tts.py --users 20 --taps 40 --render-ms 200
+"""
+import argparse
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tts import AudioOutput, Speaker, StubEngine, phrases_for  # noqa: E402
+
+
+def pct(lat):
+    lat = np.array(lat) if lat else np.array([np.nan])
+    return np.percentile(lat, 50), np.percentile(lat, 95)
+
+
+def legacy(taps):
+    player = shutil.which("mpg123") or shutil.which("aplay") or shutil.which("true")
+    lat = []
+    for _ in range(taps):
+        t = time.perf_counter()
+        subprocess.Popen([player, "--version"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).wait()
+        lat.append((time.perf_counter() - t) * 1000)
+    return Path(player).name, lat
+
+
+def run(speaker, texts, gap):
+    speaker.latency_ms.clear()
+    for text in texts:
+        speaker.speak(text)
+        time.sleep(gap)    # tap berikutnya setelah kalimat sebelumnya selesai
+    deadline = time.perf_counter() + 5
+    while len(speaker.latency_ms) < len(texts) and time.perf_counter() < deadline:
+        time.sleep(0.01)
+    return list(speaker.latency_ms)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--users", type=int, default=20)
+    ap.add_argument("--taps", type=int, default=40)
+    ap.add_argument("--render-ms", type=float, default=200.0)
+    ap.add_argument("--gap", type=float, default=0.2, help="detik antar tap (lebih lama dari satu kalimat)")
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    names = [f"USER{i:03d}" for i in range(args.users)]
+    texts = [phrases_for(names[rng.integers(len(names))])["MASUK"] for _ in range(args.taps)]
+    with tempfile.TemporaryDirectory() as cache:
+        engine = StubEngine(sec_per_char=0.002, delay=args.render_ms / 1000)
+
+        player, lat = legacy(args.taps)
+        print(f"{'lama (spawn ' + player + ')':>22} | p50 {pct(lat)[0]:>7.2f} ms p95 {pct(lat)[1]:>7.2f} ms")
+
+        sp = Speaker(engine, cache, output=AudioOutput("null")).start()
+        lat = run(sp, texts, args.gap + args.render_ms / 1000)
+        print(f"{'render saat tap':>22} | p50 {pct(lat)[0]:>7.2f} ms p95 {pct(lat)[1]:>7.2f} ms")
+        sp.stop()
+
+        sp.cache.save()
+        sp = Speaker(engine, cache, output=AudioOutput("null")).start()    # seperti reboot: LRU kosong, cache disk tetap
+        lat = run(sp, texts, args.gap)
+        print(f"{'WAV di disk (restart)':>22} | p50 {pct(lat)[0]:>7.2f} ms p95 {pct(lat)[1]:>7.2f} ms "
+              f"| cache hit rate {sp.cache.hit_rate():.0%}")
+
+        t = time.perf_counter()
+        for name in names:
+            for text in phrases_for(name).values():
+                sp.load(text)
+        pre = time.perf_counter() - t
+        lat = run(sp, texts, args.gap)
+        print(f"{'pre-render + LRU':>22} | p50 {pct(lat)[0]:>7.2f} ms p95 {pct(lat)[1]:>7.2f} ms "
+              f"| pre-render {len(names) * 4} kalimat {pre:.1f}s, {sp.pcm.bytes / 1e6:.1f} MB PCM")
+        sp.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Waktu gambar UI per frame 1024x600: cara lama (tombol digambar ulang tiap
+frame, popup = copy frame penuh + addWeighted) vs compositor (sprite BGRA
+di-render sekali, blend hanya di region sprite).
+
+Diukur stage "draw" seperti di kiosk: resize frame kamera ke layar + tombol
+(+ popup), tanpa popup dan dengan popup 1 / 5 baris. Output kedua cara juga
+dibandingkan per pixel (selisih kecil wajar: pembulatan blend & anti-alias
+teks di atas layer transparan).
+
+    python3 bench/bench_ui.py --frames 500
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from compositor import Compositor, Sprite  # noqa: E402
+
+SCREEN_W, SCREEN_H = 1024, 600
+BTN_W, BTN_H = 260, 70
+BTN_Y = SCREEN_H - BTN_H - 20
+BUTTONS = (((80, BTN_Y, 80 + BTN_W, BTN_Y + BTN_H), "MASUK", (0, 200, 0)),
+           ((SCREEN_W - BTN_W - 80, BTN_Y, SCREEN_W - 80, BTN_Y + BTN_H), "PULANG", (0, 0, 200)))
+
+
+# ----------------- cara lama (salinan absensi.py sebelum compositor) -----------------
+def old_popup(display_frame, text, color):
+    h, w, _ = display_frame.shape
+    lines = text.split("\n")
+    box_w, box_h = min(700, w - 40), max(140, 50 + 30 * len(lines))
+    x1, y1 = (w - box_w) // 2, 10
+    x2, y2 = x1 + box_w, y1 + box_h
+    overlay = display_frame.copy()
+    alpha = 0.55
+    cv2.rectangle(overlay, (x1, y1), (x2, y2), (30, 30, 30), -1)
+    cv2.addWeighted(overlay, alpha, display_frame, 1 - alpha, 0, display_frame)
+    cv2.rectangle(display_frame, (x1, y1), (x2, y2), color, 2)
+    for i, line in enumerate(lines):
+        cv2.putText(display_frame, line, (x1 + 20, y1 + 35 + i * 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.75, (255, 255, 255), 2, cv2.LINE_AA)
+
+
+def old_button(frame, coords, text, color):
+    x1, y1, x2, y2 = coords
+    cv2.rectangle(frame, (x1 + 3, y1 + 3), (x2 + 3, y2 + 3), (30, 30, 30), -1)
+    cv2.rectangle(frame, (x1, y1), (x2, y2), color, -1)
+    cv2.rectangle(frame, (x1, y1), (x2, y2), (40, 40, 40), 2)
+    (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.05, 3)
+    tx = x1 + (BTN_W - tw) // 2
+    ty = y1 + (BTN_H + th) // 2 - 6
+    cv2.putText(frame, text, (tx, ty), cv2.FONT_HERSHEY_SIMPLEX, 1.05, (0, 0, 0), 3)
+
+
+def draw_old(frame, popup):
+    out = cv2.resize(frame, (SCREEN_W, SCREEN_H), interpolation=cv2.INTER_LINEAR)
+    for coords, text, color in BUTTONS:
+        old_button(out, coords, text, color)
+    if popup:
+        old_popup(out, popup, (0, 200, 0))
+    return out
+
+
+# ----------------- compositor (sama dengan absensi.py) -----------------
+def render_popup(text, border, w):
+    lines = text.split("\n")
+    box_w, box_h = min(700, w - 40), max(140, 50 + 30 * len(lines))
+
+    def draw(color, alpha):
+        for img, bg, fg in ((color, (30, 30, 30), border), (alpha, 140, 255)):
+            cv2.rectangle(img, (1, 1), (box_w + 1, box_h + 1), bg, -1)
+            cv2.rectangle(img, (1, 1), (box_w + 1, box_h + 1), fg, 2)
+            for i, line in enumerate(lines):
+                cv2.putText(img, line, (21, 36 + i * 30), cv2.FONT_HERSHEY_SIMPLEX, 0.75,
+                            (255, 255, 255) if img is color else 255, 2, cv2.LINE_AA)
+    return Sprite.render((box_w + 3, box_h + 3), draw, pos=((w - box_w) // 2 - 1, 9))
+
+
+def render_button(coords, text, bg):
+    x1, y1, x2, y2 = coords
+    bw, bh = x2 - x1, y2 - y1
+
+    def draw(color, alpha):
+        (tw, th), _ = cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, 1.05, 3)
+        for img, shadow, fill, edge, ink in ((color, (30, 30, 30), bg, (40, 40, 40), (0, 0, 0)),
+                                             (alpha, 255, 255, 255, 255)):
+            cv2.rectangle(img, (4, 4), (bw + 4, bh + 4), shadow, -1)
+            cv2.rectangle(img, (1, 1), (bw + 1, bh + 1), fill, -1)
+            cv2.rectangle(img, (1, 1), (bw + 1, bh + 1), edge, 2)
+            cv2.putText(img, text, ((BTN_W - tw) // 2 + 1, (BTN_H + th) // 2 - 5),
+                        cv2.FONT_HERSHEY_SIMPLEX, 1.05, ink, 3)
+    return Sprite.render((bw + 5, bh + 5), draw, pos=(x1 - 1, y1 - 1))
+
+
+def draw_new(ui, frame, popup):
+    out = cv2.resize(frame, (SCREEN_W, SCREEN_H), interpolation=cv2.INTER_LINEAR)
+    for coords, text, color in BUTTONS:
+        ui.draw(out, ("button", text), (coords, color), lambda: render_button(coords, text, color))
+    if popup:
+        ui.draw(out, "popup", (popup, (0, 200, 0), SCREEN_W), lambda: render_popup(popup, (0, 200, 0), SCREEN_W))
+    return out
+
+
+def timed(fn, frames):
+    lat = []
+    for frame in frames:
+        t = time.perf_counter()
+        fn(frame)
+        lat.append((time.perf_counter() - t) * 1000)
+    return np.array(lat)
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--frames", type=int, default=500)
+    ap.add_argument("--size", type=lambda s: tuple(int(x) for x in s.split("x")), default=(640, 480))
+    args = ap.parse_args()
+
+    rng = np.random.default_rng(0)
+    frames = [rng.integers(0, 256, (args.size[1], args.size[0], 3), dtype=np.uint8) for _ in range(8)]
+    frames = [frames[i % len(frames)] for i in range(args.frames)]
+    popups = {
+        "tanpa popup": None,
+        "popup 3 baris": "Name    : RAKA\nInstansi: Telkom\nStatus : Magang",
+        "popup 5 baris": "\n".join(f"ORANG {i} (Telkom) - Tepat waktu" for i in range(5)),
+    }
+    print(f"{args.frames} frame {args.size[0]}x{args.size[1]} -> {SCREEN_W}x{SCREEN_H} (resize + tombol + popup)")
+    for label, popup in popups.items():
+        ui = Compositor()
+        old = timed(lambda f: draw_old(f, popup), frames)
+        new = timed(lambda f: draw_new(ui, f, popup), frames)
+        diff = np.abs(draw_old(frames[0], popup).astype(np.int16) - draw_new(ui, frames[0], popup).astype(np.int16))
+        print(f"{label:>14} | lama p50 {np.percentile(old, 50):5.2f} ms p95 {np.percentile(old, 95):5.2f} ms "
+              f"| compositor p50 {np.percentile(new, 50):5.2f} ms p95 {np.percentile(new, 95):5.2f} ms "
+              f"| {np.median(old) / np.median(new):4.1f}x | render sprite {ui.stats['renders']}x "
+              f"| selisih pixel maks {diff.max()}, rata-rata {diff.mean():.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""
+Voting identitas (voting.py) vs keputusan satu frame: decision latency &
+false accept pada clip berlabel.
+
+Clip direplay lewat pipeline kiosk (resize -> detect -> tracker -> encode ->
+match) dengan waktu dari fps clip, sekali per kebijakan:
+
+    satu-frame  match pertama di bawah --tolerance langsung jadi identitas
+    voting      IdentityVoter (--window, --min-votes, --accept-dist, ...)
+
+Clip = folder frame berurutan (clips/<NAMA>/0001.jpg, ...) atau satu video;
+label = nama folder induknya, UNKNOWN = orang tidak terdaftar. Per track dilaporkan: keputusan (benar / salah / ditolak / tidak
+diputuskan), decision latency (track muncul -> identitas benar di-commit),
+false accept per track dan per frame deteksi (frame di mana tap akan mencatat
+orang yang salah), ganti identitas dalam satu track, dan jumlah encode.
+Butuh face_recognition.
+
+    python3 bench/bench_vote.py replay:clips --fps 15 --every 6
+    python3 bench/bench_vote.py replay:clips/UNKNOWN/pintu.mp4 --tolerance 0.5 --min-votes 3
+"""
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from bench_pipeline import UNKNOWN_LABEL, label_for  # noqa: E402
+from detector import make_detector  # noqa: E402
+from frame_source import open_source  # noqa: E402
+from matcher import GalleryMatcher  # noqa: E402
+from tracker import FaceTracker  # noqa: E402
+from voting import REJECTED, IdentityVoter  # noqa: E402
+
+
+def run(spec, args, make_voter):
+    """Replay satu source; return list ringkasan per track + jumlah frame deteksi salah & total."""
+    import face_recognition
+
+    matcher = GalleryMatcher.load(args.gallery, index="exact")
+    detector = make_detector(args.detector)
+    source = open_source(spec, (640, 480), fps=None).start()
+    sim_time = [0.0]
+    tracks, clip = {}, None
+    tracker = FaceTracker(clock=lambda: sim_time[0], voter=make_voter(lambda: sim_time[0]))
+    frames_wrong, frames_scored, encodes, n = 0, 0, 0, 0
+    try:
+        while True:
+            frame = source.read()
+            if frame is None:
+                break
+            n += 1
+            sim_time[0] = n / args.fps
+            current = getattr(source, "current", None)
+            if current is not None and current.parent != clip:
+                # clip (folder frame / video) baru: track tidak boleh terbawa dari clip sebelumnya
+                clip = current.parent
+                tracker = FaceTracker(clock=lambda: sim_time[0], voter=make_voter(lambda: sim_time[0]))
+            label = label_for(source)
+            small = cv2.resize(frame, (0, 0), fx=args.scale, fy=args.scale, interpolation=cv2.INTER_LINEAR)
+            if n % args.every:
+                tracker.update(small)
+                continue
+            faces = detector.detect(small)
+            found = tracker.associate(small, faces)
+            todo = [i for i, t in enumerate(found) if tracker.needs_encoding(t)]
+            if todo:
+                encs = face_recognition.face_encodings(small, [faces[i] for i in todo])
+                encodes += len(todo)
+                for i, (name, dist) in zip(todo, matcher.match(encs, args.tolerance)):
+                    tracker.set_identity(found[i], name, dist)
+            for t in found:
+                rec = tracks.setdefault((clip, t.id), {"label": label, "born": sim_time[0], "accepted": None,
+                                                       "names": [], "rejected": False})
+                if t.name is not None and t in tracker.identified():
+                    if not rec["names"] or rec["names"][-1] != t.name:
+                        rec["names"].append(t.name)
+                    if rec["accepted"] is None:
+                        rec["accepted"] = sim_time[0] - rec["born"]
+                elif t.state == REJECTED:
+                    rec["rejected"] = True
+            if label is not None:
+                frames_scored += 1
+                frames_wrong += any(is_wrong(label, t.name) for t in tracker.identified())
+    finally:
+        source.stop()
+    return list(tracks.values()), frames_wrong, frames_scored, encodes
+
+
+def is_wrong(label, name):
+    return label.upper() == UNKNOWN_LABEL or name.upper() != label.upper()
+
+
+def summarize(policy, tracks, frames_wrong, frames_scored, encodes):
+    labelled = [r for r in tracks if r["label"] is not None]
+    known = [r for r in labelled if r["label"].upper() != UNKNOWN_LABEL]
+    false_accept = [r for r in labelled if any(is_wrong(r["label"], nm) for nm in r["names"])]
+    correct = [r for r in known if r["names"] and not any(is_wrong(r["label"], nm) for nm in r["names"])]
+    undecided = [r for r in labelled if not r["names"] and not r["rejected"]]
+    lat = np.array([r["accepted"] for r in correct]) * 1000
+    flips = sum(max(0, len(r["names"]) - 1) for r in tracks)
+    lat_txt = (f"p50 {np.percentile(lat, 50):6.0f} ms p95 {np.percentile(lat, 95):6.0f} ms"
+               if len(lat) else "p50      - ms p95      - ms")
+    print(f"{policy:>10} | {len(labelled)} track: {len(correct)} benar, {len(false_accept)} false accept "
+          f"({len(false_accept) / len(labelled) if labelled else 0:.1%}), {len(undecided)} belum diputuskan "
+          f"| decision {lat_txt} | frame FA {frames_wrong}/{frames_scored} "
+          f"({frames_wrong / frames_scored if frames_scored else 0:.2%}) | ganti identitas {flips} | {encodes} encode")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("sources", nargs="+", help="replay:<folder|video> berlabel (path biasa = replay)")
+    ap.add_argument("--gallery", default=str(Path(__file__).resolve().parent.parent / "encodings.pkl"))
+    ap.add_argument("--fps", type=float, default=15.0, help="fps asli clip")
+    ap.add_argument("--scale", type=float, default=0.25)
+    ap.add_argument("--every", type=int, default=6)
+    ap.add_argument("--tolerance", type=float, default=0.45)
+    ap.add_argument("--detector", default="hog")
+    ap.add_argument("--window", type=int, default=5)
+    ap.add_argument("--window-sec", type=float, default=3.0)
+    ap.add_argument("--min-votes", type=int, default=2)
+    ap.add_argument("--ratio", type=float, default=0.6)
+    ap.add_argument("--accept-dist", type=float, default=0.42)
+    ap.add_argument("--instant-dist", type=float, default=0.35)
+    ap.add_argument("--reject-votes", type=int, default=3)
+    args = ap.parse_args()
+
+    policies = {
+        "satu-frame": lambda clock: None,
+        "voting": lambda clock: IdentityVoter(
+            window=args.window, window_sec=args.window_sec, min_votes=args.min_votes, ratio=args.ratio,
+            accept_dist=args.accept_dist, instant_dist=args.instant_dist,
+            reject_votes=args.reject_votes, clock=clock),
+    }
+    for spec in args.sources:
+        spec = spec if ":" in spec else f"replay:{spec}"
+        print(f"{spec} (deteksi tiap {args.every} frame @ {args.fps:g} fps = {args.every / args.fps * 1000:.0f} ms)")
+        for policy, make_voter in policies.items():
+            t = time.perf_counter()
+            tracks, frames_wrong, frames_scored, encodes = run(spec, args, make_voter)
+            if not tracks:
+                print(f"{policy:>10} | tidak ada wajah / frame")
+                continue
+            summarize(policy, tracks, frames_wrong, frames_scored, encodes)
+            print(f"{'':>10}   ({time.perf_counter() - t:.1f}s proses)")
+
+
+if __name__ == "__main__":
+    main()
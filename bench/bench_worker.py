@@ -0,0 +1,128 @@
+"""
+Display FPS & tap-to-result latency: recognition inline di UI loop vs RecognitionWorker.
+
+Kamera disimulasikan 30 fps (640x480). Biaya detect/encode dimodelkan dengan
+sleep (dlib melepas GIL selama detect/encode, jadi efeknya ke thread UI mirip);
+resize & gambar UI tetap dikerjakan sungguhan dengan OpenCV.
+
+    python3 bench/bench_worker.py --detect-ms 150 --encode-ms 120 --seconds 10
+"""
+import argparse
+import sys
+import threading
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from recog_worker import RecognitionResult, RecognitionWorker  # noqa: E402
+from scheduler import RecognitionScheduler  # noqa: E402
+
+
+class FakeCamera:
+    def __init__(self, fps):
+        self.fps = fps
+        self.lock = threading.Lock()
+        self.frame = None
+        self.ts = 0.0
+        self.running = True
+        rng = np.random.default_rng(0)
+        self.frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(4)]
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def _run(self):
+        n = 0
+        while self.running:
+            with self.lock:
+                self.frame = self.frames[n % len(self.frames)].copy()
+                self.ts = time.perf_counter()
+            n += 1
+            time.sleep(1.0 / self.fps)
+
+    def read(self):
+        with self.lock:
+            return self.frame, self.ts
+
+
+def make_pipeline(sched, detect_ms, encode_ms):
+    last = {"seq": 0, "ts": 0.0}
+
+    def process(frame, frame_id, frame_ts):
+        do_recog = sched.should_run()
+        cv2.resize(frame, (0, 0), fx=0.25, fy=0.25)
+        if do_recog:
+            time.sleep(detect_ms / 1000)
+            time.sleep(encode_ms / 1000)
+            last["seq"] += 1
+            last["ts"] = frame_ts
+        return RecognitionResult(frame_id, frame_ts, time.perf_counter(), last["seq"], last["ts"], 1, [], [], [])
+    return process
+
+
+def draw(frame):
+    out = cv2.resize(frame, (1024, 600))
+    cv2.rectangle(out, (80, 510), (340, 580), (0, 200, 0), -1)
+    cv2.rectangle(out, (684, 510), (944, 580), (0, 0, 200), -1)
+    cv2.putText(out, "MASUK", (150, 555), cv2.FONT_HERSHEY_SIMPLEX, 1.05, (0, 0, 0), 3)
+    return out
+
+
+def run(mode, args):
+    cam = FakeCamera(args.fps)
+    sched = RecognitionScheduler(every_n=args.every, adjust_sec=float("inf"))
+    process = make_pipeline(sched, args.detect_ms, args.encode_ms)
+    worker = RecognitionWorker(process).start() if mode == "worker" else None
+
+    frames, latencies = 0, []
+    tap_at, last_ts, result, fid = None, None, None, 0
+    next_tap = time.perf_counter() + 1.0
+    end = time.perf_counter() + args.seconds
+    while time.perf_counter() < end:
+        frame, ts = cam.read()
+        if frame is None or ts == last_ts:
+            time.sleep(0.001)
+            continue
+        last_ts = ts
+        now = time.perf_counter()
+        if tap_at is None and now >= next_tap:
+            tap_at = now
+            sched.boost()
+        if worker is not None:
+            worker.submit(frame, ts)
+            result = worker.latest()
+        else:
+            fid += 1
+            result = process(frame, fid, ts)
+        if tap_at is not None and result is not None and result.detect_ts >= tap_at:
+            latencies.append((time.perf_counter() - tap_at) * 1000)
+            tap_at, next_tap = None, time.perf_counter() + 1.0
+        draw(frame)
+        frames += 1
+    if worker is not None:
+        worker.stop()
+    cam.running = False
+    lat = np.array(latencies) if latencies else np.array([np.nan])
+    return frames / args.seconds, np.median(lat), np.max(lat), worker.stats if worker else None
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--fps", type=float, default=30.0)
+    ap.add_argument("--every", type=int, default=6)
+    ap.add_argument("--detect-ms", type=float, default=150.0)
+    ap.add_argument("--encode-ms", type=float, default=120.0)
+    ap.add_argument("--seconds", type=float, default=8.0)
+    args = ap.parse_args()
+
+    print(f"kamera {args.fps:.0f} fps | detect {args.detect_ms:.0f} ms + encode {args.encode_ms:.0f} ms "
+          f"tiap {args.every} frame")
+    for mode in ("inline", "worker"):
+        fps, p50, pmax, stats = run(mode, args)
+        extra = f" | dropped {stats['dropped']}/{stats['submitted']}" if stats else ""
+        print(f"{mode:>7} | display {fps:>5.1f} fps | tap->hasil p50 {p50:>6.0f} ms, max {pmax:>6.0f} ms{extra}")
+
+
+if __name__ == "__main__":
+    main()
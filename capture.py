@@ -0,0 +1,111 @@
+import threading
+import time
+from contextlib import nullcontext
+
+from detector import MotionGate
+
+
+class CaptureThread:
+    """
+    Thread kamera: baca FrameSource lalu tulis ke FrameRing.
+
+    `lockstep=True` (replay/synthetic tanpa --fps): setelah menulis frame,
+    tunggu consumer utama memanggil ring.consumed(seq), jadi tidak ada frame
+    terlewat. Tunggu ini juga berhenti begitu sleep() dipanggil; kalau tidak,
+    frame yang sudah ditulis sebelum UI memutuskan sleep tidak pernah diambil
+    dan kedua thread saling menunggu.
+
+    sleep(): stream kecil & jarang (`idle_size` @ `idle_fps`), tanpa ring,
+    hanya motion detector. Ada gerakan -> wake_event di-set (wake_ts =
+    perf_counter saat gerakan terdeteksi) dan capture normal jalan lagi.
+    `done` di-set kalau stream habis / error.
+    """
+
+    def __init__(self, source, ring, lockstep=False, idle_size=(160, 120), idle_fps=5.0,
+                 idle_motion=0.01, idle_settle=3, timer=None, on_frame=None, name="camera"):
+        self.source = source
+        self.ring = ring
+        self.lockstep = lockstep
+        self.idle_size = tuple(idle_size)
+        self.idle_fps = idle_fps
+        self.idle_motion = idle_motion
+        self.idle_settle = idle_settle
+        self.timer = timer or (lambda stage: nullcontext())
+        self.on_frame = on_frame
+        self.name = name
+        self.idle_request = threading.Event()   # UI: masuk sleep mode
+        self.wake_event = threading.Event()     # ada gerakan, pipeline penuh jalan lagi
+        self.done = threading.Event()
+        self.wake_ts = 0.0
+        self._running = False
+        self._thread = None
+        self.stats = {"frames": 0, "sleeps": 0, "wakes": 0}
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self, timeout=1.0):
+        self._running = False
+        if self._thread is not None:
+            self._thread.join(timeout=timeout)
+
+    def sleep(self):
+        """Pindah ke stream idle sampai ada gerakan (dipanggil dari UI thread)."""
+        self.wake_event.clear()
+        self.idle_request.set()
+
+    def _idle_watch(self):
+        """Sleep mode: stream kecil, tanpa ring/resize/deteksi. Return False kalau stream habis."""
+        self.stats["sleeps"] += 1
+        self.source.set_idle(True, self.idle_size, self.idle_fps)
+        presence = MotionGate(size=self.idle_size, min_fraction=self.idle_motion)
+        n = 0
+        try:
+            while self._running and self.idle_request.is_set():
+                arr = self.source.read()
+                if arr is None:
+                    return False
+                n += 1
+                moved = presence.motion(arr) >= self.idle_motion
+                if n > self.idle_settle and moved:
+                    self.wake_ts = time.perf_counter()
+                    self.stats["wakes"] += 1
+                    break
+        finally:
+            self.source.set_idle(False)
+        self.idle_request.clear()
+        self.wake_event.set()
+        return True
+
+    def _run(self):
+        try:
+            self.source.start()
+            while self._running:
+                if self.idle_request.is_set():
+                    if not self._idle_watch():
+                        break
+                    continue
+                # read() blocking sampai frame berikut, jadi tidak perlu sleep/polling
+                with self.timer("capture"):
+                    arr = self.source.read()    # <-- RGB (seperti Picamera2 RGB888)
+                if arr is None:
+                    break    # stream habis
+
+                # satu-satunya copy: buffer source -> slot ring (RGB mentah)
+                with self.timer("ring_write"):
+                    self.ring.write(arr)
+                self.stats["frames"] += 1
+                if self.on_frame is not None:
+                    self.on_frame()
+                if self.lockstep:
+                    while (self._running and not self.idle_request.is_set()
+                           and not self.ring.wait_consumed(0.1)):
+                        pass
+        except Exception as e:
+            print("❌ Camera thread error:", e)
+        finally:
+            self.source.stop()
+            self.done.set()
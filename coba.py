@@ -1,25 +1,25 @@
 import cv2
 import face_recognition
-import numpy as np
 import os
 import time
-import pickle
 from datetime import datetime, date
-from gtts import gTTS
 import threading
 import json
 import sqlite3
 from picamera2 import Picamera2
 from pathlib import Path
 from threading import Lock
-import subprocess
+from matcher import GalleryMatcher
+from tts import AudioOutput, Speaker, make_engine
+from tts_cache import TTSCache
 
 # ----------------- CONFIG -----------------
 DB_PATH = "/home/telkom/absensi/data.db"
 ENCODING_FILE = "/home/telkom/absensi/encodings.pkl"
 USERS_FILE = "/home/telkom/absensi/users.json"
-TTS_CACHE_DIR = "/tmp/tts_cache_absen"
+TTS_CACHE_DIR = "/home/telkom/absensi/tts_cache"
 TTS_LANG = "id"
+TTS_ENGINE = "espeak"
 
 SCREEN_W = 1024
 SCREEN_H = 600
@@ -49,11 +49,7 @@ if not Path(ENCODING_FILE).exists():
     print("❌ encodings.pkl tidak ditemukan:", ENCODING_FILE)
     raise SystemExit(1)
 
-with open(ENCODING_FILE, "rb") as f:
-    data = pickle.load(f)
-
-encodeListKnown = data.get("encodings", [])
-names = data.get("names", [])
+matcher = GalleryMatcher.from_pickle(ENCODING_FILE)
 
 # ----------------- CAMERA THREAD -----------------
 frame_lock = Lock()
@@ -132,34 +128,14 @@ def check_already_absent(name, date_, mode):
 init_db()
 
 # ----------------- TTS -----------------
-def tts_filename_for(name, mode):
-    safe = name.replace(" ", "_").lower()
-    return os.path.join(TTS_CACHE_DIR, f"tts_{safe}_{mode.lower()}.mp3")
-
-def generate_tts_file(text, filepath):
-    try:
-        gTTS(text=text, lang=TTS_LANG).save(filepath)
-        time.sleep(0.05)
-    except Exception as e:
-        print("❌ gTTS error:", e)
-
-def play_audio_nonblocking(filepath):
-    try:
-        subprocess.Popen(["mpg123", "-q", filepath], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-    except:
-        pass
-
-def speak_cached(name, mode, fallback_text=None):
-    filepath = tts_filename_for(name, mode)
-    if os.path.exists(filepath):
-        play_audio_nonblocking(filepath)
-        return
-
-    text = fallback_text or f"Terima kasih, absensi {mode.lower()} {name} berhasil"
-    def gen_play():
-        generate_tts_file(text, filepath)
-        play_audio_nonblocking(filepath)
-    threading.Thread(target=gen_play, daemon=True).start()
+# cache dikunci hash(teks, bahasa, voice, engine): pesan "berhasil" dan "sudah absen"
+# untuk mode yang sama tidak lagi berbagi satu file
+try:
+    tts_engine = make_engine(TTS_ENGINE, TTS_LANG)
+except Exception as e:
+    print(f"❌ TTS engine {TTS_ENGINE} tidak bisa dipakai ({e}), pakai nada (stub)")
+    tts_engine = make_engine("stub")
+speaker = Speaker(tts_engine, TTSCache(TTS_CACHE_DIR), output=AudioOutput()).start()
 
 # ----------------- UI -----------------
 POPUP_TEXT = ""
@@ -253,11 +229,11 @@ def markAttendance(name):
         POPUP_TEXT = f"Name: {name}\nInstansi: {info.get('instansi')}\nStatus: {info.get('status')}"
         POPUP_EXPIRE = time.time() + 4.5
         save_to_sqlite_async(name, today, time_now, MODE, status)
-        speak_cached(name, MODE, fallback_text=tts_text_new)
+        speaker.speak(tts_text_new)
         ABSEN_LOG[name][MODE] = True
     else:
         # sudah absen → TTS saja, popup ga muncul
-        speak_cached(name, MODE, fallback_text=tts_text_old)
+        speaker.speak(tts_text_old)
 
 try:
     while True:
@@ -278,14 +254,10 @@ try:
             encodings = face_recognition.face_encodings(rgb_small, faces) if faces else []
 
         detected_name = "UNKNOWN"
-        for enc in encodings:
-            matches = face_recognition.compare_faces(encodeListKnown, enc, tolerance=DIST_TOLERANCE)
-            dist = face_recognition.face_distance(encodeListKnown, enc)
-            if len(dist) > 0:
-                best = np.argmin(dist)
-                if matches[best] and dist[best] < DIST_TOLERANCE:
-                    detected_name = names[best].upper()
-                    break
+        for name, dist in matcher.match(encodings, DIST_TOLERANCE):
+            if name is not None:
+                detected_name = name.upper()
+                break
 
         # ----------------- Sleep mode logic -----------------
         if do_recog:
@@ -323,6 +295,7 @@ except KeyboardInterrupt:
     pass
 finally:
     capture_running = False
+    speaker.stop()
     try:
         cam_thread.join(timeout=1.0)
     except:
@@ -0,0 +1,77 @@
+"""
+Layer UI statis (tombol, popup) di-render sekali sebagai sprite BGRA, lalu
+tiap frame hanya region sprite itu yang di-blend ke frame tampilan.
+
+Sprite dengan alpha biner (0/255, mis. tombol + bayangan) cukup di-copy
+dengan mask; sprite semi-transparan (popup) di-blend dengan warna yang sudah
+di-premultiply, jadi per frame hanya satu multiply-add di ROI, bukan copy
+frame penuh + addWeighted seluruh layar.
+"""
+import numpy as np
+
+
+class Sprite:
+    def __init__(self, bgra, pos=(0, 0)):
+        self.x, self.y = pos
+        self.h, self.w = bgra.shape[:2]
+        alpha = bgra[:, :, 3:4]
+        self.opaque = bool(np.isin(alpha, (0, 255)).all())
+        if self.opaque:
+            self.mask = np.ascontiguousarray(np.repeat(alpha == 255, 3, axis=2))
+            self.color = np.ascontiguousarray(bgra[:, :, :3])
+        else:
+            a = alpha.astype(np.uint16)
+            self.premul = bgra[:, :, :3].astype(np.uint16) * a
+            self.inv = np.repeat(255 - a, 3, axis=2)
+
+    @classmethod
+    def render(cls, size, draw, pos=(0, 0)):
+        """
+        Sprite transparan `size` (w, h). `draw(color, alpha)` menggambar dengan cv2
+        ke canvas BGR dan ke mask alpha 1 channel (0 = transparan, 255 = opaque).
+        Warna & alpha sengaja terpisah: teks anti-alias di canvas 4 channel ikut
+        mencampur channel alpha.
+        """
+        w, h = size
+        color = np.zeros((h, w, 3), np.uint8)
+        alpha = np.zeros((h, w), np.uint8)
+        draw(color, alpha)
+        return cls(np.dstack((color, alpha)), pos)
+
+    def blit(self, frame):
+        fh, fw = frame.shape[:2]
+        x0, y0 = max(self.x, 0), max(self.y, 0)
+        x1, y1 = min(self.x + self.w, fw), min(self.y + self.h, fh)
+        if x0 >= x1 or y0 >= y1:
+            return
+        roi = frame[y0:y1, x0:x1]
+        sy, sx = slice(y0 - self.y, y1 - self.y), slice(x0 - self.x, x1 - self.x)
+        if self.opaque:
+            np.copyto(roi, self.color[sy, sx], where=self.mask[sy, sx])
+        else:
+            blended = roi * self.inv[sy, sx]
+            blended += self.premul[sy, sx]
+            blended //= 255
+            roi[:] = blended
+
+
+class Compositor:
+    """
+    Cache sprite per layer. `layer(name, key, render)` memanggil render() hanya
+    kalau key berubah (mis. teks popup), selain itu sprite lama dipakai lagi.
+    """
+
+    def __init__(self):
+        self._layers = {}
+        self.stats = {"renders": 0, "blits": 0}
+
+    def layer(self, name, key, render):
+        cached = self._layers.get(name)
+        if cached is None or cached[0] != key:
+            cached = self._layers[name] = (key, render())
+            self.stats["renders"] += 1
+        return cached[1]
+
+    def draw(self, frame, name, key, render):
+        self.layer(name, key, render).blit(frame)
+        self.stats["blits"] += 1
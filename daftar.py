@@ -1,12 +1,20 @@
-from picamera2 import Picamera2
+import argparse
 import cv2
 import os
-from datetime import datetime
 import time
+from datetime import datetime
+from frame_source import open_source
+
+PREVIEW_SIZE = (960, 540)     # stream preview (ringan)
+STILL_SIZE = (3280, 2464)     # full res untuk capture foto (mode still)
+DATASET_DIR = "dataset"
+ENCODING_FILE = "encodings.pkl"
+GALLERY_FILE = "encodings.gal"
+MANIFEST_FILE = "encodings_manifest.pkl"
 
 def create_folder(name):
     """Membuat folder 'dataset' dan sub-folder untuk setiap nama."""
-    dataset_folder = "dataset"
+    dataset_folder = DATASET_DIR
     if not os.path.exists(dataset_folder):
         os.makedirs(dataset_folder)
 
@@ -16,34 +24,26 @@ def create_folder(name):
 
     return person_folder
 
-def capture_photos():
+def ask_name(name=None):
+    name = (name or input("Masukkan nama yang daftar: ")).strip()
+    if not name:
+        print("❌ Nama tidak boleh kosong!")
+    return name
+
+def capture_photos(source="picamera", name=None):
     """
     Menggunakan format RGB888 dari Picamera2 dan tidak melakukan konversi 
     (TIDAK ADA cv2.cvtColor) untuk tampilan atau penyimpanan.
     """
-    name = input("Masukkan nama yang daftar: ").strip()
+    name = ask_name(name)
     if not name:
-        print("❌ Nama tidak boleh kosong!")
         return
 
     folder = create_folder(name)
 
-    picam2 = Picamera2()
-
-    # --- KONFIGURASI KAMERA MENGGUNAKAN RGB888 ---
-    # STREAM UNTUK PREVIEW (ringan)
-    preview_config = picam2.create_preview_configuration(
-        main={"size": (960, 540), "format": "RGB888"} # <-- DIPAKSA RGB888
-    )
-
-    # STREAM FULL RES UNTUK CAPTURE FOTO
-    capture_config = picam2.create_still_configuration(
-        main={"size": (3280, 2464), "format": "RGB888"} # <-- DIPAKSA RGB888
-    )
-
-    picam2.configure(preview_config)
-    picam2.start()
-    time.sleep(1.5)
+    # --- KAMERA: Picamera2 RGB888 (preview ringan + still full res), atau webcam/replay ---
+    cam = open_source(source, PREVIEW_SIZE, still_size=STILL_SIZE, settle=1.5)
+    cam.start()
 
     print(f"📸 Tekan SPACE untuk ambil foto, 'q' untuk keluar.")
     print("⚠️ Perhatian: Tampilan mungkin berwarna aneh (biru) karena frame RGB ditampilkan langsung di OpenCV.")
@@ -52,18 +52,17 @@ def capture_photos():
 
     while True:
         # ambil frame. Frame ini sudah dalam urutan RGB.
-        frame = picam2.capture_array()
-        
+        frame = cam.read()
+        if frame is None:
+            break
+
         # cv2.cvtColor() TIDAK ADA DI SINI. Frame RGB ditampilkan langsung.
         cv2.imshow("Camera", frame) 
         key = cv2.waitKey(1) & 0xFF
 
         if key == ord(" "):
-            picam2.switch_mode(capture_config)
-            time.sleep(0.2)
-
-            # Ambil foto full-res (sudah RGB)
-            full = picam2.capture_array()
+            # Ambil foto full-res (sudah RGB); Picamera2 pindah ke still mode lalu kembali ke preview
+            full = cam.capture_still()
             
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
             path = os.path.join(folder, f"{name}_{timestamp}.jpg")
@@ -74,16 +73,110 @@ def capture_photos():
 
             print(f"✅ Foto {photo_count} tersimpan: {path}")
 
-            picam2.switch_mode(preview_config)
-            time.sleep(0.2)
-
         elif key == ord("q"):
             break
 
-    picam2.stop()
+    cam.stop()
     cv2.destroyAllWindows()
 
     print(f"📂 Selesai. Total: {photo_count} foto.")
 
+def draw_burst(frame, box, quality, status):
+    """Preview burst: box wajah (hijau = kandidat bagus, merah = ditolak) + status."""
+    view = frame.copy()
+    if box is not None:
+        top, right, bottom, left = box
+        ok = quality and not quality["reject"]
+        cv2.rectangle(view, (left, top), (right, bottom), (0, 200, 0) if ok else (0, 0, 200), 2)
+        label = (f"skor {quality['score']:.2f}" if ok else quality["reject"]) + \
+            f" | blur {quality['blur']:.0f} yaw {quality['yaw']:+.2f} roll {quality['roll']:+.0f}"
+        cv2.putText(view, label, (left, max(top - 8, 15)), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
+    cv2.putText(view, status, (10, 25), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 255, 255), 2)
+    return view
+
+def burst_enrol(source="picamera", name=None, k=None, burst_sec=None, detector="hog",
+                fps=None, headless=False):
+    """
+    Burst dari stream preview: deteksi + skor kualitas per frame, K crop terbaik
+    di-encode di background dan langsung ditambahkan ke gallery (tanpa train.py).
+    """
+    from detector import make_detector
+    from enroll import BURST_SEC, ENROLL_K, BurstEnroller, save_enrolment
+
+    name = ask_name(name)
+    if not name:
+        return None
+    k = k or ENROLL_K
+    burst_sec = burst_sec or BURST_SEC
+    face_detector = make_detector(detector)
+
+    cam = open_source(source, PREVIEW_SIZE, fps=fps, settle=1.5)
+    cam.start()
+    if not headless:
+        print(f"📸 Tekan SPACE untuk mulai burst {burst_sec:g} detik (tolehkan kepala sedikit), 'q' untuk keluar.")
+
+    enroller, t0 = None, None
+    while True:
+        frame = cam.read()
+        if frame is None:
+            break
+        now = time.perf_counter()
+        box = quality = None
+        if enroller is not None:
+            box, quality = enroller.feed(frame, now)
+            status = (f"BURST {now - t0:.1f}/{burst_sec:g}s | kandidat {enroller.stats['candidates']} "
+                      f"| encode antre {enroller.worker.pending()}")
+        else:
+            status = f"{name}: SPACE = mulai burst"
+
+        key = 0xFF
+        if not headless:
+            cv2.imshow("Camera", draw_burst(frame, box, quality, status))
+            key = cv2.waitKey(1) & 0xFF
+        if enroller is None and (headless or key == ord(" ")):
+            enroller, t0 = BurstEnroller(face_detector, k=k), now
+        elif enroller is not None and now - t0 >= burst_sec:
+            break
+        if key == ord("q"):
+            break
+
+    cam.stop()
+    if not headless:
+        cv2.destroyAllWindows()
+    if enroller is None:
+        print("📂 Selesai tanpa burst.")
+        return None
+
+    t_burst = time.perf_counter() - t0
+    picks = enroller.finish()
+    t_encode = time.perf_counter() - t0 - t_burst
+    if not picks:
+        print(f"❌ Tidak ada wajah yang cukup bagus ({enroller.stats}), ulangi burst")
+        return None
+    saved = save_enrolment(name, picks, DATASET_DIR, MANIFEST_FILE, ENCODING_FILE, GALLERY_FILE)
+    elapsed = time.perf_counter() - t0
+    s = enroller.stats
+    print(f"[ENROLL] {s['frames']} frame | tanpa wajah {s['no_face']} | ditolak kecil {s['kecil']} "
+          f"blur {s['blur']} pose {s['pose']} | {s['candidates']} kandidat di-encode "
+          f"({enroller.worker.stats['encode_s']:.1f}s CPU) | outlier {s['outliers']} duplikat {s['duplicates']}")
+    print(f"✅ {name}: {saved['files']} crop ({saved['bytes'] / 1024:.0f} KB) -> {DATASET_DIR}/{name}, "
+          f"gallery {saved['gallery']} encodings | burst {t_burst:.1f}s + sisa encode {t_encode:.1f}s "
+          f"= {elapsed:.1f}s")
+    return dict(saved, seconds=elapsed, burst=t_burst, stats=dict(s))
+
 if __name__ == "__main__":
-    capture_photos()
+    ap = argparse.ArgumentParser(description="Pendaftaran wajah baru")
+    ap.add_argument("--source", default="picamera", help="picamera, cv:0, replay:<folder|video>")
+    ap.add_argument("--mode", choices=("burst", "still"), default="burst",
+                    help="burst: crop terbaik dari stream preview langsung ke gallery; still: foto full res (lama)")
+    ap.add_argument("--name", default=None, help="default: ditanya di terminal")
+    ap.add_argument("--k", type=int, default=None, help="jumlah crop per orang (default ENROLL_K)")
+    ap.add_argument("--burst-sec", type=float, default=None)
+    ap.add_argument("--detector", default="hog", help="hog / yunet / haar")
+    ap.add_argument("--fps", type=float, default=None, help="laju replay (replay/synthetic)")
+    ap.add_argument("--headless", action="store_true", help="tanpa window, burst langsung mulai")
+    args = ap.parse_args()
+    if args.mode == "still":
+        capture_photos(args.source, args.name)
+    else:
+        burst_enrol(args.source, args.name, args.k, args.burst_sec, args.detector, args.fps, args.headless)
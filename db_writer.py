@@ -0,0 +1,424 @@
+import queue
+import sqlite3
+import threading
+import time
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS absensi (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT NOT NULL,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        status TEXT NOT NULL
+    );
+"""
+
+# Isi ulang agregat v4 dari absensi (backfill migrasi & `report.py rebuild`).
+AGG_BACKFILL = """
+    INSERT INTO agg_harian (user_id, date, masuk, pulang, terlambat, pulang_awal)
+        SELECT user_id, date, MIN(CASE WHEN mode = 'MASUK' THEN time END),
+               MIN(CASE WHEN mode = 'PULANG' THEN time END),
+               SUM(status = 'Terlambat'), SUM(status = 'Pulang sebelum waktunya')
+        FROM absensi GROUP BY user_id, date;
+    INSERT INTO agg_bulanan (user_id, month, masuk, terlambat, pulang, pulang_awal)
+        SELECT user_id, substr(date, 1, 7), SUM(mode = 'MASUK'), SUM(status = 'Terlambat'),
+               SUM(mode = 'PULANG'), SUM(status = 'Pulang sebelum waktunya')
+        FROM absensi GROUP BY user_id, substr(date, 1, 7);
+    INSERT INTO agg_tanggal (date, masuk, terlambat, pulang, pulang_awal)
+        SELECT date, SUM(mode = 'MASUK'), SUM(status = 'Terlambat'),
+               SUM(mode = 'PULANG'), SUM(status = 'Pulang sebelum waktunya')
+        FROM absensi GROUP BY date;
+"""
+
+# Migrasi berurutan, versi disimpan di PRAGMA user_version.
+# v2: nama dinormalisasi ke tabel users (id integer) + unique index (user_id, date, mode).
+# Kolom `nama` tetap ada supaya script/export lama yang baca absensi tetap jalan.
+# Duplikat lama (dobel tap sebelum ada index) dipindah ke absensi_duplikat, tidak dihapus.
+MIGRATIONS = [
+    SCHEMA,
+    """
+    CREATE TABLE IF NOT EXISTS users (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT NOT NULL UNIQUE
+    );
+    INSERT OR IGNORE INTO users (nama) SELECT DISTINCT nama FROM absensi;
+    ALTER TABLE absensi ADD COLUMN user_id INTEGER REFERENCES users(id);
+    UPDATE absensi SET user_id = (SELECT id FROM users WHERE users.nama = absensi.nama);
+    CREATE TABLE IF NOT EXISTS absensi_duplikat AS SELECT * FROM absensi WHERE 0;
+    INSERT INTO absensi_duplikat SELECT * FROM absensi
+        WHERE id NOT IN (SELECT MIN(id) FROM absensi GROUP BY user_id, date, mode);
+    DELETE FROM absensi
+        WHERE id NOT IN (SELECT MIN(id) FROM absensi GROUP BY user_id, date, mode);
+    CREATE UNIQUE INDEX IF NOT EXISTS idx_absensi_user_date_mode ON absensi (user_id, date, mode);
+    CREATE INDEX IF NOT EXISTS idx_absensi_date ON absensi (date);
+    """,
+    # v3: outbox append-only untuk sync antar kiosk (sync.py). Diisi trigger di transaksi
+    # yang sama dengan insert absensi, jadi hanya baris yang benar-benar masuk (bukan
+    # duplikat OR IGNORE) yang dikirim; seq AUTOINCREMENT monotonic, tidak pernah dipakai ulang.
+    # Riwayat lama ikut masuk outbox supaya terkirim di sync pertama.
+    # remote_ledger = absensi hari ini di kiosk lain (dari aggregation service) untuk cek duplikat;
+    # SyncClient menghapus tanggal sebelumnya setiap sync.
+    """
+    CREATE TABLE IF NOT EXISTS outbox (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT NOT NULL,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        status TEXT NOT NULL
+    );
+    INSERT INTO outbox (nama, date, time, mode, status)
+        SELECT nama, date, time, mode, status FROM absensi ORDER BY id;
+    CREATE TRIGGER IF NOT EXISTS absensi_outbox AFTER INSERT ON absensi BEGIN
+        INSERT INTO outbox (nama, date, time, mode, status)
+        VALUES (NEW.nama, NEW.date, NEW.time, NEW.mode, NEW.status);
+    END;
+    CREATE TABLE IF NOT EXISTS sync_state (
+        key TEXT PRIMARY KEY,
+        value INTEGER NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS remote_ledger (
+        nama TEXT NOT NULL,
+        date TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        kiosk TEXT,
+        PRIMARY KEY (date, nama, mode)
+    ) WITHOUT ROWID;
+    """,
+    # v4: agregat harian / bulanan / per tanggal untuk report.py, di-update trigger di transaksi
+    # yang sama dengan insert (dan delete, mis. pembersihan data lama) absensi.
+    # agg_harian: jam MASUK/PULANG per orang per hari; agg_bulanan: jumlah per orang per bulan;
+    # agg_tanggal: total semua orang per hari. Riwayat lama di-backfill sekali.
+    # PK diawali tanggal/bulan: rekap semua orang = satu range scan berurutan; query per orang
+    # lewat index user_id (sedikit baris, lookup PK murah).
+    """
+    CREATE TABLE IF NOT EXISTS agg_harian (
+        user_id INTEGER NOT NULL,
+        date TEXT NOT NULL,
+        masuk TEXT,
+        pulang TEXT,
+        terlambat INTEGER NOT NULL DEFAULT 0,
+        pulang_awal INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (date, user_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_agg_harian_user ON agg_harian (user_id, date);
+    CREATE TABLE IF NOT EXISTS agg_bulanan (
+        user_id INTEGER NOT NULL,
+        month TEXT NOT NULL,
+        masuk INTEGER NOT NULL DEFAULT 0,
+        terlambat INTEGER NOT NULL DEFAULT 0,
+        pulang INTEGER NOT NULL DEFAULT 0,
+        pulang_awal INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (month, user_id)
+    ) WITHOUT ROWID;
+    CREATE INDEX IF NOT EXISTS idx_agg_bulanan_user ON agg_bulanan (user_id, month);
+    CREATE TABLE IF NOT EXISTS agg_tanggal (
+        date TEXT PRIMARY KEY,
+        masuk INTEGER NOT NULL DEFAULT 0,
+        terlambat INTEGER NOT NULL DEFAULT 0,
+        pulang INTEGER NOT NULL DEFAULT 0,
+        pulang_awal INTEGER NOT NULL DEFAULT 0
+    ) WITHOUT ROWID;
+
+    """ + AGG_BACKFILL + """
+    CREATE TRIGGER IF NOT EXISTS absensi_agg_insert AFTER INSERT ON absensi BEGIN
+        INSERT INTO agg_harian (user_id, date, masuk, pulang, terlambat, pulang_awal)
+        VALUES (NEW.user_id, NEW.date,
+                CASE WHEN NEW.mode = 'MASUK' THEN NEW.time END,
+                CASE WHEN NEW.mode = 'PULANG' THEN NEW.time END,
+                NEW.status = 'Terlambat', NEW.status = 'Pulang sebelum waktunya')
+        ON CONFLICT (date, user_id) DO UPDATE SET
+            masuk = COALESCE(masuk, excluded.masuk), pulang = COALESCE(pulang, excluded.pulang),
+            terlambat = terlambat + excluded.terlambat, pulang_awal = pulang_awal + excluded.pulang_awal;
+        INSERT INTO agg_bulanan (user_id, month, masuk, terlambat, pulang, pulang_awal)
+        VALUES (NEW.user_id, substr(NEW.date, 1, 7), NEW.mode = 'MASUK', NEW.status = 'Terlambat',
+                NEW.mode = 'PULANG', NEW.status = 'Pulang sebelum waktunya')
+        ON CONFLICT (month, user_id) DO UPDATE SET
+            masuk = masuk + excluded.masuk, terlambat = terlambat + excluded.terlambat,
+            pulang = pulang + excluded.pulang, pulang_awal = pulang_awal + excluded.pulang_awal;
+        INSERT INTO agg_tanggal (date, masuk, terlambat, pulang, pulang_awal)
+        VALUES (NEW.date, NEW.mode = 'MASUK', NEW.status = 'Terlambat',
+                NEW.mode = 'PULANG', NEW.status = 'Pulang sebelum waktunya')
+        ON CONFLICT (date) DO UPDATE SET
+            masuk = masuk + excluded.masuk, terlambat = terlambat + excluded.terlambat,
+            pulang = pulang + excluded.pulang, pulang_awal = pulang_awal + excluded.pulang_awal;
+    END;
+    CREATE TRIGGER IF NOT EXISTS absensi_agg_delete AFTER DELETE ON absensi BEGIN
+        UPDATE agg_harian SET
+            masuk = CASE WHEN OLD.mode = 'MASUK' THEN NULL ELSE masuk END,
+            pulang = CASE WHEN OLD.mode = 'PULANG' THEN NULL ELSE pulang END,
+            terlambat = terlambat - (OLD.status = 'Terlambat'),
+            pulang_awal = pulang_awal - (OLD.status = 'Pulang sebelum waktunya')
+        WHERE user_id = OLD.user_id AND date = OLD.date;
+        DELETE FROM agg_harian
+        WHERE user_id = OLD.user_id AND date = OLD.date AND masuk IS NULL AND pulang IS NULL;
+        UPDATE agg_bulanan SET
+            masuk = masuk - (OLD.mode = 'MASUK'), terlambat = terlambat - (OLD.status = 'Terlambat'),
+            pulang = pulang - (OLD.mode = 'PULANG'),
+            pulang_awal = pulang_awal - (OLD.status = 'Pulang sebelum waktunya')
+        WHERE user_id = OLD.user_id AND month = substr(OLD.date, 1, 7);
+        UPDATE agg_tanggal SET
+            masuk = masuk - (OLD.mode = 'MASUK'), terlambat = terlambat - (OLD.status = 'Terlambat'),
+            pulang = pulang - (OLD.mode = 'PULANG'),
+            pulang_awal = pulang_awal - (OLD.status = 'Pulang sebelum waktunya')
+        WHERE date = OLD.date;
+    END;
+    """,
+]
+SCHEMA_VERSION = len(MIGRATIONS)
+
+INSERT_USER_SQL = "INSERT OR IGNORE INTO users (nama) VALUES (?)"
+# OR IGNORE: tap dobel yang lolos (mis. dua kiosk ke DB yang sama) tidak jadi baris kedua
+INSERT_SQL = """
+    INSERT OR IGNORE INTO absensi (user_id, nama, date, time, mode, status)
+    VALUES ((SELECT id FROM users WHERE nama = ?), ?, ?, ?, ?, ?)
+"""
+
+
+def connect(db_path, timeout=5.0):
+    """Koneksi dengan WAL: pembaca tidak memblokir writer (dan sebaliknya)."""
+    conn = sqlite3.connect(db_path, timeout=timeout, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")    # aman di WAL, fsync hanya saat checkpoint
+    return conn
+
+
+def migrate(conn):
+    """Jalankan migrasi yang belum diterapkan (masing-masing satu transaksi). Return versi akhir."""
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    for v in range(version, SCHEMA_VERSION):
+        t = time.perf_counter()
+        conn.executescript(f"BEGIN;\n{MIGRATIONS[v]}\nPRAGMA user_version = {v + 1};\nCOMMIT;")
+        if v > 0:
+            print(f"[DB] migrasi schema v{v} -> v{v + 1} ({(time.perf_counter() - t) * 1000:.0f} ms)")
+    return max(version, SCHEMA_VERSION)
+
+
+class DayLedger:
+    """
+    Set (nama, mode) yang sudah absen untuk satu tanggal, di memory.
+    Di-warm dari DB saat start / ganti hari (absensi lokal + remote_ledger dari
+    kiosk lain), lalu diisi langsung oleh submit() dan sync, jadi cek duplikat
+    di jalur tap tidak pernah membaca disk.
+    """
+
+    def __init__(self):
+        self.date = None
+        self._seen = set()
+
+    def warm(self, conn, date_):
+        rows = conn.execute("SELECT nama, mode FROM absensi WHERE date = ? "
+                            "UNION SELECT nama, mode FROM remote_ledger WHERE date = ?", (date_, date_)).fetchall()
+        self._seen = set(rows)
+        self.date = date_
+        return len(rows)
+
+    def has(self, name, mode):
+        return (name, mode) in self._seen
+
+    def add(self, name, mode):
+        self._seen.add((name, mode))
+
+    def discard(self, name, mode):
+        self._seen.discard((name, mode))
+
+    def __len__(self):
+        return len(self._seen)
+
+
+class AttendanceWriter:
+    """
+    Satu thread writer SQLite yang hidup selama kiosk jalan.
+
+    submit() menaruh record ke queue terbatas (UI thread tidak pernah menyentuh
+    file DB). Writer mengambil record sebanyak-banyaknya sampai `batch_size`
+    atau `flush_interval` lewat, lalu commit sekali untuk satu batch (group
+    commit). Kalau queue penuh, submit() menunggu paling lama `put_timeout`
+    (back-pressure) lalu menolak record dengan return False.
+    Cek duplikat (exists) untuk hari ini dijawab DayLedger di memory (sudah
+    termasuk record yang masih antre); tanggal lain lewat satu koneksi baca
+    yang dipakai ulang.
+    """
+
+    def __init__(self, db_path, max_queue=1000, batch_size=64, flush_interval=0.2,
+                 put_timeout=1.0, verbose=True, name="db-writer"):
+        self.db_path = db_path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.put_timeout = put_timeout
+        self.verbose = verbose
+        self.name = name
+        self._queue = queue.Queue(maxsize=max_queue)
+        self.ledger = DayLedger()
+        self._ledger_lock = threading.Lock()
+        self._read_conn = None
+        self._read_lock = threading.Lock()
+        self._thread = None
+        self.stats = {"submitted": 0, "written": 0, "batches": 0, "rejected": 0, "duplicates": 0,
+                      "errors": 0, "retries": 0, "max_queue": 0, "last_commit_ms": 0.0}
+        self.observer = None    # callable(stage, detik), mis. histogram metrics
+
+        conn = connect(db_path)
+        migrate(conn)
+        conn.close()
+
+    # ----------------- producer side -----------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, name, date_, time_, mode, status):
+        record = (name, date_, time_, mode, status)
+        with self._ledger_lock:
+            self._ensure_day(date_)
+            if self.ledger.date == date_:
+                self.ledger.add(name, mode)
+        try:
+            self._queue.put(record, timeout=self.put_timeout)
+        except queue.Full:
+            self._unledger([record])
+            self.stats["rejected"] += 1
+            print(f"❌ [DB] queue penuh, record {name} {date_} {mode} ditolak")
+            return False
+        self.stats["submitted"] += 1
+        self.stats["max_queue"] = max(self.stats["max_queue"], self._queue.qsize())
+        return True
+
+    def queue_size(self):
+        """Record yang masih menunggu commit (untuk metrics)."""
+        return self._queue.qsize()
+
+    def exists(self, name, date_, mode):
+        """Sudah absen? Hari ini (atau hari baru): ledger di memory. Tanggal lama: query DB."""
+        with self._ledger_lock:
+            self._ensure_day(date_)
+            if self.ledger.date == date_:
+                return self.ledger.has(name, mode)
+        row = self._read(
+            "SELECT 1 FROM absensi a JOIN users u ON u.id = a.user_id "
+            "WHERE u.nama = ? AND a.date = ? AND a.mode = ? "
+            "UNION ALL SELECT 1 FROM remote_ledger WHERE nama = ? AND date = ? AND mode = ? LIMIT 1",
+            (name, date_, mode) * 2)
+        return bool(row)
+
+    def mark_remote(self, entries):
+        """(nama, date, mode) yang sudah tercatat di kiosk lain (dari sync): masuk ledger hari ini."""
+        with self._ledger_lock:
+            for name, date_, mode in entries:
+                self._ensure_day(date_)
+                if self.ledger.date == date_:
+                    self.ledger.add(name, mode)
+
+    def warm(self, date_):
+        """Isi ledger untuk `date_` dari DB (dipanggil saat start; ganti hari otomatis)."""
+        with self._ledger_lock:
+            self._warm(date_)
+        return len(self.ledger)
+
+    def _warm(self, date_):
+        with self._read_lock:
+            t = time.perf_counter()
+            n = self.ledger.warm(self._reader(), date_)
+        print(f"[DB] ledger {date_}: {n} absensi ({(time.perf_counter() - t) * 1000:.0f} ms)")
+
+    def _ensure_day(self, date_):
+        # ledger hanya maju: tanggal lebih baru = hari berganti (ISO date bisa dibandingkan sebagai string)
+        if self.ledger.date is None or date_ > self.ledger.date:
+            self._warm(date_)
+
+    def _reader(self):
+        if self._read_conn is None:
+            self._read_conn = connect(self.db_path, timeout=3.0)
+        return self._read_conn
+
+    def _read(self, sql, params):
+        with self._read_lock:
+            return self._reader().execute(sql, params).fetchall()
+
+    def flush(self):
+        """Blocking sampai semua record yang sudah di-submit ter-commit."""
+        self._queue.join()
+
+    def stop(self):
+        if self._thread is not None:
+            self._queue.put(None)    # sentinel: sisa antrean tetap ditulis dulu
+            self._thread.join(timeout=10.0)
+        with self._read_lock:
+            if self._read_conn is not None:
+                self._read_conn.close()
+                self._read_conn = None
+
+    # ----------------- writer thread -----------------
+    def _unledger(self, batch):
+        # record ditolak / gagal ditulis: boleh tap ulang
+        with self._ledger_lock:
+            for name, date_, _, mode, _ in batch:
+                if self.ledger.date == date_:
+                    self.ledger.discard(name, mode)
+
+    def _collect(self):
+        """Ambil satu batch: blocking untuk record pertama, lalu kumpulkan sampai penuh / flush_interval."""
+        first = self._queue.get()
+        if first is None:
+            return None, True
+        batch = [first]
+        deadline = time.perf_counter() + self.flush_interval
+        while len(batch) < self.batch_size:
+            remaining = deadline - time.perf_counter()
+            try:
+                item = self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is None:
+                return batch, True
+            batch.append(item)
+        return batch, False
+
+    def _write(self, conn, batch):
+        for attempt in range(5):
+            try:
+                t = time.perf_counter()
+                with conn:    # satu transaksi per batch
+                    conn.executemany(INSERT_USER_SQL, [(r[0],) for r in batch])
+                    # rowcount = baris absensi yang benar-benar masuk (tanpa baris dari trigger
+                    # outbox / agregat, tanpa duplikat yang di-IGNORE)
+                    written = conn.executemany(INSERT_SQL, [(r[0],) + r for r in batch]).rowcount
+                elapsed = time.perf_counter() - t
+                self.stats["last_commit_ms"] = elapsed * 1000
+                if self.observer is not None:
+                    self.observer("db_commit", elapsed)
+                return written
+            except sqlite3.OperationalError as e:
+                # "database is locked" dari proses lain (mis. export): coba lagi dengan backoff
+                self.stats["retries"] += 1
+                print(f"❌ [DB] commit gagal ({e}), coba lagi #{attempt + 1}")
+                time.sleep(0.05 * 2 ** attempt)
+        return None
+
+    def _run(self):
+        conn = connect(self.db_path)
+        try:
+            while True:
+                batch, stopping = self._collect()
+                if batch:
+                    written = self._write(conn, batch)
+                    if written is not None:
+                        self.stats["written"] += written
+                        self.stats["duplicates"] += len(batch) - written
+                        self.stats["batches"] += 1
+                        if self.verbose:
+                            for name, date_, time_, mode, status in batch:
+                                print(f"[DB] {date_} {time_} | {name} | {mode} | {status}")
+                    else:
+                        self._unledger(batch)
+                        self.stats["errors"] += len(batch)
+                        print(f"❌ [DB] {len(batch)} record gagal ditulis")
+                    for _ in batch:
+                        self._queue.task_done()
+                if stopping:
+                    self._queue.task_done()    # sentinel
+                    return
+        finally:
+            conn.close()
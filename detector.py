@@ -0,0 +1,145 @@
+"""
+Backend deteksi wajah + motion gate.
+
+Semua detector menerima frame RGB (uint8) dan mengembalikan box dalam format
+face_recognition: (top, right, bottom, left), jadi hasilnya bisa langsung
+dipakai face_encodings() dan FaceTracker.
+
+    hog            face_recognition HOG (default lama, paling berat di Pi)
+    cnn            face_recognition CNN (hanya masuk akal dengan GPU)
+    yunet[:path]   OpenCV DNN YuNet (ONNX), jauh lebih cepat dari HOG di CPU
+    haar[:path]    Haar cascade OpenCV, paling ringan (mode hemat daya)
+
+MotionGate membandingkan thumbnail grayscale antar frame; kalau scene diam
+dan tidak ada track aktif, deteksi dilewati sama sekali.
+"""
+import os
+import time
+
+import cv2
+import numpy as np
+
+YUNET_MODEL = "/home/telkom/absensi/models/face_detection_yunet_2023mar.onnx"
+HAAR_CASCADE = "haarcascade_frontalface_default.xml"
+HAAR_DIRS = (
+    getattr(getattr(cv2, "data", None), "haarcascades", ""),
+    "/usr/share/opencv4/haarcascades",
+    "/usr/share/opencv/haarcascades",
+    "/usr/local/share/opencv4/haarcascades",
+)
+
+
+def _clip_boxes(boxes_xywh, w, h):
+    out = []
+    for x, y, bw, bh in boxes_xywh:
+        left, top = max(int(x), 0), max(int(y), 0)
+        right, bottom = min(int(x + bw), w - 1), min(int(y + bh), h - 1)
+        if right > left and bottom > top:
+            out.append((top, right, bottom, left))
+    return out
+
+
+class HOGDetector:
+    def __init__(self, model="hog", upsample=1):
+        import face_recognition    # lazy: backend lain tidak butuh dlib
+        self._fr = face_recognition
+        self.name = model
+        self.model = model
+        self.upsample = upsample
+
+    def detect(self, rgb):
+        return self._fr.face_locations(rgb, number_of_times_to_upsample=self.upsample, model=self.model)
+
+
+class YuNetDetector:
+    """cv2.FaceDetectorYN; model ONNX diunduh sekali (lihat README)."""
+    name = "yunet"
+
+    def __init__(self, model_path=YUNET_MODEL, score_threshold=0.6, nms_threshold=0.3):
+        if not hasattr(cv2, "FaceDetectorYN"):
+            raise RuntimeError(f"OpenCV {cv2.__version__} belum punya FaceDetectorYN (butuh >= 4.5.4)")
+        if not os.path.exists(model_path):
+            raise RuntimeError(f"model YuNet tidak ditemukan: {model_path}")
+        self._net = cv2.FaceDetectorYN.create(model_path, "", (320, 320), score_threshold, nms_threshold)
+        self._size = None
+
+    def detect(self, rgb):
+        h, w = rgb.shape[:2]
+        if self._size != (w, h):
+            self._net.setInputSize((w, h))
+            self._size = (w, h)
+        # YuNet dilatih dengan BGR; konversi di frame kecil murah
+        _, faces = self._net.detect(cv2.cvtColor(rgb, cv2.COLOR_RGB2BGR))
+        if faces is None:
+            return []
+        return _clip_boxes(faces[:, :4], w, h)
+
+
+class HaarDetector:
+    name = "haar"
+
+    def __init__(self, cascade=None, scale_factor=1.1, min_neighbors=5, min_size=(20, 20)):
+        path = cascade or next((os.path.join(d, HAAR_CASCADE) for d in HAAR_DIRS
+                                if d and os.path.exists(os.path.join(d, HAAR_CASCADE))), None)
+        self._cascade = cv2.CascadeClassifier(path) if path else None
+        if self._cascade is None or self._cascade.empty():
+            raise RuntimeError(f"Haar cascade {cascade or HAAR_CASCADE} tidak ditemukan")
+        self.scale_factor = scale_factor
+        self.min_neighbors = min_neighbors
+        self.min_size = min_size
+
+    def detect(self, rgb):
+        gray = cv2.cvtColor(rgb, cv2.COLOR_RGB2GRAY)
+        found = self._cascade.detectMultiScale(gray, scaleFactor=self.scale_factor,
+                                               minNeighbors=self.min_neighbors, minSize=self.min_size)
+        return _clip_boxes(found, gray.shape[1], gray.shape[0])
+
+
+def make_detector(spec="hog"):
+    kind, _, arg = spec.partition(":")
+    if kind in ("hog", "cnn"):
+        return HOGDetector(kind)
+    if kind == "yunet":
+        return YuNetDetector(arg or YUNET_MODEL)
+    if kind == "haar":
+        return HaarDetector(arg or None)
+    raise ValueError(f"detector tidak dikenal: {spec!r}")
+
+
+class MotionGate:
+    """
+    Frame-difference di thumbnail grayscale `size`. check() True kalau porsi
+    pixel yang berubah > `min_fraction`, atau sudah `keepalive` detik sejak
+    deteksi terakhir diizinkan (orang yang berdiri diam tetap terdeteksi).
+    """
+
+    def __init__(self, size=(80, 60), pixel_threshold=25, min_fraction=0.005, keepalive=2.0,
+                 clock=time.monotonic):
+        self.size = size
+        self.pixel_threshold = pixel_threshold
+        self.min_fraction = min_fraction
+        self.keepalive = keepalive
+        self.clock = clock
+        self._prev = None
+        self._last_pass = 0.0
+        self.stats = {"checked": 0, "skipped": 0}
+
+    def _thumb(self, rgb):
+        return cv2.cvtColor(cv2.resize(rgb, self.size, interpolation=cv2.INTER_AREA), cv2.COLOR_RGB2GRAY)
+
+    def motion(self, rgb):
+        """Porsi pixel yang berubah sejak frame sebelumnya (0..1)."""
+        thumb = self._thumb(rgb)
+        prev, self._prev = self._prev, thumb
+        if prev is None:
+            return 1.0
+        return np.count_nonzero(cv2.absdiff(thumb, prev) > self.pixel_threshold) / thumb.size
+
+    def check(self, rgb):
+        self.stats["checked"] += 1
+        now = self.clock()
+        if self.motion(rgb) >= self.min_fraction or now - self._last_pass >= self.keepalive:
+            self._last_pass = now
+            return True
+        self.stats["skipped"] += 1
+        return False
@@ -0,0 +1,56 @@
+"""
+Power layar tanpa shell.
+
+Layar DSI (rpi_backlight, dll.) dimatikan lewat sysfs
+/sys/class/backlight/<dev>/bl_power (0 = nyala, 1 = mati). Kalau tidak ada
+backlight (HDMI), `vcgencmd display_power` dijalankan langsung sebagai
+proses (tanpa /bin/sh) dan tidak ditunggu, jadi loop UI tidak ikut blok.
+
+File bl_power biasanya hanya bisa ditulis root; lihat README untuk udev rule.
+"""
+import glob
+import os
+import shutil
+import subprocess
+import time
+
+BACKLIGHT_GLOB = "/sys/class/backlight/*/bl_power"
+
+
+class DisplayPower:
+    def __init__(self, backlight=None, enabled=True):
+        self.enabled = enabled
+        self.paths = [backlight] if backlight else sorted(glob.glob(BACKLIGHT_GLOB))
+        self.vcgencmd = shutil.which("vcgencmd") if not self.paths else None
+        self.state = None
+        self.last_switch_ms = 0.0
+        self._warned = False
+
+    def backend(self):
+        if not self.enabled:
+            return "off"
+        if self.paths:
+            return "sysfs"
+        return "vcgencmd" if self.vcgencmd else "none"
+
+    def set(self, on):
+        if not self.enabled or self.state == on:
+            return
+        t = time.perf_counter()
+        try:
+            if self.paths:
+                for path in self.paths:
+                    fd = os.open(path, os.O_WRONLY)
+                    try:
+                        os.write(fd, b"0" if on else b"1")
+                    finally:
+                        os.close(fd)
+            elif self.vcgencmd:
+                subprocess.Popen([self.vcgencmd, "display_power", "1" if on else "0"],
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+            self.state = on
+        except OSError as e:
+            if not self._warned:
+                print(f"❌ [display] power layar tidak bisa diubah ({e})")
+                self._warned = True
+        self.last_switch_ms = (time.perf_counter() - t) * 1000
@@ -0,0 +1,283 @@
+"""
+Pendaftaran wajah dari burst stream preview (daftar.py), tanpa foto still.
+
+Selama burst, setiap frame preview: deteksi di frame kecil (seperti kiosk),
+lalu wajah terbesar diberi skor kualitas:
+
+    size   lebar wajah di frame preview; di bawah MIN_FACE_PX ditolak
+    blur   variance Laplacian wajah yang di-resize ke 96 px (kecil = blur)
+    pose   yaw (hidung relatif ke tengah mata, sepanjang garis mata) & roll
+           (kemiringan garis mata) dari landmark 5 titik dlib
+
+Kandidat yang masuk K terbaik sejauh ini langsung di-crop (wajah + margin,
+lebar wajah maksimal CHIP_FACE_PX = ukuran chip encoder dlib) dan di-encode
+di EncodeWorker, jadi saat burst selesai encoding hampir semuanya siap.
+finish() memilih K crop: outlier (jauh dari medoid, mis. orang lain lewat)
+dan near-duplicate (terlalu mirip crop yang skornya lebih tinggi) dibuang.
+
+save_enrolment() menyimpan crop JPEG kecil ke dataset/<nama>/, mencatatnya
+di manifest train.py (tidak di-encode ulang saat train berikutnya), lalu
+menambahkan encoding ke encodings.pkl & encodings.gal (absensi.py reload
+otomatis).
+"""
+import heapq
+import itertools
+import math
+import os
+import pickle
+import queue
+import threading
+import time
+from datetime import datetime
+
+import cv2
+import numpy as np
+
+from gallery_store import append_gallery, atomic_pickle, file_hash, save_gallery
+
+# ----------------- CONFIG -----------------
+ENROLL_K = 8               # crop yang disimpan per orang
+BURST_SEC = 4.0            # lama burst (minta orang menoleh sedikit kiri/kanan)
+DETECT_SCALE = 0.5         # deteksi di frame preview x skala ini
+CANDIDATE_GAP_SEC = 0.1    # jarak minimal antar kandidat yang di-encode
+MIN_FACE_PX = 90           # lebar wajah minimal di frame preview
+MIN_BLUR = 120.0           # variance Laplacian minimal (wajah 96 px); di bawahnya encoding melenceng
+BLUR_REF = 400.0           # di atas ini dianggap tajam penuh
+MAX_YAW = 0.3              # offset hidung sepanjang garis mata / jarak mata
+MAX_ROLL = 30.0            # derajat; roll dikoreksi alignment dlib, jadi batasnya longgar
+CROP_MARGIN = 0.4          # margin crop relatif ke lebar wajah (konteks untuk HOG train.py)
+CHIP_FACE_PX = 150         # encoder dlib bekerja di chip 150x150: resolusi lebih tinggi tidak dipakai
+DUP_DIST = 0.08            # encoding lebih dekat dari ini ke crop yang lebih bagus = duplikat
+OUTLIER_DIST = 0.5         # encoding sejauh ini dari medoid burst = bukan orang yang sama
+JPEG_QUALITY = 92
+
+
+def face_quality(frame, box, landmarks=None):
+    """Skor kualitas satu wajah (box format face_recognition di koordinat `frame`)."""
+    top, right, bottom, left = box
+    width = right - left
+    face = cv2.resize(frame[top:bottom, left:right], (96, 96), interpolation=cv2.INTER_AREA)
+    blur = float(cv2.Laplacian(cv2.cvtColor(face, cv2.COLOR_RGB2GRAY), cv2.CV_64F).var())
+    yaw = roll = 0.0
+    if landmarks:
+        eye_l = np.mean(landmarks["left_eye"], axis=0)
+        eye_r = np.mean(landmarks["right_eye"], axis=0)
+        nose = np.asarray(landmarks["nose_tip"][0], dtype=np.float64)
+        axis = eye_r - eye_l
+        eye_dist = max(float(np.linalg.norm(axis)), 1.0)
+        # diukur sepanjang garis mata, jadi kepala miring (roll) tidak terbaca sebagai menoleh
+        yaw = float(np.dot(nose - (eye_l + eye_r) / 2, axis)) / eye_dist ** 2
+        roll = math.degrees(math.atan2(axis[1], axis[0]))
+    if width < MIN_FACE_PX:
+        reason = "kecil"
+    elif blur < MIN_BLUR:
+        reason = "blur"
+    elif abs(yaw) > MAX_YAW or abs(roll) > MAX_ROLL:
+        reason = "pose"
+    else:
+        reason = None
+    score = 0.0
+    if reason is None:
+        score = (min(blur / BLUR_REF, 1.0) * min(width / CHIP_FACE_PX, 1.0)
+                 * (1 - 0.5 * abs(yaw) / MAX_YAW) * (1 - 0.2 * abs(roll) / MAX_ROLL))
+    return {"score": score, "reject": reason, "size": width, "blur": blur, "yaw": yaw, "roll": roll}
+
+
+def crop_face(frame, box, margin=CROP_MARGIN, face_px=CHIP_FACE_PX):
+    """Crop wajah + margin, di-downscale supaya lebar wajah <= face_px. Return (crop, box di crop)."""
+    top, right, bottom, left = box
+    h, w = frame.shape[:2]
+    pad = int((right - left) * margin)
+    y0, y1 = max(top - pad, 0), min(bottom + pad, h)
+    x0, x1 = max(left - pad, 0), min(right + pad, w)
+    crop = frame[y0:y1, x0:x1]
+    s = min(face_px / (right - left), 1.0)
+    if s < 1.0:
+        crop = cv2.resize(crop, (max(int((x1 - x0) * s), 1), max(int((y1 - y0) * s), 1)),
+                          interpolation=cv2.INTER_AREA)
+    else:
+        crop = crop.copy()
+    return crop, (int((top - y0) * s), int((right - x0) * s), int((bottom - y0) * s), int((left - x0) * s))
+
+
+class Candidate:
+    def __init__(self, cid, ts, crop, box, quality):
+        self.id = cid
+        self.ts = ts
+        self.crop = crop
+        self.box = box
+        self.quality = quality
+        self.score = quality["score"]
+        self.encoding = None
+
+    def __repr__(self):
+        return f"Candidate({self.id}, score={self.score:.2f})"
+
+
+class EncodeWorker:
+    """Thread encode: kandidat di-encode segera setelah di-crop, selama burst masih jalan."""
+
+    def __init__(self, encode=None, name="enroll-encode"):
+        if encode is None:
+            import face_recognition    # lazy: import dlib hanya kalau benar-benar encode
+
+            def encode(crop, box):
+                encs = face_recognition.face_encodings(crop, [box])
+                return encs[0] if encs else None
+        self.encode = encode
+        self.name = name
+        self.done = []
+        self.stats = {"encoded": 0, "failed": 0, "encode_s": 0.0}
+        self._queue = queue.Queue()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def submit(self, cand):
+        self._queue.put(cand)
+
+    def pending(self):
+        return self._queue.qsize()
+
+    def drain(self, timeout=30.0):
+        """Tunggu semua kandidat selesai di-encode, hentikan thread. Return list kandidat."""
+        self._queue.put(None)
+        self._thread.join(timeout)
+        return self.done
+
+    def _run(self):
+        while True:
+            cand = self._queue.get()
+            if cand is None:
+                return
+            t = time.perf_counter()
+            try:
+                cand.encoding = self.encode(cand.crop, cand.box)
+            except Exception as e:
+                print(f"❌ [enroll] encode kandidat {cand.id} gagal: {e}")
+            self.stats["encode_s"] += time.perf_counter() - t
+            self.stats["encoded" if cand.encoding is not None else "failed"] += 1
+            self.done.append(cand)
+
+
+class BurstEnroller:
+    """
+    Satu burst pendaftaran satu orang. feed(frame) per frame preview (return
+    (box, quality) wajah terbesar untuk ditampilkan, atau (None, None)),
+    lalu finish() -> list Candidate terpilih (urut skor, sudah ada encoding).
+    """
+
+    def __init__(self, detector, k=ENROLL_K, detect_scale=DETECT_SCALE, gap=CANDIDATE_GAP_SEC,
+                 landmarks=None, encode=None, clock=time.perf_counter):
+        if landmarks is None:
+            import face_recognition
+
+            def landmarks(frame, box):
+                found = face_recognition.face_landmarks(frame, [box], model="small")
+                return found[0] if found else None
+        self.detector = detector
+        self.k = k
+        self.detect_scale = detect_scale
+        self.gap = gap
+        self.landmarks = landmarks
+        self.clock = clock
+        self.worker = EncodeWorker(encode).start()
+        self.stats = {"frames": 0, "no_face": 0, "kecil": 0, "blur": 0, "pose": 0, "candidates": 0}
+        self._ids = itertools.count()
+        self._best = []    # min-heap skor kandidat yang sudah dikirim ke worker
+        self._last_submit = None
+
+    def feed(self, frame, ts=None):
+        ts = self.clock() if ts is None else ts
+        self.stats["frames"] += 1
+        s = self.detect_scale
+        small = cv2.resize(frame, None, fx=s, fy=s, interpolation=cv2.INTER_AREA) if s != 1.0 else frame
+        boxes = self.detector.detect(small)
+        if not boxes:
+            self.stats["no_face"] += 1
+            return None, None
+        top, right, bottom, left = max(boxes, key=lambda b: (b[1] - b[3]) * (b[2] - b[0]))
+        h, w = frame.shape[:2]
+        box = (max(int(top / s), 0), min(int(right / s), w), min(int(bottom / s), h), max(int(left / s), 0))
+        quality = face_quality(frame, box, self.landmarks(frame, box))
+        if quality["reject"]:
+            self.stats[quality["reject"]] += 1
+            return box, quality
+        # hanya kandidat yang masuk K terbaik sejauh ini yang di-encode
+        if self._last_submit is not None and ts - self._last_submit < self.gap:
+            return box, quality
+        if len(self._best) >= self.k and quality["score"] <= self._best[0]:
+            return box, quality
+        crop, crop_box = crop_face(frame, box)
+        self.worker.submit(Candidate(next(self._ids), ts, crop, crop_box, quality))
+        if len(self._best) < self.k:
+            heapq.heappush(self._best, quality["score"])
+        else:
+            heapq.heapreplace(self._best, quality["score"])
+        self._last_submit = ts
+        self.stats["candidates"] += 1
+        return box, quality
+
+    def finish(self, timeout=30.0):
+        cands = [c for c in self.worker.drain(timeout) if c.encoding is not None]
+        if not cands:
+            return []
+        enc = np.asarray([c.encoding for c in cands], dtype=np.float64)
+        dist = np.linalg.norm(enc[:, None, :] - enc[None, :, :], axis=2)
+        medoid = int(np.argmin(dist.sum(axis=1)))
+        keep = [i for i in range(len(cands)) if dist[medoid, i] <= OUTLIER_DIST]
+        self.stats["outliers"] = len(cands) - len(keep)
+        picks, dups = [], 0
+        for i in sorted(keep, key=lambda i: -cands[i].score):
+            if len(picks) == self.k:
+                break
+            if any(dist[i, j] < DUP_DIST for j in picks):
+                dups += 1
+                continue
+            picks.append(i)
+        self.stats["duplicates"] = dups
+        return [cands[i] for i in picks]
+
+
+def _load_pickle(path, default):
+    if not os.path.exists(path):
+        return default
+    with open(path, "rb") as f:
+        return pickle.load(f)
+
+
+def save_enrolment(name, picks, dataset_dir, manifest_file, encoding_file, gallery_file=None):
+    """
+    Simpan crop terpilih + encoding-nya. Return dict statistik (files, bytes, gallery).
+    Encoding di-append (bukan rebuild dari manifest), jadi encodings.pkl yang
+    di-train di mesin lain tetap utuh.
+    """
+    folder = os.path.join(dataset_dir, name)
+    os.makedirs(folder, exist_ok=True)
+    manifest = _load_pickle(manifest_file, {})
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    total = 0
+    for i, cand in enumerate(picks):
+        path = os.path.join(folder, f"{name}_{stamp}_{i:02d}.jpg")
+        # seperti mode still: frame kamera disimpan apa adanya (tanpa konversi warna)
+        cv2.imwrite(path, cand.crop, [cv2.IMWRITE_JPEG_QUALITY, JPEG_QUALITY])
+        st = os.stat(path)
+        total += st.st_size
+        manifest[path] = {"person": name, "mtime": st.st_mtime_ns, "size": st.st_size,
+                          "hash": file_hash(path), "encodings": [cand.encoding]}
+    atomic_pickle(manifest, manifest_file)
+
+    data = _load_pickle(encoding_file, {"encodings": [], "names": []})
+    new = [c.encoding for c in picks]
+    data["encodings"] = list(data["encodings"]) + new
+    data["names"] = list(data["names"]) + [name] * len(new)
+    atomic_pickle(data, encoding_file)
+    if gallery_file:
+        if os.path.exists(gallery_file):
+            append_gallery(gallery_file, new, [name] * len(new))
+        else:
+            save_gallery(gallery_file, data["encodings"], data["names"])
+    return {"files": len(picks), "bytes": total, "gallery": len(data["names"])}
@@ -0,0 +1,80 @@
+import threading
+import time
+
+import numpy as np
+
+
+class FrameRing:
+    """
+    Ring buffer frame kamera yang dialokasikan sekali (N slot).
+
+    Satu writer (thread kamera) mengisi slot berikutnya in-place lalu commit
+    dengan nomor sequence naik. Consumer (display, recognition, recorder)
+    mendapat view read-only + sequence-nya, tanpa copy. Karena slot dipakai
+    ulang setelah N frame, consumer yang memegang view lama bisa cek
+    is_valid(seq) setelah selesai membaca (generation check).
+
+    Source file/sintetis yang diputar secepat mungkin bisa jalan lockstep:
+    writer menunggu wait_consumed() sampai consumer utama memanggil
+    consumed(seq), jadi tidak ada frame yang terlewat.
+    """
+
+    def __init__(self, slots, shape, dtype=np.uint8):
+        if slots < 2:
+            raise ValueError("FrameRing butuh minimal 2 slot")
+        self.slots = slots
+        self.buf = np.zeros((slots,) + tuple(shape), dtype=dtype)
+        self.ts = np.zeros(slots)
+        self.seq = 0    # sequence frame terakhir yang sudah di-commit (0 = belum ada frame)
+        self.read_seq = 0    # sequence terakhir yang dilaporkan consumed() (mode lockstep)
+        self._cond = threading.Condition()
+        self._views = []
+        for i in range(slots):
+            v = self.buf[i].view()
+            v.flags.writeable = False
+            self._views.append(v)
+
+    # ----------------- writer -----------------
+    def begin_write(self):
+        """View writable untuk slot berikutnya (untuk source yang bisa decode langsung ke buffer)."""
+        return self.buf[(self.seq + 1) % self.slots]
+
+    def commit(self, ts=None):
+        with self._cond:
+            self.seq += 1
+            self.ts[self.seq % self.slots] = time.perf_counter() if ts is None else ts
+            self._cond.notify_all()
+        return self.seq
+
+    def write(self, arr, ts=None):
+        """Copy satu frame ke slot berikutnya (satu-satunya copy di jalur kamera)."""
+        np.copyto(self.begin_write(), arr)
+        return self.commit(ts)
+
+    def wait_consumed(self, timeout=None):
+        """Blocking sampai frame terakhir sudah diambil consumer (lockstep). Return False kalau timeout."""
+        with self._cond:
+            return self._cond.wait_for(lambda: self.read_seq >= self.seq, timeout)
+
+    # ----------------- readers -----------------
+    def latest(self):
+        """Return (seq, view read-only, timestamp); seq 0 kalau belum ada frame."""
+        with self._cond:
+            seq = self.seq
+        slot = seq % self.slots
+        return seq, (self._views[slot] if seq else None), self.ts[slot]
+
+    def wait_newer(self, seq, timeout=None):
+        """Blocking sampai ada frame dengan sequence > seq (atau timeout), lalu return latest()."""
+        with self._cond:
+            self._cond.wait_for(lambda: self.seq > seq, timeout)
+        return self.latest()
+
+    def is_valid(self, seq):
+        """True kalau slot milik `seq` belum (dan tidak sedang) ditimpa writer."""
+        return seq > 0 and self.seq - seq < self.slots - 1
+
+    def consumed(self, seq):
+        with self._cond:
+            self.read_seq = seq
+            self._cond.notify_all()
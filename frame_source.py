@@ -0,0 +1,281 @@
+"""
+Sumber frame untuk kiosk & pendaftaran, supaya pipeline bisa jalan tanpa Pi.
+
+Semua backend mengembalikan frame RGB uint8 (seperti Picamera2 RGB888) lewat
+read(); read() blocking sampai frame berikut dan return None kalau stream
+habis. Spec string (untuk --source):
+
+    picamera                 Picamera2 (default di Raspberry Pi)
+    cv:0 / cv:rtsp://...     OpenCV VideoCapture (webcam USB / stream)
+    replay:dataset/budi      folder gambar atau file video, diputar ulang
+    synthetic                frame sintetis (noise + kotak bergerak)
+
+Untuk replay & synthetic, `fps` None = secepat mungkin, `loop` = ulang dari awal.
+Frame dari SyntheticSource memakai buffer yang sama tiap read() (copy kalau disimpan).
+
+set_idle(True, size, fps) mengganti stream ke frame kecil & jarang (sleep mode);
+Picamera2 ganti mode sensor, backend lain downscale + pacing di software.
+"""
+import time
+from pathlib import Path
+
+import cv2
+import numpy as np
+
+IMAGE_EXTS = {".jpg", ".jpeg", ".png", ".bmp"}
+
+
+class FrameSource:
+    """Base class: start() -> read() berulang -> stop()."""
+
+    def __init__(self, size=(640, 480), fps=None):
+        self.size = tuple(size)    # (width, height)
+        self.live = False          # kamera sungguhan: frame hilang kalau tidak diambil
+        self.fps = fps
+        self.frames = 0
+        self.idle = False
+        self._active = None
+        self._next = None
+
+    def start(self):
+        return self
+
+    def set_idle(self, idle, size=(160, 120), fps=5.0):
+        """Stream kecil & jarang untuk sleep mode; set_idle(False) kembali ke mode normal."""
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if idle:
+            self._active = (self.size, self.fps)
+            self.size, self.fps = tuple(size), fps
+        else:
+            self.size, self.fps = self._active
+        self._next = None
+
+    def read(self):
+        raise NotImplementedError
+
+    def capture_still(self):
+        """Foto resolusi penuh (daftar.py). Default: frame preview biasa."""
+        return self.read()
+
+    def stop(self):
+        pass
+
+    def _pace(self):
+        # tahan laju ke `fps` (kamera sungguhan sudah blocking sendiri)
+        if not self.fps:
+            return
+        now = time.perf_counter()
+        if self._next is None:
+            self._next = now
+        self._next += 1.0 / self.fps
+        if self._next > now:
+            time.sleep(self._next - now)
+        else:
+            self._next = now    # tertinggal: jangan kejar dengan burst
+
+    def _fit(self, frame):
+        if (frame.shape[1], frame.shape[0]) != self.size:
+            frame = cv2.resize(frame, self.size, interpolation=cv2.INTER_AREA)
+        return frame
+
+
+class PicameraSource(FrameSource):
+    def __init__(self, size=(640, 480), still_size=None, settle=0.0):
+        super().__init__(size)
+        self.live = True
+        self.still_size = still_size
+        self.settle = settle
+        self.picam = None
+        self.idle_config = None
+
+    def start(self):
+        from picamera2 import Picamera2    # hanya tersedia di Raspberry Pi OS
+        self.picam = Picamera2()
+        self.preview_config = self.picam.create_preview_configuration(
+            main={"size": self.size, "format": "RGB888"})
+        self.still_config = None
+        if self.still_size:
+            self.still_config = self.picam.create_still_configuration(
+                main={"size": tuple(self.still_size), "format": "RGB888"})
+        self.picam.configure(self.preview_config)
+        self.picam.start()
+        if self.settle:
+            time.sleep(self.settle)
+        return self
+
+    def read(self):
+        frame = self.picam.capture_array()
+        self.frames += 1
+        return frame
+
+    def set_idle(self, idle, size=(160, 120), fps=5.0):
+        # sensor sendiri yang diperlambat (FrameDurationLimits), bukan cuma frame yang dibuang
+        if idle == self.idle:
+            return
+        self.idle = idle
+        if idle:
+            frame_us = int(1e6 / fps)
+            self.idle_config = self.picam.create_video_configuration(
+                main={"size": tuple(size), "format": "RGB888"},
+                controls={"FrameDurationLimits": (frame_us, frame_us)})
+            self.picam.switch_mode(self.idle_config)
+        else:
+            self.picam.switch_mode(self.preview_config)
+
+    def capture_still(self):
+        if self.still_config is None:
+            return self.read()
+        self.picam.switch_mode(self.still_config)
+        time.sleep(0.2)
+        try:
+            return self.picam.capture_array()
+        finally:
+            self.picam.switch_mode(self.preview_config)
+            time.sleep(0.2)
+
+    def stop(self):
+        if self.picam is not None:
+            try:
+                self.picam.stop()
+            except Exception:
+                pass
+
+
+class OpenCVSource(FrameSource):
+    def __init__(self, device=0, size=(640, 480)):
+        super().__init__(size)
+        self.live = True
+        self.device = device
+        self.cap = None
+
+    def start(self):
+        self.cap = cv2.VideoCapture(self.device)
+        if not self.cap.isOpened():
+            raise RuntimeError(f"VideoCapture {self.device!r} tidak bisa dibuka")
+        self._native_fps = self.cap.get(cv2.CAP_PROP_FPS)
+        self._configure()
+        return self
+
+    def _configure(self):
+        # driver boleh mengabaikan; _fit() tetap menjamin ukuran frame
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, self.size[0])
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, self.size[1])
+        fps = self.fps or self._native_fps
+        if fps:
+            self.cap.set(cv2.CAP_PROP_FPS, fps)
+
+    def set_idle(self, idle, size=(160, 120), fps=5.0):
+        if idle == self.idle:
+            return
+        super().set_idle(idle, size, fps)
+        self._configure()
+
+    def read(self):
+        ok, frame = self.cap.read()
+        if not ok:
+            return None
+        if self.idle:
+            self._pace()    # webcam yang tidak mau diperlambat: frame di antaranya dibuang
+        self.frames += 1
+        return cv2.cvtColor(self._fit(frame), cv2.COLOR_BGR2RGB)
+
+    def stop(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class ReplaySource(FrameSource):
+    """Folder gambar (urut nama file) atau file video."""
+
+    def __init__(self, path, size=(640, 480), fps=None, loop=False):
+        super().__init__(size, fps)
+        self.path = Path(path)
+        self.loop = loop
+        self.cap = None
+        self.images = None
+        self._i = 0
+        self.current = None    # file asal frame terakhir (label clip = nama folder induknya)
+
+    def start(self):
+        if self.path.is_dir():
+            self.images = sorted(p for p in self.path.rglob("*") if p.suffix.lower() in IMAGE_EXTS)
+            if not self.images:
+                raise RuntimeError(f"tidak ada gambar di {self.path}")
+        else:
+            self.cap = cv2.VideoCapture(str(self.path))
+            if not self.cap.isOpened():
+                raise RuntimeError(f"video {self.path} tidak bisa dibuka")
+        return self
+
+    def _next_bgr(self):
+        if self.images is not None:
+            if self._i >= len(self.images):
+                if not self.loop:
+                    return None
+                self._i = 0
+            self.current = self.images[self._i]
+            frame = cv2.imread(str(self.current))
+            self._i += 1
+            return frame
+        self.current = self.path
+        ok, frame = self.cap.read()
+        if not ok and self.loop:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            ok, frame = self.cap.read()
+        return frame if ok else None
+
+    def read(self):
+        frame = self._next_bgr()
+        while frame is None and self.images is not None and self._i < len(self.images):
+            frame = self._next_bgr()    # gambar rusak dilewati
+        if frame is None:
+            return None
+        self._pace()
+        self.frames += 1
+        return cv2.cvtColor(self._fit(frame), cv2.COLOR_BGR2RGB)
+
+    def stop(self):
+        if self.cap is not None:
+            self.cap.release()
+
+
+class SyntheticSource(FrameSource):
+    """Noise statis + kotak terang yang bergerak; `limit` frame lalu selesai (None = tanpa batas)."""
+
+    def __init__(self, size=(640, 480), fps=30.0, limit=None, seed=0):
+        super().__init__(size, fps)
+        self.limit = limit
+        rng = np.random.default_rng(seed)
+        w, h = self.size
+        self.background = rng.integers(0, 200, (h, w, 3), dtype=np.uint8)
+        self._frame = np.empty_like(self.background)
+
+    def read(self):
+        if self.limit is not None and self.frames >= self.limit:
+            return None
+        self._pace()
+        h, w = self.background.shape[:2]
+        side = h // 3
+        x = int((w - side) * (0.5 + 0.5 * np.sin(self.frames / 30.0)))
+        y = (h - side) // 2
+        np.copyto(self._frame, self.background)
+        self._frame[y:y + side, x:x + side] = 230
+        self.frames += 1
+        return self._fit(self._frame)
+
+
+def open_source(spec, size=(640, 480), fps=None, loop=False, still_size=None, settle=0.0):
+    """Buat FrameSource dari spec string (lihat docstring modul).
+    `still_size` & `settle` (detik tunggu auto-exposure) hanya untuk Picamera2."""
+    kind, _, arg = spec.partition(":")
+    if kind == "picamera":
+        return PicameraSource(size, still_size=still_size, settle=settle)
+    if kind == "cv":
+        return OpenCVSource(int(arg) if arg.isdigit() else (arg or 0), size)
+    if kind == "replay":
+        return ReplaySource(arg, size, fps=fps, loop=loop)
+    if kind == "synthetic":
+        return SyntheticSource(size, fps=fps, limit=int(arg) if arg else None)
+    raise ValueError(f"frame source tidak dikenal: {spec!r}")
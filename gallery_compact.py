@@ -0,0 +1,223 @@
+"""
+Compaction gallery per orang: buang near-duplicate, sisakan beberapa
+prototype per orang.
+
+train.py menyimpan setiap encoding dari setiap foto (dan setiap wajah di foto,
+termasuk orang lain yang ikut terfoto), jadi biaya matcher naik dengan jumlah
+foto, bukan jumlah orang. Per orang di `names`, prototype dipilih
+farthest-first mulai dari medoid (atau centroid, `centroid=True`): encoding
+yang paling jauh dari prototype yang sudah ada ditambahkan sampai semua
+encoding berjarak <= COVER_DIST ke salah satu prototype, maksimal
+MAX_PROTOTYPES. Yang tidak terpilih = near-duplicate. Encoding yang jauh
+(pose lain, foto lain) justru terpilih duluan, jadi cakupan per orang tetap.
+
+Outlier (wajah orang lain yang ikut terfoto, foto rusak) hanya dilaporkan:
+komponen single-linkage (LINK_DIST) selain yang terbesar, dan komponen yang
+dekat ke orang terdaftar lain (BYSTANDER_DIST). Membuangnya otomatis
+(`drop_outliers=True` / --drop-outliers) diukur di bench/bench_compact.py
+menurunkan akurasi terhadap label asli, jadi defaultnya mati; perbaiki
+dataset/<nama> lalu train ulang.
+
+Pakai:
+    python3 gallery_compact.py encodings.pkl --dry-run       # laporan saja
+    python3 gallery_compact.py encodings.pkl encodings_compact.gal
+atau tanpa file baru: GALLERY_COMPACT = True di absensi.py (compaction saat
+load, juga saat hot-reload).
+"""
+import argparse
+import pickle
+import sys
+
+import numpy as np
+
+from gallery_store import load_gallery, save_gallery
+
+# ----------------- CONFIG -----------------
+LINK_DIST = 0.5          # encoding sedekat ini dianggap orang yang sama (single linkage)
+AMBIGUOUS_RATIO = 0.6    # komponen kedua >= ratio x terbesar: simpan dua-duanya
+COVER_DIST = 0.25        # setiap encoding harus sedekat ini ke salah satu prototype
+MAX_PROTOTYPES = 5       # per komponen
+MIN_SAMPLES = 3          # orang dengan encoding sesedikit ini tidak di-compact
+BYSTANDER_DIST = 0.4     # kelompok kedua sedekat ini ke centroid orang terdaftar lain = wajah orang itu
+
+
+def load_encodings(path):
+    """Baca encodings.pkl / encodings.gal. Return (float32 [N, dim], list nama)."""
+    if str(path).endswith(".gal"):
+        enc, _, labels, people = load_gallery(path)
+        return np.array(enc, dtype=np.float32), [people[i] for i in labels]
+    with open(path, "rb") as f:
+        data = pickle.load(f)
+    enc = np.asarray(data.get("encodings", []), dtype=np.float32)
+    return enc.reshape(len(enc), -1) if len(enc) else np.zeros((0, 128), np.float32), list(data.get("names", []))
+
+
+def save_encodings(path, encodings, names):
+    if str(path).endswith(".gal"):
+        save_gallery(path, encodings, names)
+    else:
+        with open(path, "wb") as f:
+            pickle.dump({"encodings": [e for e in np.asarray(encodings)], "names": list(names)}, f)
+
+
+def _components(dist, link):
+    """Komponen terhubung (jarak <= link), terurut dari yang terbesar."""
+    n = len(dist)
+    comp = np.full(n, -1)
+    groups = []
+    for start in range(n):
+        if comp[start] >= 0:
+            continue
+        comp[start] = len(groups)
+        members, stack = [], [start]
+        while stack:
+            i = stack.pop()
+            members.append(i)
+            for j in np.flatnonzero((dist[i] <= link) & (comp < 0)):
+                comp[j] = len(groups)
+                stack.append(j)
+        groups.append(np.sort(members))
+    return sorted(groups, key=len, reverse=True)
+
+
+def _prototypes(x, cover, max_protos, centroid):
+    """Farthest-first dari medoid / centroid. Return (prototype [k, dim], index sample terpilih)."""
+    dist = np.linalg.norm(x[:, None, :] - x[None, :, :], axis=2)
+    if centroid:
+        protos, picked = [x.mean(axis=0)], []
+        nearest = np.linalg.norm(x - protos[0], axis=1)
+    else:
+        first = int(dist.sum(axis=1).argmin())
+        protos, picked = [x[first]], [first]
+        nearest = dist[first].copy()
+    while len(protos) < max_protos and nearest.max() > cover:
+        far = int(nearest.argmax())
+        protos.append(x[far])
+        picked.append(far)
+        np.minimum(nearest, dist[far], out=nearest)
+    return np.asarray(protos, dtype=np.float32), picked
+
+
+def _groups(x, link, ambiguous_ratio):
+    """Index komponen yang disimpan untuk satu orang: [utama, kandidat lain yang hampir sama besar]."""
+    if len(x) <= MIN_SAMPLES:
+        return [np.arange(len(x))]
+    dist = np.linalg.norm(x[:, None, :] - x[None, :, :], axis=2)
+    groups = _components(dist, link)
+    return [groups[0]] + [g for g in groups[1:] if len(g) >= 2 and len(g) >= ambiguous_ratio * len(groups[0])]
+
+
+def split_groups(encodings, names, link=LINK_DIST, ambiguous_ratio=AMBIGUOUS_RATIO,
+                 bystander_dist=BYSTANDER_DIST):
+    """
+    Kelompokkan encoding per orang. Return (by_person, keep, bystanders):
+    by_person = {nama: index}, keep = {nama: [index kelompok yang disimpan]},
+    bystanders = [(nama, milik siapa, index)] untuk kelompok yang ternyata wajah
+    orang terdaftar lain (foto berisi lebih dari satu wajah).
+    """
+    enc = np.asarray(encodings, dtype=np.float32)
+    by_person = {}
+    for i, n in enumerate(names):
+        by_person.setdefault(n, []).append(i)
+    people = list(by_person)
+    groups = {p: [np.asarray(idx)[g] for g in _groups(enc[idx], link, ambiguous_ratio)]
+              for p, idx in by_person.items()}
+    # centroid kelompok utama tiap orang: kelompok kedua yang dekat ke orang lain = wajah orang itu
+    mains = np.asarray([enc[groups[p][0]].mean(axis=0) for p in people]).reshape(len(people), -1)
+
+    keep, bystanders = {}, []
+    for pi, person in enumerate(people):
+        keep[person] = groups[person]
+        if len(groups[person]) == 1:
+            continue
+        # kelompok mana pun (termasuk yang terbesar) bisa jadi wajah orang lain di foto yang sama
+        kept = []
+        for g in groups[person]:
+            d = np.linalg.norm(mains - enc[g].mean(axis=0), axis=1)
+            d[pi] = np.inf
+            if d.min() <= bystander_dist:
+                bystanders.append((person, people[int(d.argmin())], g))
+            else:
+                kept.append(g)
+        keep[person] = kept or groups[person][:1]
+    return by_person, keep, bystanders
+
+
+def compact_gallery(encodings, names, cover=COVER_DIST, max_protos=MAX_PROTOTYPES, centroid=False,
+                    drop_outliers=False, link=LINK_DIST, ambiguous_ratio=AMBIGUOUS_RATIO,
+                    bystander_dist=BYSTANDER_DIST):
+    """
+    Compaction seluruh gallery (urutan orang mengikuti kemunculan pertama di names).
+    Return (encodings float32, names, stats). stats["curiga"] = [(nama, jumlah,
+    milik siapa atau None)] kelompok outlier per orang; hanya dibuang kalau
+    drop_outliers=True.
+    """
+    enc = np.asarray(encodings, dtype=np.float32)
+    dim = enc.shape[1] if enc.ndim == 2 else 128
+    by_person, keep, bystanders = split_groups(enc, names, link, ambiguous_ratio, bystander_dist)
+    owner = {(p, int(g[0])): other for p, other, g in bystanders}
+
+    out_enc, out_names = [], []
+    stats = {"sebelum": len(names), "sesudah": 0, "outlier": 0, "duplikat": 0, "curiga": []}
+    for person, idx in by_person.items():
+        kept_idx = set(int(i) for g in keep[person] for i in g)
+        dropped = [i for i in idx if i not in kept_idx]
+        if dropped:
+            for g in _suspect_groups(dropped, bystanders, person):
+                stats["curiga"].append((person, len(g), owner.get((person, int(g[0])))))
+        groups = keep[person] if drop_outliers else [np.asarray(idx)]
+        if len(idx) <= MIN_SAMPLES:
+            protos = enc[idx]
+        else:
+            protos = np.concatenate([_prototypes(enc[g], cover, max_protos, centroid)[0] for g in groups])
+        kept = sum(len(g) for g in groups)
+        out_enc.append(protos)
+        out_names += [person] * len(protos)
+        stats["outlier"] += len(idx) - kept
+        stats["duplikat"] += kept - len(protos)
+    stats["sesudah"] = len(out_names)
+    return (np.concatenate(out_enc) if out_enc else np.zeros((0, dim), np.float32)), out_names, stats
+
+
+def _suspect_groups(dropped, bystanders, person):
+    """Index yang tidak masuk kelompok yang disimpan, dikelompokkan untuk laporan."""
+    groups = [g for p, _, g in bystanders if p == person]
+    rest = sorted(set(dropped) - set(int(i) for g in groups for i in g))
+    return groups + ([np.asarray(rest)] if rest else [])
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Compaction gallery encodings per orang")
+    ap.add_argument("src", help="encodings.pkl / encodings.gal")
+    ap.add_argument("dst", nargs="?", default=None, help=".gal atau .pkl (kosong = hanya laporan)")
+    ap.add_argument("--cover", type=float, default=COVER_DIST)
+    ap.add_argument("--max", type=int, default=MAX_PROTOTYPES, help="prototype maksimal per orang / kelompok")
+    ap.add_argument("--centroid", action="store_true", help="prototype pertama = centroid, bukan medoid")
+    ap.add_argument("--drop-outliers", action="store_true",
+                    help="ikut buang kelompok outlier (menurunkan akurasi di bench_compact.py)")
+    ap.add_argument("--link", type=float, default=LINK_DIST)
+    ap.add_argument("--dry-run", action="store_true")
+    args = ap.parse_args()
+
+    enc, names = load_encodings(args.src)
+    if not len(names):
+        print(f"❌ {args.src}: gallery kosong")
+        sys.exit(1)
+    out, out_names, s = compact_gallery(enc, names, cover=args.cover, max_protos=args.max,
+                                        centroid=args.centroid, drop_outliers=args.drop_outliers,
+                                        link=args.link)
+    people = len(set(names))
+    print(f"[compact] {people} orang | {s['sebelum']} -> {s['sesudah']} encodings "
+          f"({100 * (1 - s['sesudah'] / s['sebelum']):.0f}% lebih kecil) | duplikat {s['duplikat']} "
+          f"outlier dibuang {s['outlier']}")
+    action = "dibuang" if args.drop_outliers else "tetap disimpan"
+    for person, n, other in s["curiga"]:
+        what = f"mirip wajah {other}" if other else "jauh dari encoding lain"
+        print(f"⚠️ {person}: {n} encoding {what} ({action}) - cek dataset/{person}")
+    if args.dst and not args.dry_run:
+        save_encodings(args.dst, out, out_names)
+        print(f"✅ {args.dst}: {len(out_names)} encodings, {people} orang")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,199 @@
+"""
+Format gallery biner (pengganti encodings.pkl) yang bisa di-load dengan np.memmap.
+
+Layout file (little endian, tiap section di-align 64 byte):
+
+    header    : magic, versi, dim, N, jumlah orang, offset tiap section,
+                crc32 payload, crc32 header
+    encodings : float32 [N, dim]   (diurutkan per label id)
+    sq_norms  : float32 [N]        (norm^2 tiap encoding, untuk matcher)
+    label_ids : int32   [N]
+    strings   : JSON utf-8 list nama orang, index = label id
+
+Pakai:
+    python3 gallery_store.py convert encodings.pkl encodings.gal
+    python3 gallery_store.py verify encodings.gal
+"""
+import argparse
+import hashlib
+import json
+import os
+import pickle
+import struct
+import sys
+import zlib
+
+import numpy as np
+
+MAGIC = b"ABSNGAL\x00"
+VERSION = 1
+ALIGN = 64
+_HEADER = struct.Struct("<8sIIIIQQQQQI")
+_HEADER_CRC = struct.Struct("<I")
+HEADER_SIZE = _HEADER.size + _HEADER_CRC.size
+
+
+class GalleryFormatError(Exception):
+    pass
+
+
+def _align(n):
+    return (n + ALIGN - 1) // ALIGN * ALIGN
+
+
+def _crc_file(path, start, end, chunk=1 << 20):
+    crc = 0
+    with open(path, "rb") as f:
+        f.seek(start)
+        remaining = end - start
+        while remaining > 0:
+            block = f.read(min(chunk, remaining))
+            if not block:
+                break
+            crc = zlib.crc32(block, crc)
+            remaining -= len(block)
+    return crc
+
+
+def file_hash(path, chunk=1 << 20):
+    """sha1 isi file (key manifest train.py / enroll.py)."""
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(chunk), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def atomic_pickle(obj, path):
+    """Tulis pickle secara atomic (tmp + rename), untuk encodings.pkl & manifest."""
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        pickle.dump(obj, f)
+    os.replace(tmp, path)
+
+
+def save_gallery(path, encodings, names):
+    """Tulis gallery ke `path` secara atomic (tmp + rename)."""
+    enc = np.asarray(encodings, dtype=np.float32)
+    dim = enc.shape[1] if enc.ndim == 2 and len(enc) else 128
+    enc = enc.reshape(-1, dim)
+    people = list(dict.fromkeys(names))
+    index = {p: i for i, p in enumerate(people)}
+    labels = np.fromiter((index[n] for n in names), dtype=np.int32, count=len(names))
+    order = np.argsort(labels, kind="stable")
+    enc, labels = np.ascontiguousarray(enc[order]), labels[order]
+    sq_norms = np.einsum("ij,ij->i", enc, enc).astype(np.float32)
+    strings = json.dumps(people, ensure_ascii=False).encode("utf-8")
+
+    n = len(enc)
+    off_enc = _align(HEADER_SIZE)
+    off_norms = _align(off_enc + enc.nbytes)
+    off_labels = _align(off_norms + sq_norms.nbytes)
+    off_strings = _align(off_labels + labels.nbytes)
+
+    tmp = f"{path}.tmp"
+    with open(tmp, "wb") as f:
+        f.write(b"\x00" * off_enc)
+        for off, blob in ((off_enc, enc.tobytes()), (off_norms, sq_norms.tobytes()),
+                          (off_labels, labels.tobytes()), (off_strings, strings)):
+            f.seek(off)
+            f.write(blob)
+    payload_crc = _crc_file(tmp, off_enc, off_strings + len(strings))
+    header = _HEADER.pack(MAGIC, VERSION, dim, n, len(people), off_enc, off_norms,
+                          off_labels, off_strings, len(strings), payload_crc)
+    with open(tmp, "r+b") as f:
+        f.write(header + _HEADER_CRC.pack(zlib.crc32(header)))
+    os.replace(tmp, path)
+
+
+def read_header(path):
+    with open(path, "rb") as f:
+        raw = f.read(HEADER_SIZE)
+    if len(raw) < HEADER_SIZE:
+        raise GalleryFormatError(f"{path}: file terlalu kecil")
+    header, (crc,) = raw[:_HEADER.size], _HEADER_CRC.unpack(raw[_HEADER.size:])
+    fields = _HEADER.unpack(header)
+    if fields[0] != MAGIC:
+        raise GalleryFormatError(f"{path}: bukan file gallery (magic salah)")
+    if zlib.crc32(header) != crc:
+        raise GalleryFormatError(f"{path}: header checksum salah")
+    keys = ("magic", "version", "dim", "n", "n_people", "off_enc", "off_norms",
+            "off_labels", "off_strings", "len_strings", "payload_crc")
+    h = dict(zip(keys, fields))
+    if h["version"] != VERSION:
+        raise GalleryFormatError(f"{path}: versi {h['version']} tidak didukung (butuh {VERSION})")
+    if os.path.getsize(path) < h["off_strings"] + h["len_strings"]:
+        raise GalleryFormatError(f"{path}: file terpotong")
+    return h
+
+
+def verify_gallery(path):
+    """Cek crc32 seluruh payload (O(N), dipakai oleh converter / tool, bukan saat start-up)."""
+    h = read_header(path)
+    crc = _crc_file(path, h["off_enc"], h["off_strings"] + h["len_strings"])
+    if crc != h["payload_crc"]:
+        raise GalleryFormatError(f"{path}: payload checksum salah")
+    return h
+
+
+def load_gallery(path, verify=False):
+    """
+    Buka gallery tanpa membaca isinya: encodings/sq_norms/label_ids adalah
+    np.memmap read-only (page di-share antar proses), hanya header & string
+    table yang dibaca. Return (encodings, sq_norms, label_ids, people).
+    """
+    h = verify_gallery(path) if verify else read_header(path)
+    n, dim = h["n"], h["dim"]
+    enc = np.memmap(path, dtype=np.float32, mode="r", offset=h["off_enc"], shape=(n, dim)) \
+        if n else np.zeros((0, dim), dtype=np.float32)
+    sq_norms = np.memmap(path, dtype=np.float32, mode="r", offset=h["off_norms"], shape=(n,)) \
+        if n else np.zeros(0, dtype=np.float32)
+    labels = np.memmap(path, dtype=np.int32, mode="r", offset=h["off_labels"], shape=(n,)) \
+        if n else np.zeros(0, dtype=np.int32)
+    with open(path, "rb") as f:
+        f.seek(h["off_strings"])
+        people = json.loads(f.read(h["len_strings"]).decode("utf-8"))
+    if len(people) != h["n_people"]:
+        raise GalleryFormatError(f"{path}: string table tidak cocok dengan header")
+    return enc, sq_norms, labels, people
+
+
+def append_gallery(path, encodings, names):
+    """Tambah encoding ke gallery yang sudah ada (daftar.py). File ditulis ulang atomic."""
+    enc, _, labels, people = load_gallery(path)
+    new = np.asarray(encodings, dtype=np.float32).reshape(-1, enc.shape[1])
+    save_gallery(path, np.concatenate([enc, new]), [people[i] for i in labels] + list(names))
+
+
+def convert_pickle(src, dst):
+    """Konversi encodings.pkl lama ({"encodings", "names"}) ke format gallery."""
+    with open(src, "rb") as f:
+        data = pickle.load(f)
+    save_gallery(dst, data.get("encodings", []), data.get("names", []))
+    return verify_gallery(dst)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Gallery encodings biner (memmap)")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("convert", help="encodings.pkl -> encodings.gal")
+    c.add_argument("src")
+    c.add_argument("dst")
+    v = sub.add_parser("verify", help="cek header + checksum")
+    v.add_argument("path")
+    args = ap.parse_args()
+
+    try:
+        if args.cmd == "convert":
+            h = convert_pickle(args.src, args.dst)
+            print(f"✅ {args.src} -> {args.dst}: {h['n']} encodings, {h['n_people']} orang")
+        else:
+            h = verify_gallery(args.path)
+            print(f"✅ {args.path} OK: v{h['version']}, {h['n']} encodings, {h['n_people']} orang")
+    except GalleryFormatError as e:
+        print("❌", e)
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
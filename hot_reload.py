@@ -0,0 +1,94 @@
+import os
+import threading
+import time
+
+
+class HotReloader:
+    """
+    Polling mtime/size file di background thread. Kalau ada yang berubah,
+    `loader()` dipanggil di thread ini (bukan di main loop) dan hasilnya
+    di-swap sekaligus ke `self.state`. Main loop cukup ambil `current()` sekali
+    per frame, jadi tidak pernah melihat gallery yang setengah jadi.
+    """
+
+    def __init__(self, paths, loader, interval=1.0, settle=0.3, name="reload", initial=None, on_change=None):
+        self.paths = list(paths)
+        self.loader = loader
+        self.on_change = on_change   # dipanggil dengan state baru setelah swap (di thread reload)
+        self.interval = interval
+        self.settle = settle
+        self.name = name
+        self.state = loader() if initial is None else initial
+        self.reloads = 0
+        self.errors = 0
+        self.loading = False         # True selama loader() jalan (untuk statistik frame time)
+        self.last_load_s = 0.0       # durasi loader() terakhir
+        self.last_latency_s = 0.0    # perubahan file terdeteksi -> state baru aktif
+        self._stamps = self._stat()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _stat(self):
+        stamps = []
+        for p in self.paths:
+            try:
+                st = os.stat(p)
+                stamps.append((st.st_mtime_ns, st.st_size))
+            except OSError:
+                stamps.append(None)
+        return stamps
+
+    def current(self):
+        return self.state
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def check(self):
+        """Satu putaran cek + reload. Return True kalau state di-swap."""
+        stamps = self._stat()
+        if stamps == self._stamps:
+            return False
+        detected = time.perf_counter()
+        # tunggu file selesai ditulis (mtime/size stabil) sebelum di-load
+        while not self._stop.wait(self.settle):
+            again = self._stat()
+            if again == stamps:
+                break
+            stamps = again
+        if self._stop.is_set():
+            return False
+        self.loading = True
+        try:
+            t = time.perf_counter()
+            new_state = self.loader()
+            self.last_load_s = time.perf_counter() - t
+        except Exception as e:
+            self.errors += 1
+            print(f"❌ [{self.name}] reload gagal, tetap pakai data lama:", e)
+            self._stamps = stamps
+            return False
+        finally:
+            self.loading = False
+        self.state = new_state
+        self._stamps = stamps
+        self.reloads += 1
+        self.last_latency_s = time.perf_counter() - detected
+        print(f"[{self.name}] reload #{self.reloads} selesai ({self.last_load_s * 1000:.0f} ms)")
+        if self.on_change is not None:
+            try:
+                self.on_change(new_state)
+            except Exception as e:
+                print(f"❌ [{self.name}] on_change error:", e)
+        return True
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.check()
@@ -0,0 +1,120 @@
+import pickle
+
+import numpy as np
+
+from ann_index import build_index
+from gallery_store import load_gallery
+
+ENCODING_DIM = 128
+
+
+class GalleryMatcher:
+    """
+    Gallery wajah yang sudah di-load sekali ke matrix float32 (N x 128).
+
+    Semua wajah dalam satu frame di-score sekaligus terhadap seluruh gallery,
+    lalu diambil jarak terbaik per orang (bukan per foto/sample).
+
+    `index` menentukan cara match(): 'exact' (brute force), 'ivf' (ANN untuk
+    gallery ribuan orang) atau 'auto'. Opsi tambahan (nlist, nprobe) diteruskan
+    ke ann_index.build_index.
+    """
+
+    def __init__(self, encodings, names, index="auto", **index_opts):
+        enc = np.asarray(encodings, dtype=np.float32).reshape(-1, ENCODING_DIM)
+        if len(enc) != len(names):
+            raise ValueError(f"jumlah encodings ({len(enc)}) != jumlah names ({len(names)})")
+
+        # label id per sample, urutan orang mengikuti kemunculan pertama di names
+        self.people = list(dict.fromkeys(names))
+        person_index = {p: i for i, p in enumerate(self.people)}
+        label_ids = np.fromiter((person_index[n] for n in names), dtype=np.int32, count=len(names))
+        self._setup(enc, label_ids, None, index, index_opts)
+
+    def _setup(self, enc, label_ids, sq_norms, index, index_opts):
+        # urutkan sample per label supaya min per orang cukup pakai reduceat;
+        # gallery dari gallery_store sudah terurut jadi memmap-nya dipakai langsung
+        if len(label_ids) and np.any(label_ids[1:] < label_ids[:-1]):
+            order = np.argsort(label_ids, kind="stable")
+            enc, label_ids, sq_norms = enc[order], label_ids[order], None
+        self.encodings = enc if isinstance(enc, np.memmap) else np.ascontiguousarray(enc)
+        self.label_ids = label_ids
+        self.sq_norms = np.einsum("ij,ij->i", enc, enc) if sq_norms is None else sq_norms
+        self._starts = np.flatnonzero(np.r_[True, self.label_ids[1:] != self.label_ids[:-1]]) \
+            if len(self.label_ids) else np.zeros(0, dtype=np.intp)
+        self.index = build_index(self.encodings, index, sq_norms=self.sq_norms, **index_opts) \
+            if len(self.encodings) else None
+
+    @classmethod
+    def from_pickle(cls, path, **opts):
+        with open(path, "rb") as f:
+            data = pickle.load(f)
+        return cls(data.get("encodings", []), data.get("names", []), **opts)
+
+    @classmethod
+    def from_store(cls, path, index="auto", verify=False, **index_opts):
+        """Load gallery biner (gallery_store) via memmap, tanpa copy / pickle."""
+        enc, sq_norms, label_ids, people = load_gallery(path, verify=verify)
+        self = cls.__new__(cls)
+        self.people = people
+        self._setup(enc, label_ids, sq_norms, index, index_opts)
+        return self
+
+    @classmethod
+    def load(cls, path, compact=False, **opts):
+        """
+        Pilih loader sesuai format file (.gal = gallery_store, selain itu pickle).
+        compact=True (atau dict opsi gallery_compact.compact_gallery): encoding per
+        orang diringkas jadi beberapa prototype saat load (gallery jadi array biasa,
+        bukan memmap).
+        """
+        if compact:
+            from gallery_compact import compact_gallery, load_encodings
+            enc, names = load_encodings(path)
+            enc, names, _ = compact_gallery(enc, names, **(compact if isinstance(compact, dict) else {}))
+            return cls(enc, names, **opts)
+        if str(path).endswith(".gal"):
+            return cls.from_store(path, **opts)
+        return cls.from_pickle(path, **opts)
+
+    def __len__(self):
+        return len(self.encodings)
+
+    def _as_queries(self, queries):
+        return np.asarray(queries, dtype=np.float32).reshape(-1, ENCODING_DIM)
+
+    def sq_distances(self, queries):
+        """Squared euclidean distance (M x N) semua query ke semua sample gallery."""
+        q = self._as_queries(queries)
+        q_norms = np.einsum("ij,ij->i", q, q)
+        d2 = q @ self.encodings.T
+        d2 *= -2.0
+        d2 += q_norms[:, None]
+        d2 += self.sq_norms[None, :]
+        np.maximum(d2, 0.0, out=d2)
+        return d2
+
+    def person_distances(self, queries):
+        """Jarak terbaik per orang (M x P), kolom sesuai urutan self.people."""
+        q = self._as_queries(queries)
+        if len(self.encodings) == 0 or len(q) == 0:
+            return np.empty((len(q), len(self.people)), dtype=np.float32)
+        d2 = self.sq_distances(q)
+        best = np.minimum.reduceat(d2, self._starts, axis=1)
+        return np.sqrt(best, out=best)
+
+    def match(self, queries, tolerance):
+        """
+        Identifikasi setiap wajah dalam satu batch.
+        Return list (name, distance) per wajah; name None kalau tidak ada yang < tolerance.
+        """
+        q = self._as_queries(queries)
+        if self.index is None:
+            return [(None, float("inf")) for _ in range(len(q))]
+        if len(q) == 0:
+            return []
+        # sample terdekat secara global = orang dengan jarak terbaik
+        idx, d2 = self.index.search(q)
+        best_dist = np.sqrt(d2)
+        return [(self.people[self.label_ids[i]] if d < tolerance else None, float(d))
+                for i, d in zip(idx, best_dist)]
@@ -0,0 +1,258 @@
+"""
+Instrumentasi ringan untuk kiosk: counter, gauge, histogram bucket tetap.
+
+Semua waktu diukur dengan time.perf_counter() (monotonic) dan disimpan
+dalam detik. Metrics bisa diambil lewat HTTP lokal (format teks Prometheus
+di /metrics, JSON di /metrics.json) atau di-dump periodik ke file JSON.
+
+    stage = registry.histogram("absensi_stage_seconds", "durasi per stage", labels=("stage",))
+    with stage.time(stage="detect"):
+        ...
+"""
+import bisect
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# 0.5 ms .. 5 s, cukup untuk resize (sub-ms) sampai deteksi HOG di Pi (ratusan ms)
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+
+def _label_str(names, values):
+    if not names:
+        return ""
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, values)) + "}"
+
+
+class Counter:
+    kind = "counter"
+
+    def __init__(self, name, help="", labels=()):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self):
+        with self._lock:
+            return [(self.name, key, v) for key, v in self._values.items()]
+
+
+class Gauge:
+    """Nilai sesaat; `fn` dipanggil saat scrape (0 biaya di jalur frame)."""
+    kind = "gauge"
+
+    def __init__(self, name, help="", fn=None):
+        self.name, self.help, self.labels = name, help, ()
+        self.fn = fn
+        self.value = 0.0
+
+    def set(self, value):
+        self.value = value
+
+    def samples(self):
+        value = self.value
+        if self.fn is not None:
+            try:
+                value = self.fn()
+            except Exception:
+                value = float("nan")
+        return [(self.name, (), value)]
+
+
+class Histogram:
+    kind = "histogram"
+
+    def __init__(self, name, help="", labels=(), buckets=DEFAULT_BUCKETS):
+        self.name, self.help, self.labels = name, help, tuple(labels)
+        self.buckets = tuple(buckets)
+        self._series = {}    # label values -> [counts per bucket (+Inf terakhir), sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, seconds, **labels):
+        key = tuple(labels.get(n, "") for n in self.labels)
+        i = bisect.bisect_left(self.buckets, seconds)
+        with self._lock:
+            s = self._series.get(key)
+            if s is None:
+                s = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            s[0][i] += 1
+            s[1] += seconds
+            s[2] += 1
+
+    def time(self, **labels):
+        return _Timer(self, labels)
+
+    def snapshot(self):
+        with self._lock:
+            return {key: (list(s[0]), s[1], s[2]) for key, s in self._series.items()}
+
+    def quantile(self, q, **labels):
+        """Perkiraan kuantil dari bucket (batas atas bucket)."""
+        key = tuple(labels.get(n, "") for n in self.labels)
+        snap = self.snapshot().get(key)
+        if not snap or snap[2] == 0:
+            return None
+        target, acc = q * snap[2], 0
+        for bound, n in zip(self.buckets + (float("inf"),), snap[0]):
+            acc += n
+            if acc >= target:
+                return bound
+        return float("inf")
+
+
+class _Timer:
+    """`with hist.time(stage=...)`: kelas biasa, lebih murah dari @contextmanager."""
+    __slots__ = ("hist", "labels", "t")
+
+    def __init__(self, hist, labels):
+        self.hist, self.labels = hist, labels
+
+    def __enter__(self):
+        self.t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t, **self.labels)
+        return False
+
+
+class Registry:
+    def __init__(self):
+        self.metrics = []
+
+    def _add(self, metric):
+        self.metrics.append(metric)
+        return metric
+
+    def counter(self, name, help="", labels=()):
+        return self._add(Counter(name, help, labels))
+
+    def gauge(self, name, help="", fn=None):
+        return self._add(Gauge(name, help, fn))
+
+    def histogram(self, name, help="", labels=(), buckets=DEFAULT_BUCKETS):
+        return self._add(Histogram(name, help, labels, buckets))
+
+    # ----------------- export -----------------
+    def render_prometheus(self):
+        lines = []
+        for m in self.metrics:
+            lines.append(f"# HELP {m.name} {m.help}")
+            lines.append(f"# TYPE {m.name} {m.kind}")
+            if m.kind != "histogram":
+                for name, key, value in m.samples():
+                    lines.append(f"{name}{_label_str(m.labels, key)} {value}")
+                continue
+            for key, (counts, total, count) in m.snapshot().items():
+                acc = 0
+                for bound, n in zip(m.buckets + (float("inf"),), counts):
+                    acc += n
+                    le = "+Inf" if bound == float("inf") else repr(bound)
+                    lines.append(f"{m.name}_bucket{_label_str(m.labels + ('le',), key + (le,))} {acc}")
+                lines.append(f"{m.name}_sum{_label_str(m.labels, key)} {total}")
+                lines.append(f"{m.name}_count{_label_str(m.labels, key)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        out = {"ts": time.time()}
+        for m in self.metrics:
+            if m.kind != "histogram":
+                out[m.name] = {",".join(key) or "_": value for _, key, value in m.samples()}
+                continue
+            series = {}
+            for key, (counts, total, count) in m.snapshot().items():
+                labels = dict(zip(m.labels, key))
+                series[",".join(key) or "_"] = {
+                    "count": count,
+                    "mean_ms": total / count * 1000 if count else None,
+                    "p50_ms": _ms(m.quantile(0.5, **labels)),
+                    "p95_ms": _ms(m.quantile(0.95, **labels)),
+                    "p99_ms": _ms(m.quantile(0.99, **labels)),
+                }
+            out[m.name] = series
+        return out
+
+
+def _ms(v):
+    return None if v is None or v == float("inf") else v * 1000
+
+
+# ----------------- exporters -----------------
+class MetricsServer:
+    """HTTP lokal: GET /metrics (Prometheus text) dan /metrics.json."""
+
+    def __init__(self, registry, port=9108, host="127.0.0.1"):
+        reg = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path == "/metrics":
+                    body, ctype = reg.render_prometheus().encode(), "text/plain; version=0.0.4"
+                elif self.path == "/metrics.json":
+                    body, ctype = json.dumps(reg.to_dict(), default=str).encode(), "application/json"
+                else:
+                    self.send_error(404)
+                    return
+                self.send_response(200)
+                self.send_header("Content-Type", ctype)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="metrics-http", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class JsonDumper:
+    """Tulis registry.to_dict() ke file setiap `interval` detik (atomic rename)."""
+
+    def __init__(self, registry, path, interval=10.0):
+        self.registry = registry
+        self.path = path
+        self.interval = interval
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name="metrics-dump", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.dump()
+
+    def dump(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w") as f:
+            json.dump(self.registry.to_dict(), f, indent=1, default=str)
+        os.replace(tmp, self.path)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            try:
+                self.dump()
+            except OSError as e:
+                print("❌ [metrics] dump gagal:", e)
@@ -0,0 +1,84 @@
+import threading
+import time
+from collections import namedtuple
+
+# hasil recognition yang dipublish ke UI loop (box dalam koordinat frame kecil,
+# `scale` = skala frame kecil terhadap frame kamera). boxes/names/distances berisi
+# semua wajah yang teridentifikasi, urut confidence.
+# detect_seq/detect_ts/faces menyangkut deteksi terakhir, jadi UI tetap melihatnya
+# walaupun hasil frame tracking sesudahnya sudah menimpa `result`.
+RecognitionResult = namedtuple(
+    "RecognitionResult",
+    "frame_id frame_ts done_ts detect_seq detect_ts faces boxes names distances scale",
+    defaults=(1.0,),
+)
+
+
+class RecognitionWorker:
+    """
+    Thread recognition dengan semantik "latest frame": UI loop cukup submit()
+    setiap frame tanpa menunggu; kalau worker masih sibuk, frame lama yang
+    belum diproses ditimpa (dropped). Hasil terakhir dibaca lewat latest(),
+    juga tanpa blocking. dlib/OpenCV melepas GIL saat detect/encode, jadi
+    UI tetap jalan di thread utama.
+
+    `process(frame, frame_id, frame_ts)` dijalankan di thread worker dan
+    return RecognitionResult (atau None kalau tidak ada yang perlu dipublish).
+    """
+
+    def __init__(self, process, name="recog"):
+        self.process = process
+        self.name = name
+        self._cond = threading.Condition()
+        self._pending = None
+        self._next_id = 0
+        self._running = False
+        self._thread = None
+        self.result = None
+        self.stats = {"submitted": 0, "processed": 0, "dropped": 0, "errors": 0}
+
+    def start(self):
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._cond.notify()
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+
+    def submit(self, frame, frame_ts=None, frame_id=None):
+        """Taruh frame terbaru untuk worker. Tidak pernah blocking.
+        `frame_id` boleh diisi sequence dari FrameRing (default: nomor urut submit)."""
+        with self._cond:
+            if self._pending is not None:
+                self.stats["dropped"] += 1
+            self._next_id = self._next_id + 1 if frame_id is None else frame_id
+            self._pending = (frame, self._next_id, time.perf_counter() if frame_ts is None else frame_ts)
+            self.stats["submitted"] += 1
+            self._cond.notify()
+        return self._next_id
+
+    def latest(self):
+        return self.result
+
+    def _run(self):
+        while True:
+            with self._cond:
+                while self._running and self._pending is None:
+                    self._cond.wait()
+                if not self._running:
+                    return
+                job, self._pending = self._pending, None
+            try:
+                res = self.process(*job)
+            except Exception as e:
+                self.stats["errors"] += 1
+                print(f"❌ [{self.name}] recognition error:", e)
+                continue
+            if res is not None:
+                self.result = res
+            self.stats["processed"] += 1
@@ -0,0 +1,285 @@
+"""
+Laporan absensi dari tabel agregat (migrasi v4 db_writer.py).
+
+agg_harian / agg_bulanan / agg_tanggal di-update trigger di setiap insert
+absensi, jadi laporan tidak perlu scan tabel absensi mentah: rentang tanggal
+dipecah jadi bulan penuh (agg_bulanan, satu baris per orang per bulan) +
+sisa hari di ujung rentang (agg_harian). Instansi diambil dari users.json
+saat query, jadi edit users.json langsung berlaku tanpa rebuild.
+
+Export rentang besar di-stream per batch (fetchmany -> csv.writer), memory
+tetap kecil berapa pun jumlah barisnya. `--format parquet` butuh pyarrow
+(opsional, ditulis per row group).
+
+    python3 report.py orang RAKA --dari 2026-01-01 --sampai 2026-06-30
+    python3 report.py instansi --dari 2026-09-01 --sampai 2026-09-30
+    python3 report.py tanggal --dari 2026-09-01 --sampai 2026-09-30
+    python3 report.py export --dari 2021-01-01 --sampai 2025-12-31 --out absensi.csv.gz
+    python3 report.py export --instansi "Telkom" --out telkom.parquet --format parquet
+    python3 report.py rebuild
+"""
+import argparse
+import csv
+import gzip
+import json
+import sys
+import time
+from datetime import date, timedelta
+from pathlib import Path
+
+from db_writer import AGG_BACKFILL, connect, migrate
+
+DB_PATH = "/home/telkom/absensi/data.db"
+USERS_FILE = "/home/telkom/absensi/users.json"
+EXPORT_BATCH = 5000
+EXPORT_COLUMNS = ("date", "time", "nama", "instansi", "status_user", "mode", "status")
+FIELDS = ("hadir", "terlambat", "pulang", "pulang_awal")
+
+
+def _month_start(d):
+    return d.replace(day=1)
+
+
+def _next_month(d):
+    return (d.replace(day=28) + timedelta(days=4)).replace(day=1)
+
+
+def split_range(start, end):
+    """
+    [start, end] (ISO date, inklusif) -> ((bulan_awal, bulan_akhir) | None, [(dari, sampai), ...]).
+    Bulan yang seluruh harinya di dalam rentang dibaca dari agg_bulanan, sisanya dari agg_harian.
+    """
+    s, e = date.fromisoformat(start), date.fromisoformat(end)
+    if s > e:
+        return None, []
+    m0 = s if s.day == 1 else _next_month(s)
+    m1 = _month_start(e + timedelta(days=1))    # bulan penuh = [m0, m1)
+    if m0 >= m1:
+        return None, [(start, end)]
+    edges = []
+    if s < m0:
+        edges.append((start, (m0 - timedelta(days=1)).isoformat()))
+    if m1 <= e:
+        edges.append((m1.isoformat(), end))
+    return (m0.strftime("%Y-%m"), (m1 - timedelta(days=1)).strftime("%Y-%m")), edges
+
+
+def load_users(path):
+    if not path or not Path(path).exists():
+        return {}
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+class AttendanceReport:
+    """Query laporan di atas agregat. Satu koneksi read (WAL: tidak memblokir kiosk yang sedang menulis)."""
+
+    def __init__(self, db_path, users_file=None):
+        self.conn = connect(db_path)
+        migrate(self.conn)    # DB lama: agregat di-backfill sekali di sini
+        self.users = load_users(users_file)
+
+    def close(self):
+        self.conn.close()
+
+    def user_id(self, name):
+        row = self.conn.execute("SELECT id FROM users WHERE nama = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def _totals_sql(self, start, end, user_id=None, by_month=False):
+        months, edges = split_range(start, end)
+        where_user = " AND user_id = ?" if user_id is not None else ""
+        parts, params = [], []
+        if months:
+            parts.append("SELECT user_id, month, masuk, terlambat, pulang, pulang_awal FROM agg_bulanan "
+                         "WHERE month BETWEEN ? AND ?" + where_user)
+            params += [*months] + ([user_id] if user_id is not None else [])
+        for a, b in edges:
+            parts.append("SELECT user_id, substr(date, 1, 7), masuk IS NOT NULL, terlambat, pulang IS NOT NULL, "
+                         "pulang_awal FROM agg_harian WHERE date BETWEEN ? AND ?" + where_user)
+            params += [a, b] + ([user_id] if user_id is not None else [])
+        if not parts:
+            return None, []
+        key = "user_id, month" if by_month else "user_id"
+        return (f"SELECT {key}, SUM(masuk), SUM(terlambat), SUM(pulang), SUM(pulang_awal) "
+                f"FROM ({' UNION ALL '.join(parts)}) GROUP BY {key} ORDER BY {key}"), params
+
+    def _totals(self, start, end, user_id=None, by_month=False):
+        sql, params = self._totals_sql(start, end, user_id, by_month)
+        return self.conn.execute(sql, params).fetchall() if sql else []
+
+    def person(self, name, start, end):
+        """Rekap satu orang: {"total": {...}, "bulan": {"YYYY-MM": {...}}}, None kalau nama tidak ada."""
+        uid = self.user_id(name)
+        if uid is None:
+            return None
+        months = {r[1]: dict(zip(FIELDS, r[2:])) for r in self._totals(start, end, uid, by_month=True)}
+        total = {f: sum(m[f] for m in months.values()) for f in FIELDS}
+        return {"total": total, "bulan": months}
+
+    def active_days(self, start, end):
+        """Jumlah hari dengan minimal satu absensi MASUK (penyebut persentase kehadiran)."""
+        return self.conn.execute("SELECT COUNT(*) FROM agg_tanggal WHERE date BETWEEN ? AND ? AND masuk > 0",
+                                 (start, end)).fetchone()[0]
+
+    def institutions(self, start, end):
+        """Rekap per instansi (users.json). Nama yang tidak ada di users.json masuk instansi "-"."""
+        names = dict(self.conn.execute("SELECT id, nama FROM users"))
+        days = self.active_days(start, end)
+        out = {}
+        for info in self.users.values():
+            inst = info.get("instansi", "-")
+            if inst not in out:
+                out[inst] = [0, 0, 0, 0, 0, 0]    # anggota, orang_hadir, FIELDS...
+            out[inst][0] += 1
+        for uid, hadir, terlambat, pulang, pulang_awal in self._totals(start, end):
+            inst = self.users.get(names.get(uid), {}).get("instansi", "-")
+            row = out.get(inst)
+            if row is None:
+                row = out[inst] = [0, 0, 0, 0, 0, 0]
+            row[1] += hadir > 0
+            row[2] += hadir
+            row[3] += terlambat
+            row[4] += pulang
+            row[5] += pulang_awal
+        result = {}
+        for inst, (anggota, orang_hadir, *vals) in out.items():
+            slots = max(anggota, orang_hadir) * days
+            result[inst] = {"anggota": anggota, "orang_hadir": orang_hadir, **dict(zip(FIELDS, vals)),
+                            "kehadiran": vals[0] / slots if slots else 0.0}
+        return result
+
+    def daily(self, start, end):
+        return self.conn.execute("SELECT date, masuk, terlambat, pulang, pulang_awal FROM agg_tanggal "
+                                 "WHERE date BETWEEN ? AND ? ORDER BY date", (start, end)).fetchall()
+
+    def iter_rows(self, start, end, name=None, instansi=None, batch=EXPORT_BATCH):
+        """Baris absensi mentah (urut date, id lewat idx_absensi_date) per batch, sebagai list of tuple."""
+        sql = "SELECT date, time, nama, mode, status FROM absensi WHERE date BETWEEN ? AND ?"
+        params = [start, end]
+        if name:
+            sql += " AND user_id = (SELECT id FROM users WHERE nama = ?)"
+            params.append(name)
+        cur = self.conn.execute(sql + " ORDER BY date, id", params)
+        while True:
+            rows = cur.fetchmany(batch)
+            if not rows:
+                return
+            out = []
+            for d, t, nama, mode, status in rows:
+                info = self.users.get(nama, {})
+                inst = info.get("instansi", "-")
+                if instansi is None or inst == instansi:
+                    out.append((d, t, nama, inst, info.get("status", "-"), mode, status))
+            if out:
+                yield out
+
+    def export_csv(self, out, start, end, **filters):
+        """Tulis CSV (gzip kalau nama file .gz, "-" = stdout). Return jumlah baris."""
+        if out == "-":
+            f = sys.stdout
+        elif out.endswith(".gz"):
+            f = gzip.open(out, "wt", newline="", compresslevel=6)
+        else:
+            f = open(out, "w", newline="")
+        n = 0
+        try:
+            w = csv.writer(f)
+            w.writerow(EXPORT_COLUMNS)
+            for rows in self.iter_rows(start, end, **filters):
+                w.writerows(rows)
+                n += len(rows)
+        finally:
+            if f is not sys.stdout:
+                f.close()
+        return n
+
+    def export_parquet(self, out, start, end, **filters):
+        """Parquet per row group (satu batch = satu row group). Butuh pyarrow."""
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("pyarrow tidak terpasang (pip3 install pyarrow), pakai --format csv")
+        schema = pa.schema([(c, pa.string()) for c in EXPORT_COLUMNS])
+        n = 0
+        with pq.ParquetWriter(out, schema, compression="zstd") as writer:
+            for rows in self.iter_rows(start, end, **filters):
+                cols = list(zip(*rows))
+                writer.write_table(pa.table({c: list(v) for c, v in zip(EXPORT_COLUMNS, cols)}, schema=schema))
+                n += len(rows)
+        return n
+
+    def rebuild(self):
+        """Hitung ulang semua agregat dari absensi (mis. setelah edit manual tabel absensi)."""
+        self.conn.executescript("BEGIN;\nDELETE FROM agg_harian;\nDELETE FROM agg_bulanan;\n"
+                                f"DELETE FROM agg_tanggal;\n{AGG_BACKFILL}\nCOMMIT;")
+
+
+def _fmt(row):
+    return " | ".join(f"{f} {row[f]:>6}" for f in FIELDS)
+
+
+def main():
+    today = date.today()
+    ap = argparse.ArgumentParser(description="Laporan absensi dari tabel agregat")
+    ap.add_argument("--db", default=DB_PATH)
+    ap.add_argument("--users", default=USERS_FILE)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    def ranged(p):
+        p.add_argument("--dari", default=_month_start(today).isoformat())
+        p.add_argument("--sampai", default=today.isoformat())
+        return p
+
+    ranged(sub.add_parser("orang", help="rekap satu orang per bulan")).add_argument("nama")
+    ranged(sub.add_parser("instansi", help="rekap per instansi (users.json)"))
+    ranged(sub.add_parser("tanggal", help="total semua orang per hari"))
+    ex = ranged(sub.add_parser("export", help="export baris absensi (streaming)"))
+    ex.add_argument("--out", default="-", help='file .csv / .csv.gz / .parquet, "-" = stdout')
+    ex.add_argument("--format", choices=("csv", "parquet"), default=None)
+    ex.add_argument("--nama", default=None)
+    ex.add_argument("--instansi", default=None)
+    sub.add_parser("rebuild", help="hitung ulang agregat dari tabel absensi")
+    args = ap.parse_args()
+
+    report = AttendanceReport(args.db, args.users)
+    t = time.perf_counter()
+    try:
+        if args.cmd == "orang":
+            res = report.person(args.nama, args.dari, args.sampai)
+            if res is None:
+                print(f"❌ {args.nama} belum pernah absen")
+                sys.exit(1)
+            for month, row in res["bulan"].items():
+                print(f"{month} | {_fmt(row)}")
+            print(f"{'total':>7} | {_fmt(res['total'])}")
+        elif args.cmd == "instansi":
+            rows = report.institutions(args.dari, args.sampai)
+            print(f"{args.dari} s/d {args.sampai}, {report.active_days(args.dari, args.sampai)} hari aktif")
+            for inst, row in sorted(rows.items(), key=lambda kv: -kv[1]["hadir"]):
+                print(f"{inst[:40]:<40} | anggota {row['anggota']:>5} | orang hadir {row['orang_hadir']:>5} "
+                      f"| {_fmt(row)} | kehadiran {row['kehadiran']:6.1%}")
+        elif args.cmd == "tanggal":
+            for d, *vals in report.daily(args.dari, args.sampai):
+                print(f"{d} | {_fmt(dict(zip(FIELDS, vals)))}")
+        elif args.cmd == "export":
+            fmt = args.format or ("parquet" if args.out.endswith(".parquet") else "csv")
+            export = report.export_parquet if fmt == "parquet" else report.export_csv
+            try:
+                n = export(args.out, args.dari, args.sampai, name=args.nama, instansi=args.instansi)
+            except RuntimeError as e:
+                print(f"❌ {e}")
+                sys.exit(1)
+            print(f"[report] {n} baris -> {args.out}", file=sys.stderr)
+        elif args.cmd == "rebuild":
+            report.rebuild()
+            n = report.conn.execute("SELECT COUNT(*) FROM agg_harian").fetchone()[0]
+            print(f"[report] agregat dihitung ulang: {n} baris harian")
+    finally:
+        report.close()
+    print(f"[report] {(time.perf_counter() - t) * 1000:.0f} ms", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+RECOG_STAGES = ("detect", "encode", "match")
+
+
+class RecognitionScheduler:
+    """
+    Pengganti RECOG_EVERY_N_FRAMES / PROCESS_SCALE yang fixed.
+
+    Waktu tiap stage (resize, detect, encode, match, draw, ...) diukur dengan
+    EWMA. Setiap `adjust_sec` cadence recognition (every_n) dan skala deteksi
+    disesuaikan supaya:
+      - estimasi latency identifikasi (every_n * frame_ms + recog_ms) <= target
+      - porsi waktu loop yang dipakai recognition <= cpu_budget
+    Tombol MODE ditekan -> boost (sampling cepat) selama beberapa detik;
+    tidak ada wajah lama (NO_FACE_TIMER naik) -> back off.
+    """
+
+    def __init__(self, every_n=6, scale=0.25, min_every=2, max_every=15,
+                 min_scale=0.2, max_scale=0.35, scale_step=0.05,
+                 target_latency_ms=400.0, cpu_budget=0.5,
+                 adjust_sec=0.5, alpha=0.2, clock=time.perf_counter):
+        self.every_n = every_n
+        self.scale = scale
+        self.min_every, self.max_every = min_every, max_every
+        self.min_scale, self.max_scale = min_scale, max_scale
+        self.scale_step = scale_step
+        self.target_latency_ms = target_latency_ms
+        self.cpu_budget = cpu_budget
+        self.adjust_sec = adjust_sec
+        self.alpha = alpha
+        self.clock = clock
+
+        self.stage_ms = {}
+        self.frame_ms = None
+        self.recog_ms = None
+        self.mode = "normal"          # normal / boost / idle
+        self.boost_until = 0.0
+        self.idle = False
+        self.decisions = deque(maxlen=50)
+        self.observer = None          # callable(stage, detik), mis. histogram metrics
+        self._since_recog = 0
+        self._frame_start = None
+        self._frame_recog_ms = 0.0
+        self._last_adjust = clock()
+
+    # ----------------- measurement -----------------
+    def _ewma(self, old, new):
+        return new if old is None else old + self.alpha * (new - old)
+
+    def record(self, stage, seconds):
+        ms = seconds * 1000
+        self.stage_ms[stage] = self._ewma(self.stage_ms.get(stage), ms)
+        if stage in RECOG_STAGES:
+            self._frame_recog_ms += ms
+        if self.observer is not None:
+            self.observer(stage, seconds)
+
+    @contextmanager
+    def stage(self, name):
+        t = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - t)
+
+    # ----------------- per-frame API -----------------
+    def should_run(self):
+        """Dipanggil sekali di awal tiap frame: True kalau frame ini perlu detect + recognize."""
+        now = self.clock()
+        if self._frame_start is not None:
+            # frame_ms = jarak antar frame tanpa recognition (termasuk menunggu kamera)
+            if self._frame_recog_ms > 0:
+                self.recog_ms = self._ewma(self.recog_ms, self._frame_recog_ms)
+            else:
+                self.frame_ms = self._ewma(self.frame_ms, (now - self._frame_start) * 1000)
+        self._frame_start = now
+        self._frame_recog_ms = 0.0
+        self._since_recog += 1
+        if self._since_recog >= self.current_every():
+            self._since_recog = 0
+            return True
+        return False
+
+    def end_frame(self):
+        """Dipanggil di akhir tiap frame; (kadang) ubah setting."""
+        now = self.clock()
+        if now - self._last_adjust >= self.adjust_sec:
+            self._last_adjust = now
+            self._adjust(now)
+
+    def boost(self, seconds=3.0):
+        """User baru tekan tombol MASUK/PULANG: sampling secepat mungkin."""
+        self.boost_until = self.clock() + seconds
+        self._since_recog = self.min_every    # recognition langsung di frame berikutnya
+
+    def set_idle(self, idle):
+        self.idle = idle
+
+    def current_every(self):
+        if self.clock() < self.boost_until:
+            return self.min_every
+        if self.idle:
+            return self.max_every
+        return self.every_n
+
+    # ----------------- adaptation -----------------
+    def predict(self, every=None, scale=None):
+        """Estimasi (latency ms, porsi cpu recognition) untuk setting lain.
+        Biaya deteksi dianggap sebanding dengan luas frame kecil (scale^2)."""
+        every = self.every_n if every is None else every
+        scale = self.scale if scale is None else scale
+        frame_ms = self.frame_ms or 0.0
+        recog_ms = (self.recog_ms or 0.0) * (scale / self.scale) ** 2
+        latency = every * frame_ms + recog_ms
+        cycle = every * frame_ms + recog_ms
+        share = recog_ms / cycle if cycle > 0 else 0.0
+        return latency, share
+
+    def estimates(self):
+        return self.predict()
+
+    def _ok(self, every=None, scale=None, margin=1.0):
+        latency, share = self.predict(every, scale)
+        return latency <= margin * self.target_latency_ms and share <= margin * self.cpu_budget
+
+    def _decide(self, what, old, new, reason):
+        self.decisions.append({"t": self.clock(), "what": what, "from": old, "to": new, "reason": reason})
+        print(f"[SCHED] {what} {old} -> {new} ({reason})")
+        setattr(self, what, new)
+
+    def _adjust(self, now):
+        self.mode = "boost" if now < self.boost_until else ("idle" if self.idle else "normal")
+        if self.mode != "normal" or self.frame_ms is None or self.recog_ms is None:
+            return
+        latency, share = self.estimates()
+        over_cpu = share > self.cpu_budget
+        over_lat = latency > self.target_latency_ms
+        smaller = round(max(self.min_scale, self.scale - self.scale_step), 3)
+        larger = round(min(self.max_scale, self.scale + self.scale_step), 3)
+        why = f"latency {latency:.0f}ms, cpu {share:.0%}"
+
+        if over_cpu and over_lat:
+            # dua target tidak bisa dipenuhi di skala ini: deteksi dibuat lebih murah
+            if smaller < self.scale:
+                self._decide("scale", self.scale, smaller, f"{why}: dua-duanya lewat target")
+            elif self.every_n < self.max_every:
+                self._decide("every_n", self.every_n, self.every_n + 1, f"{why}: cpu diprioritaskan")
+        elif over_cpu:
+            if self.every_n < self.max_every and self.predict(self.every_n + 1)[0] <= self.target_latency_ms:
+                self._decide("every_n", self.every_n, self.every_n + 1, f"{why}: cpu > {self.cpu_budget:.0%}")
+            elif smaller < self.scale:
+                self._decide("scale", self.scale, smaller, f"{why}: cpu > {self.cpu_budget:.0%}")
+            elif self.every_n < self.max_every:
+                self._decide("every_n", self.every_n, self.every_n + 1, f"{why}: cpu > {self.cpu_budget:.0%}")
+        elif over_lat:
+            if self.every_n > self.min_every and self.predict(self.every_n - 1)[1] <= self.cpu_budget:
+                self._decide("every_n", self.every_n, self.every_n - 1,
+                             f"{why}: latency > {self.target_latency_ms:.0f}ms")
+            elif smaller < self.scale:
+                self._decide("scale", self.scale, smaller, f"{why}: latency > {self.target_latency_ms:.0f}ms")
+        elif larger > self.scale and self._ok(scale=larger, margin=0.8):
+            # masih longgar: naikkan skala deteksi (wajah lebih jauh tetap terdeteksi)
+            self._decide("scale", self.scale, larger, f"{why}: longgar")
+        elif self.every_n > self.min_every and self._ok(every=self.every_n - 1, margin=0.8):
+            self._decide("every_n", self.every_n, self.every_n - 1, f"{why}: longgar")
+
+    # ----------------- stats API -----------------
+    def stats(self):
+        latency, share = self.estimates()
+        return {
+            "mode": self.mode,
+            "every_n": self.current_every(),
+            "base_every_n": self.every_n,
+            "scale": self.scale,
+            "frame_ms": self.frame_ms,
+            "recog_ms": self.recog_ms,
+            "est_identify_ms": latency,
+            "recog_cpu_share": share,
+            "stage_ms": dict(self.stage_ms),
+            "decisions": list(self.decisions)[-10:],
+        }
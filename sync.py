@@ -0,0 +1,215 @@
+"""
+Sync offline-first antar kiosk.
+
+Setiap kiosk menulis ke data.db lokal seperti biasa; trigger migrasi v3
+(db_writer.py) menambahkan setiap baris absensi baru ke tabel `outbox`
+dengan seq monotonic. SyncClient mengirim outbox yang belum di-ack ke
+aggregation service (sync_server.py) dalam batch JSON terkompresi zlib,
+lalu menerima balik absensi kiosk lain untuk hari ini (remote_ledger), jadi
+cek "sudah absen" berlaku lintas pintu masuk.
+
+Server mati / jaringan putus tidak mengganggu kiosk: baris tetap di outbox
+dan dikirim berurutan begitu server terjangkau lagi (catch-up, batch
+berturut-turut tanpa menunggu interval). Server dedup per (nama, date, mode)
+dan mengabaikan seq yang sudah di-ack, jadi kirim ulang aman.
+
+    SyncClient(DB_PATH, "pintu-utara", "http://10.0.0.5:9200").start()
+    SyncClient(DB_PATH, "pintu-utara", "unix:/run/absensi-sync.sock").start()
+"""
+import http.client
+import json
+import socket
+import threading
+import time
+import zlib
+from datetime import date
+from urllib.parse import urlsplit
+
+from db_writer import connect, migrate
+
+SYNC_PATH = "/sync"
+
+
+def encode(obj):
+    return zlib.compress(json.dumps(obj, separators=(",", ":")).encode(), 6)
+
+
+def decode(body):
+    return json.loads(zlib.decompress(body))
+
+
+class UnixHTTPConnection(http.client.HTTPConnection):
+    """HTTP di atas Unix domain socket (aggregation service di mesin yang sama)."""
+
+    def __init__(self, socket_path, timeout=10.0):
+        super().__init__("localhost", timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+def open_connection(url, timeout=10.0):
+    """`http://host:port` atau `unix:/path/socket`."""
+    if url.startswith("unix:"):
+        return UnixHTTPConnection(url[len("unix:"):], timeout)
+    parts = urlsplit(url)
+    return http.client.HTTPConnection(parts.hostname, parts.port or 80, timeout=timeout)
+
+
+class SyncClient:
+    """
+    Thread sync satu kiosk. Setiap `interval` detik (atau langsung lagi kalau
+    masih ada backlog) satu round trip: kirim <= `batch` baris outbox setelah
+    seq yang sudah di-ack, terima ack + absensi kiosk lain sejak cursor ledger.
+    Ack & cursor disimpan di tabel sync_state, jadi restart melanjutkan dari
+    posisi terakhir. Gagal konek -> backoff eksponensial sampai `max_backoff`.
+    remote_ledger hanya menyimpan tanggal >= today(): baris hari lalu dihapus
+    di transaksi yang sama dengan merge ledger.
+
+    `on_ledger(entries)` dipanggil dengan list (nama, date, mode) dari kiosk
+    lain, mis. AttendanceWriter.mark_remote.
+    """
+
+    def __init__(self, db_path, kiosk, url, interval=2.0, batch=500, timeout=10.0,
+                 max_backoff=60.0, on_ledger=None, today=None, name="sync"):
+        self.db_path = db_path
+        self.kiosk = kiosk
+        self.url = url
+        self.interval = interval
+        self.batch = batch
+        self.timeout = timeout
+        self.max_backoff = max_backoff
+        self.on_ledger = on_ledger
+        self.today = today or (lambda: date.today().isoformat())
+        self.name = name
+        self.online = None
+        self.stats = {"pushed": 0, "round_trips": 0, "bytes_sent": 0, "bytes_raw": 0,
+                      "ledger": 0, "ledger_pruned": 0, "errors": 0, "backlog": 0, "last_ok": None}
+        self._http = None
+        self._conn = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+        conn = connect(db_path)
+        migrate(conn)    # outbox & sync_state ada sebelum writer pertama jalan
+        conn.close()
+
+    # ----------------- state lokal -----------------
+    def _db(self):
+        if self._conn is None:
+            self._conn = connect(self.db_path)
+        return self._conn
+
+    def _get(self, key):
+        row = self._db().execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else 0
+
+    def backlog(self):
+        last = self._db().execute("SELECT COALESCE(MAX(seq), 0) FROM outbox").fetchone()[0]
+        return last - self._get("acked")
+
+    # ----------------- transport -----------------
+    def _post(self, payload):
+        body = encode(payload)
+        for attempt in range(2):
+            if self._http is None:
+                self._http = open_connection(self.url, self.timeout)
+            try:
+                self._http.request("POST", SYNC_PATH, body, {"Content-Type": "application/json",
+                                                             "Content-Encoding": "deflate",
+                                                             "X-Kiosk": self.kiosk})
+                resp = self._http.getresponse()
+                data = resp.read()
+            except (OSError, http.client.HTTPException):
+                # koneksi keep-alive lama ditutup server: sekali coba ulang dengan koneksi baru
+                self._http.close()
+                self._http = None
+                if attempt:
+                    raise
+                continue
+            if resp.status != 200:
+                raise http.client.HTTPException(f"HTTP {resp.status}: {data[:200]!r}")
+            self.stats["bytes_sent"] += len(body)
+            return decode(data)
+
+    # ----------------- satu round trip -----------------
+    def sync_once(self):
+        """Kirim satu batch & ambil ledger. Return True kalau masih ada sisa (outbox / ledger)."""
+        conn = self._db()
+        acked, cursor, today = self._get("acked"), self._get("ledger_cursor"), self.today()
+        rows = conn.execute("SELECT seq, nama, date, time, mode, status FROM outbox "
+                            "WHERE seq > ? ORDER BY seq LIMIT ?", (acked, self.batch)).fetchall()
+        payload = {"kiosk": self.kiosk, "rows": rows, "ledger_since": cursor, "ledger_from": today}
+        self.stats["bytes_raw"] += len(json.dumps(payload, separators=(",", ":")))
+        resp = self._post(payload)
+
+        entries = [tuple(e[:3]) for e in resp["ledger"]]
+        with conn:
+            conn.executemany("INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                             [("acked", max(acked, resp["acked"])), ("ledger_cursor", resp["ledger_cursor"])])
+            conn.executemany("INSERT OR IGNORE INTO remote_ledger (nama, date, mode, kiosk) VALUES (?, ?, ?, ?)",
+                             [tuple(e) for e in resp["ledger"]])
+            # server hanya mengirim ledger >= ledger_from, jadi baris hari lalu tidak terpakai lagi
+            pruned = conn.execute("DELETE FROM remote_ledger WHERE date < ?", (today,)).rowcount
+        self.stats["pushed"] += len(rows)
+        self.stats["round_trips"] += 1
+        self.stats["ledger"] += len(entries)
+        self.stats["ledger_pruned"] += pruned
+        self.stats["last_ok"] = time.time()
+        self.stats["backlog"] = self.backlog()
+        if entries and self.on_ledger is not None:
+            self.on_ledger(entries)
+        return len(rows) == self.batch or resp["more"]
+
+    def catch_up(self):
+        """Sync sampai outbox & ledger habis (blocking). Return jumlah round trip."""
+        n = 1
+        while self.sync_once():
+            n += 1
+        return n
+
+    # ----------------- thread -----------------
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.timeout + 1.0)
+
+    def _run(self):
+        backoff = self.interval
+        try:
+            while not self._stop.is_set():
+                try:
+                    more = self.sync_once()
+                except (OSError, http.client.HTTPException, ValueError, KeyError) as e:
+                    self.stats["errors"] += 1
+                    if self.online is not False:
+                        self.stats["backlog"] = self.backlog()
+                        print(f"❌ [sync] {self.url} tidak terjangkau ({e}), "
+                              f"{self.stats['backlog']} baris menunggu di outbox")
+                    self.online = False
+                    backoff = min(backoff * 2, self.max_backoff)
+                    wait = backoff
+                else:
+                    if self.online is False:
+                        print(f"[sync] {self.url} terhubung lagi")
+                    self.online = True
+                    backoff = self.interval
+                    wait = 0 if more else self.interval
+                if wait:
+                    self._wake.wait(wait)
+                    self._wake.clear()
+        finally:
+            if self._http is not None:
+                self._http.close()
+            if self._conn is not None:
+                self._conn.close()
@@ -0,0 +1,200 @@
+"""
+Aggregation service absensi multi-kiosk.
+
+Menerima batch outbox dari setiap kiosk (sync.py), menyimpan ke satu DB
+pusat dengan dedup per (nama, date, mode), lalu membalas dengan ack dan
+absensi dari kiosk lain untuk hari itu (ledger lintas kiosk).
+
+Dedup: kalau orang yang sama tercatat di dua kiosk (mis. keduanya offline),
+yang dipakai adalah jam paling awal; baris yang dikirim ulang (seq <= ack
+kiosk itu) diabaikan.
+
+    python3 sync_server.py --db /home/telkom/absensi/pusat.db --port 9200
+    python3 sync_server.py --db pusat.db --unix /run/absensi-sync.sock
+    curl http://127.0.0.1:9200/status
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sync import SYNC_PATH, decode, encode
+
+SCHEMA = """
+    CREATE TABLE IF NOT EXISTS absensi (
+        gseq INTEGER PRIMARY KEY AUTOINCREMENT,
+        nama TEXT NOT NULL,
+        date TEXT NOT NULL,
+        time TEXT NOT NULL,
+        mode TEXT NOT NULL,
+        status TEXT NOT NULL,
+        kiosk TEXT NOT NULL,
+        kiosk_seq INTEGER NOT NULL,
+        UNIQUE (nama, date, mode)
+    );
+    CREATE INDEX IF NOT EXISTS idx_absensi_date ON absensi (date);
+    CREATE TABLE IF NOT EXISTS kiosks (
+        kiosk TEXT PRIMARY KEY,
+        acked INTEGER NOT NULL DEFAULT 0,
+        rows INTEGER NOT NULL DEFAULT 0,
+        duplicates INTEGER NOT NULL DEFAULT 0,
+        last_seen TEXT
+    );
+"""
+
+# jam paling awal menang; gseq tidak berubah (ledger cukup tahu baris itu ada)
+UPSERT_SQL = """
+    INSERT INTO absensi (nama, date, time, mode, status, kiosk, kiosk_seq)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT (nama, date, mode) DO UPDATE SET
+        time = excluded.time, status = excluded.status,
+        kiosk = excluded.kiosk, kiosk_seq = excluded.kiosk_seq
+    WHERE excluded.time < absensi.time
+"""
+
+
+class AggregationStore:
+    """DB pusat. Satu koneksi, satu transaksi per batch kiosk (diserialisasi lock)."""
+
+    def __init__(self, db_path, ledger_batch=5000):
+        self.ledger_batch = ledger_batch
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.lock = threading.Lock()
+        self.stats = {"batches": 0, "rows": 0, "inserted": 0, "duplicates": 0, "resent": 0}
+
+    def _max_gseq(self):
+        return self.conn.execute("SELECT COALESCE(MAX(gseq), 0) FROM absensi").fetchone()[0]
+
+    def apply(self, req):
+        kiosk, rows = req["kiosk"], req["rows"]
+        with self.lock, self.conn:
+            row = self.conn.execute("SELECT acked FROM kiosks WHERE kiosk = ?", (kiosk,)).fetchone()
+            acked = row[0] if row else 0
+            fresh = [r for r in rows if r[0] > acked]
+            before = self._max_gseq()
+            self.conn.executemany(UPSERT_SQL, [(*r[1:], kiosk, r[0]) for r in fresh])
+            # gseq AUTOINCREMENT selalu > gseq lama: baris baru = gseq > before
+            inserted = self.conn.execute("SELECT COUNT(*) FROM absensi WHERE gseq > ?", (before,)).fetchone()[0]
+            new_acked = max([acked] + [r[0] for r in rows])
+            self.conn.execute(
+                "INSERT INTO kiosks (kiosk, acked, rows, duplicates, last_seen) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (kiosk) DO UPDATE SET acked = excluded.acked, rows = rows + excluded.rows, "
+                "duplicates = duplicates + excluded.duplicates, last_seen = excluded.last_seen",
+                (kiosk, new_acked, inserted, len(fresh) - inserted, datetime.now().isoformat(timespec="seconds")))
+
+            # ledger: absensi kiosk lain sejak cursor, hanya tanggal >= ledger_from (hari ini di kiosk)
+            ledger = self.conn.execute(
+                "SELECT gseq, nama, date, mode, kiosk FROM absensi "
+                "WHERE gseq > ? AND date >= ? AND kiosk != ? ORDER BY gseq LIMIT ?",
+                (req.get("ledger_since", 0), req.get("ledger_from", ""), kiosk, self.ledger_batch)).fetchall()
+            more = len(ledger) == self.ledger_batch
+            cursor = ledger[-1][0] if more else self._max_gseq()
+
+        self.stats["batches"] += 1
+        self.stats["rows"] += len(rows)
+        self.stats["inserted"] += inserted
+        self.stats["duplicates"] += len(fresh) - inserted
+        self.stats["resent"] += len(rows) - len(fresh)
+        return {"acked": new_acked, "ledger": [list(r[1:]) for r in ledger],
+                "ledger_cursor": cursor, "more": more}
+
+    def status(self):
+        with self.lock:
+            kiosks = self.conn.execute("SELECT kiosk, acked, rows, duplicates, last_seen FROM kiosks").fetchall()
+            total = self.conn.execute("SELECT COUNT(*) FROM absensi").fetchone()[0]
+        return {"absensi": total, "stats": self.stats,
+                "kiosks": {k: {"acked": a, "rows": r, "duplicates": d, "last_seen": s}
+                           for k, a, r, d, s in kiosks}}
+
+
+class SyncHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"    # keep-alive: catch-up banyak batch di satu koneksi
+    store = None
+
+    def _send(self, code, body, ctype, encoding=None):
+        self.send_response(code)
+        self.send_header("Content-Type", ctype)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        if self.path != SYNC_PATH:
+            self._send(404, b"not found\n", "text/plain")
+            return
+        body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+        try:
+            resp = self.store.apply(decode(body))
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            self._send(400, f"batch tidak valid: {e}\n".encode(), "text/plain")
+            return
+        self._send(200, encode(resp), "application/json", "deflate")
+
+    def do_GET(self):
+        if self.path == "/status":
+            self._send(200, json.dumps(self.store.status(), indent=1).encode(), "application/json")
+        else:
+            self._send(404, b"not found\n", "text/plain")
+
+    def log_message(self, fmt, *args):
+        pass    # sync tiap beberapa detik per kiosk, tidak perlu access log
+
+
+class UnixHTTPServer(ThreadingHTTPServer):
+    address_family = socket.AF_UNIX
+
+    def server_bind(self):
+        if os.path.exists(self.server_address):
+            os.unlink(self.server_address)    # socket sisa proses sebelumnya
+        socketserver.TCPServer.server_bind(self)
+        self.server_name, self.server_port = "localhost", 0
+
+    def get_request(self):
+        request, _ = super().get_request()
+        return request, ("unix", 0)
+
+
+def serve(store, port=9200, host="0.0.0.0", unix_path=None):
+    handler = type("Handler", (SyncHandler,), {"store": store})
+    if unix_path:
+        return UnixHTTPServer(unix_path, handler)
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Aggregation service absensi multi-kiosk")
+    ap.add_argument("--db", default="pusat.db")
+    ap.add_argument("--host", default="0.0.0.0")
+    ap.add_argument("--port", type=int, default=9200)
+    ap.add_argument("--unix", default=None, help="listen di Unix socket ini (bukan TCP)")
+    args = ap.parse_args()
+
+    store = AggregationStore(args.db)
+    server = serve(store, args.port, args.host, args.unix)
+    where = f"unix:{args.unix}" if args.unix else f"http://{args.host}:{args.port}"
+    print(f"[sync] aggregation service {where}, DB {args.db} ({store.status()['absensi']} absensi)", flush=True)
+    t0 = time.time()
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        print(f"[sync] berhenti setelah {time.time() - t0:.0f}s, {store.stats}")
+
+
+if __name__ == "__main__":
+    main()
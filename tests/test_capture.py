@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from capture import CaptureThread  # noqa: E402
+from frame_ring import FrameRing  # noqa: E402
+from frame_source import open_source  # noqa: E402
+
+SIZE = (160, 120)
+
+
+def make_capture(frames=400):
+    source = open_source(f"synthetic:{frames}", SIZE)
+    ring = FrameRing(3, (SIZE[1], SIZE[0], 3))
+    # kotak sintetis di frame sekecil ini hanya mengubah <1% pixel per frame
+    return CaptureThread(source, ring, lockstep=True, idle_size=SIZE, idle_fps=200.0, idle_motion=0.001), ring
+
+
+def test_lockstep_delivers_every_frame():
+    capture, ring = make_capture(frames=50)
+    capture.start()
+    seen = 0
+    try:
+        while not (capture.done.is_set() and ring.seq == seen):
+            seq, _, _ = ring.wait_newer(seen, timeout=0.5)
+            if seq != seen:
+                assert seq == seen + 1
+                seen = seq
+                ring.consumed(seq)
+    finally:
+        capture.stop()
+    assert seen == 50
+
+
+def test_sleep_after_consumed_frame_does_not_hang():
+    # UI mengambil frame, camera thread sudah menulis frame berikutnya dan menunggu
+    # consumed(), baru kemudian UI memutuskan sleep: camera thread harus tetap masuk idle
+    capture, ring = make_capture()
+    capture.start()
+    try:
+        seq, _, _ = ring.wait_newer(0, timeout=2.0)
+        ring.consumed(seq)
+        ring.wait_newer(seq, timeout=2.0)
+        assert ring.seq == seq + 1 and ring.read_seq == seq
+        capture.sleep()
+        assert capture.wake_event.wait(5.0), "camera thread tidak pernah masuk / keluar dari sleep mode"
+        assert capture.stats["sleeps"] == 1 and capture.stats["wakes"] == 1
+        # setelah bangun, frame yang belum diambil tetap dikirim dan lockstep jalan lagi
+        nxt, _, _ = ring.wait_newer(seq, timeout=2.0)
+        ring.consumed(nxt)
+        assert ring.wait_newer(nxt, timeout=2.0)[0] == nxt + 1
+    finally:
+        capture.stop()
+    assert not capture._thread.is_alive()
+
+
+def test_source_end_while_asleep_sets_done():
+    capture, ring = make_capture(frames=20)
+    capture.idle_motion = 2.0    # tidak pernah bangun
+    capture.start()
+    try:
+        seq, _, _ = ring.wait_newer(0, timeout=2.0)
+        capture.sleep()
+        ring.consumed(seq)
+        assert capture.done.wait(5.0)
+    finally:
+        capture.stop()
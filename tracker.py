@@ -0,0 +1,210 @@
+import itertools
+import time
+
+import cv2
+
+from voting import ACCEPTED, PENDING, REJECTED
+
+# ----------------- CONFIG -----------------
+IOU_MATCH = 0.3          # minimal IoU deteksi <-> track
+MAX_MISSES = 2           # track dibuang setelah N deteksi berturut-turut tidak ketemu
+MIN_CORR = 0.5           # skor template matching minimal untuk update posisi
+CONF_DECAY = 0.995       # confidence identitas turun sedikit tiap frame tracking
+MIN_CONF = 0.5           # di bawah ini identitas harus diverifikasi ulang (encode lagi)
+REVERIFY_SEC = 5.0       # encode ulang track yang sudah dikenal setiap N detik
+UNKNOWN_RETRY_SEC = 1.0  # wajah UNKNOWN dicoba encode lagi paling cepat tiap N detik
+
+
+def iou(a, b):
+    """IoU dua box format face_recognition (top, right, bottom, left)."""
+    top, bottom = max(a[0], b[0]), min(a[2], b[2])
+    left, right = max(a[3], b[3]), min(a[1], b[1])
+    inter = max(0, bottom - top) * max(0, right - left)
+    area_a = (a[2] - a[0]) * (a[1] - a[3])
+    area_b = (b[2] - b[0]) * (b[1] - b[3])
+    union = area_a + area_b - inter
+    return inter / union if union > 0 else 0.0
+
+
+class Track:
+    def __init__(self, track_id, box):
+        self.id = track_id
+        self.box = box
+        self.name = None          # None = belum dikenali / UNKNOWN
+        self.state = PENDING      # pending / accepted / rejected (voting.py)
+        self.evidence = None      # jendela (waktu, name, distance) untuk IdentityVoter
+        self.distance = float("inf")
+        self.confidence = 0.0
+        self.verified_at = None   # waktu terakhir encoding + match
+        self.misses = 0
+        self.template = None
+
+    def __repr__(self):
+        return f"Track({self.id}, {self.name}, {self.state}, conf={self.confidence:.2f})"
+
+
+class FaceTracker:
+    """
+    Asosiasi deteksi ke track (IoU) + update posisi murah (template matching)
+    di frame tanpa deteksi. Identitas di-cache per track, sehingga encoding
+    hanya dijalankan untuk track baru, confidence yang sudah turun, atau saat
+    interval verifikasi ulang lewat.
+
+    Dengan `voter` (voting.IdentityVoter) identitas baru di-commit setelah
+    evidence beberapa encoding cukup; tanpa voter satu match langsung dipakai.
+    """
+
+    def __init__(self, clock=time.monotonic, voter=None):
+        self.clock = clock
+        self.voter = voter
+        self.tracks = []
+        self._ids = itertools.count(1)
+        self.stats = {"tracked_frames": 0, "detections": 0, "faces": 0, "encodes": 0}
+
+    # ----------------- helpers -----------------
+    @staticmethod
+    def _gray(frame):
+        return frame if frame.ndim == 2 else cv2.cvtColor(frame, cv2.COLOR_RGB2GRAY)
+
+    @staticmethod
+    def _crop(gray, box):
+        top, right, bottom, left = box
+        h, w = gray.shape[:2]
+        top, left = max(0, top), max(0, left)
+        bottom, right = min(h, bottom), min(w, right)
+        if bottom - top < 4 or right - left < 4:
+            return None
+        return gray[top:bottom, left:right].copy()
+
+    @staticmethod
+    def _same_face(template, crop):
+        th, tw = template.shape[:2]
+        resized = cv2.resize(crop, (tw, th), interpolation=cv2.INTER_AREA)
+        score = cv2.matchTemplate(resized, template, cv2.TM_CCOEFF_NORMED)[0, 0]
+        return score >= MIN_CORR
+
+    # ----------------- detection frames -----------------
+    def associate(self, frame, faces):
+        """
+        Pasangkan hasil face_locations ke track yang ada.
+        Return list Track sejajar dengan `faces`.
+        """
+        gray = self._gray(frame)
+        self.stats["detections"] += 1
+        self.stats["faces"] += len(faces)
+
+        pairs = sorted(((iou(t.box, f), ti, fi) for ti, t in enumerate(self.tracks)
+                        for fi, f in enumerate(faces)), reverse=True)
+        track_for = [None] * len(faces)
+        used = set()
+        for score, ti, fi in pairs:
+            if score < IOU_MATCH:
+                break
+            if ti in used or track_for[fi] is not None:
+                continue
+            used.add(ti)
+            track_for[fi] = self.tracks[ti]
+
+        for fi, box in enumerate(faces):
+            t = track_for[fi]
+            if t is None:
+                t = Track(next(self._ids), box)
+                self.tracks.append(t)
+                track_for[fi] = t
+            crop = self._crop(gray, box)
+            if t.template is not None and crop is not None and not self._same_face(t.template, crop):
+                # posisi sama tapi wajah beda (orang bergantian di depan kiosk) -> identitas direset
+                t.name, t.confidence, t.verified_at = None, 0.0, None
+                t.state, t.evidence = PENDING, None
+            t.box = box
+            t.misses = 0
+            t.template = crop
+
+        matched = {id(t) for t in track_for}
+        for t in self.tracks:
+            if id(t) not in matched:
+                t.misses += 1
+        self.tracks = [t for t in self.tracks if t.misses <= MAX_MISSES]
+        return track_for
+
+    def needs_encoding(self, track, now=None):
+        now = self.clock() if now is None else now
+        if track.verified_at is None or track.state == PENDING:
+            return True    # track baru / voting belum memutuskan -> encode di tiap deteksi
+        age = now - track.verified_at
+        if track.name is None:
+            return age >= UNKNOWN_RETRY_SEC
+        return track.confidence < MIN_CONF or age >= REVERIFY_SEC
+
+    def set_identity(self, track, name, distance, now=None):
+        """Hasil match satu encoding untuk track (langsung dipakai, atau jadi evidence voter)."""
+        now = self.clock() if now is None else now
+        self.stats["encodes"] += 1
+        track.verified_at = now
+        if self.voter is None:
+            track.name = name
+            track.distance = distance
+            track.confidence = 1.0 if name is not None else 0.0
+            track.state = ACCEPTED if name is not None else REJECTED
+            return
+
+        if track.evidence is None:
+            track.evidence = self.voter.new_evidence()
+        state, voted, dist = self.voter.add(track.evidence, name, distance, now)
+        if state == ACCEPTED:
+            if voted != track.name:
+                self.voter.stats["accepted"] += 1
+                if track.name is not None:
+                    self.voter.stats["flipped"] += 1
+            track.name, track.distance, track.confidence = voted, dist, 1.0
+        elif state == REJECTED:
+            if track.state != REJECTED:
+                self.voter.stats["rejected"] += 1
+            # evidence tidak dibuang: retry tiap UNKNOWN_RETRY_SEC cukup satu encode selama
+            # jendela masih penuh UNKNOWN, sample yang sangat dekat tetap langsung diterima
+            track.name, track.distance, track.confidence = None, float("inf"), 0.0
+        # pending: identitas yang sudah di-commit tetap dipakai sampai voter memutuskan lain
+        track.state = state
+
+    # ----------------- in-between frames -----------------
+    def update(self, frame):
+        """Geser box tiap track dengan template matching di sekitar posisi lama."""
+        self.stats["tracked_frames"] += 1
+        if not self.tracks:
+            return
+        gray = self._gray(frame)
+        h, w = gray.shape[:2]
+        for t in self.tracks:
+            if t.template is None:
+                continue
+            th, tw = t.template.shape[:2]
+            top, right, bottom, left = t.box
+            mx, my = tw // 2, th // 2
+            x0, y0 = max(0, left - mx), max(0, top - my)
+            x1, y1 = min(w, right + mx), min(h, bottom + my)
+            window = gray[y0:y1, x0:x1]
+            if window.shape[0] < th or window.shape[1] < tw:
+                t.confidence *= 0.5
+                continue
+            res = cv2.matchTemplate(window, t.template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, loc = cv2.minMaxLoc(res)
+            if score >= MIN_CORR:
+                nx, ny = x0 + loc[0], y0 + loc[1]
+                t.box = (ny, nx + tw, ny + th, nx)
+                t.confidence *= CONF_DECAY
+            else:
+                t.confidence *= 0.5
+
+    def rescale(self, factor):
+        """Skala frame deteksi berubah (scheduler): sesuaikan box & template."""
+        for t in self.tracks:
+            t.box = tuple(int(round(v * factor)) for v in t.box)
+            if t.template is not None:
+                th, tw = t.template.shape[:2]
+                size = (max(4, int(round(tw * factor))), max(4, int(round(th * factor))))
+                t.template = cv2.resize(t.template, size, interpolation=cv2.INTER_AREA)
+
+    def identified(self):
+        """Track yang identitasnya masih dipercaya, urut dari confidence tertinggi."""
+        good = [t for t in self.tracks if t.name is not None and t.confidence >= MIN_CONF]
+        return sorted(good, key=lambda t: -t.confidence)
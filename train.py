@@ -1,28 +1,136 @@
 import face_recognition
+import argparse
+import cv2
 import os
 import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
-dataset_dir = "dataset"
-encodings = []
-names = []
+from gallery_store import atomic_pickle, file_hash, save_gallery
 
-for person_name in os.listdir(dataset_dir):
-    person_path = os.path.join(dataset_dir, person_name)
-    if not os.path.isdir(person_path):
-        continue
+DATASET_DIR = "dataset"
+ENCODING_FILE = "encodings.pkl"
+GALLERY_FILE = "encodings.gal"    # format biner memmap (gallery_store.py), dipakai absensi.py
+MANIFEST_FILE = "encodings_manifest.pkl"
+TRAIN_MAX_SIDE = 1024    # foto 3280x2464 dari daftar.py di-downscale dulu sebelum HOG
+IMAGE_EXTS = (".jpg", ".jpeg", ".png", ".bmp")
 
-    for image_name in os.listdir(person_path):
-        image_path = os.path.join(person_path, image_name)
-        image = face_recognition.load_image_file(image_path)
-        face_locations = face_recognition.face_locations(image)
-        face_encs = face_recognition.face_encodings(image, face_locations)
 
-        for enc in face_encs:
+def scan_dataset(dataset_dir):
+    """Return {path: (person, mtime, size)} untuk semua foto di dataset/<nama>/."""
+    found = {}
+    for person_name in sorted(os.listdir(dataset_dir)):
+        person_path = os.path.join(dataset_dir, person_name)
+        if not os.path.isdir(person_path):
+            continue
+        for image_name in sorted(os.listdir(person_path)):
+            if not image_name.lower().endswith(IMAGE_EXTS):
+                continue
+            image_path = os.path.join(person_path, image_name)
+            st = os.stat(image_path)
+            found[image_path] = (person_name, st.st_mtime_ns, st.st_size)
+    return found
+
+
+def encode_image(image_path, max_side=TRAIN_MAX_SIDE):
+    """Worker: load, downscale ke working size, HOG detect + encode. Jalan di process pool."""
+    image = face_recognition.load_image_file(image_path)
+    h, w = image.shape[:2]
+    scale = max_side / max(h, w)
+    if scale < 1.0:
+        image = cv2.resize(image, (int(w * scale), int(h * scale)), interpolation=cv2.INTER_AREA)
+    face_locations = face_recognition.face_locations(image)
+    return face_recognition.face_encodings(image, face_locations)
+
+
+def load_manifest(path):
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, "rb") as f:
+            return pickle.load(f)
+    except Exception as e:
+        print("⚠️ Manifest rusak, build ulang dari awal:", e)
+        return {}
+
+
+def build(dataset_dir=DATASET_DIR, output=ENCODING_FILE, manifest_file=MANIFEST_FILE,
+          workers=None, full=False, max_side=TRAIN_MAX_SIDE, gallery_file=GALLERY_FILE):
+    """
+    Incremental build: hanya foto baru/berubah yang di-encode ulang, entry foto
+    yang sudah dihapus ikut dibuang. Return dict statistik.
+    """
+    t0 = time.perf_counter()
+    old = {} if full else load_manifest(manifest_file)
+    found = scan_dataset(dataset_dir)
+
+    manifest, todo = {}, []
+    for path, (person, mtime, size) in found.items():
+        entry = old.get(path)
+        if entry and entry["person"] == person and entry["mtime"] == mtime and entry["size"] == size:
+            manifest[path] = entry
+            continue
+        digest = file_hash(path)
+        if entry and entry["person"] == person and entry["hash"] == digest:
+            # cuma di-touch / di-copy ulang, isi sama
+            manifest[path] = dict(entry, mtime=mtime, size=size)
+            continue
+        todo.append((path, person, mtime, size, digest))
+
+    removed = len(set(old) - set(found))
+
+    if todo:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = {pool.submit(encode_image, t[0], max_side): t for t in todo}
+            for fut in as_completed(futures):
+                path, person, mtime, size, digest = futures[fut]
+                try:
+                    encs = fut.result()
+                except Exception as e:
+                    # tetap dicatat (tanpa encoding) supaya tidak dicoba ulang sampai filenya berubah
+                    print(f"❌ {path}: {e}")
+                    encs = []
+                manifest[path] = {"person": person, "mtime": mtime, "size": size,
+                                  "hash": digest, "encodings": encs}
+                print(f"[OK] {person}/{os.path.basename(path)} trained ({len(encs)} wajah).")
+
+    encodings, names = [], []
+    for path in sorted(manifest):
+        for enc in manifest[path]["encodings"]:
             encodings.append(enc)
-            names.append(person_name)
-        print(f"[OK] {person_name}/{image_name} trained.")
+            names.append(manifest[path]["person"])
+
+    atomic_pickle(manifest, manifest_file)
+    atomic_pickle({"encodings": encodings, "names": names}, output)
+    if gallery_file:
+        save_gallery(gallery_file, encodings, names)
+
+    return {
+        "images": len(found),
+        "encoded": len(todo),
+        "reused": len(found) - len(todo),
+        "removed": removed,
+        "encodings": len(encodings),
+        "seconds": time.perf_counter() - t0,
+    }
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Training face encodings (incremental)")
+    ap.add_argument("--dataset", default=DATASET_DIR)
+    ap.add_argument("--output", default=ENCODING_FILE)
+    ap.add_argument("--manifest", default=MANIFEST_FILE)
+    ap.add_argument("--gallery", default=GALLERY_FILE, help="'' untuk tidak menulis encodings.gal")
+    ap.add_argument("--workers", type=int, default=None, help="default: semua core")
+    ap.add_argument("--full", action="store_true", help="abaikan manifest, encode ulang semua foto")
+    args = ap.parse_args()
+
+    stats = build(args.dataset, args.output, args.manifest, args.workers, args.full,
+                  gallery_file=args.gallery)
+    print(f"[DONE] {stats['images']} foto | {stats['encoded']} di-encode | {stats['reused']} dari cache | "
+          f"{stats['removed']} dihapus | {stats['encodings']} encodings → {args.output} ✅ "
+          f"({stats['seconds']:.1f}s)")
 
-with open("encodings.pkl", "wb") as f:
-    pickle.dump({"encodings": encodings, "names": names}, f)
 
-print("[DONE] Semua wajah sudah ditraining dan disimpan ke encodings.pkl ✅")
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,388 @@
+"""
+TTS offline + satu output audio untuk kiosk.
+
+Semua kalimat per user (MASUK, PULANG, sudah absen) di-render sekali (saat
+start / users.json berubah / setelah pendaftaran) ke WAV di cache dir, lalu
+PCM-nya disimpan di LRU memory. Saat tap, Speaker cukup mengantrekan PCM ke
+satu proses output (aplay) yang hidup terus: tidak ada network, tidak ada
+fork mpg123 per kalimat.
+
+Engine:
+    espeak   espeak-ng lokal (offline, default)
+    gtts     Google TTS (butuh internet), mp3 di-decode dengan mpg123
+    stub     nada sintetis, panjang sebanding teks (test / benchmark)
+
+Pre-render manual (mis. setelah daftar.py):
+    python3 tts.py prerender --users users.json --engine espeak
+"""
+import argparse
+import io
+import json
+import queue
+import shutil
+import subprocess
+import tempfile
+import threading
+import time
+import wave
+from collections import OrderedDict, deque
+
+import numpy as np
+
+from tts_cache import TTSCache, cache_key
+
+TTS_RATE = 22050          # semua clip dikonversi ke mono int16 rate ini
+CHUNK_SEC = 0.02          # granularity tulis ke output
+
+
+def phrases_for(name):
+    """Semua kalimat yang bisa diucapkan untuk satu user."""
+    return {
+        "MASUK": f"Terima kasih, absensi masuk {name} berhasil",
+        "PULANG": f"Terima kasih, absensi pulang {name} berhasil. Hati-hati di jalan.",
+        "SUDAH_MASUK": f"{name} sudah absen MASUK hari ini",
+        "SUDAH_PULANG": f"{name} sudah absen PULANG hari ini",
+    }
+
+
+def resample(pcm, src_rate, dst_rate):
+    if src_rate == dst_rate or len(pcm) == 0:
+        return pcm
+    n = int(round(len(pcm) * dst_rate / src_rate))
+    x = np.linspace(0, len(pcm) - 1, n)
+    return np.interp(x, np.arange(len(pcm)), pcm).astype(np.int16)
+
+
+def read_wav(data):
+    """bytes WAV -> (int16 mono, rate)."""
+    with wave.open(io.BytesIO(data)) as w:
+        rate, ch, width = w.getframerate(), w.getnchannels(), w.getsampwidth()
+        raw = w.readframes(w.getnframes())
+    if width != 2:
+        raise ValueError(f"WAV {width * 8}-bit tidak didukung")
+    pcm = np.frombuffer(raw, dtype=np.int16)
+    if ch > 1:
+        pcm = pcm.reshape(-1, ch).mean(axis=1).astype(np.int16)
+    return pcm, rate
+
+
+def wav_bytes(pcm, rate):
+    buf = io.BytesIO()
+    with wave.open(buf, "wb") as w:
+        w.setnchannels(1)
+        w.setsampwidth(2)
+        w.setframerate(rate)
+        w.writeframes(pcm.astype(np.int16).tobytes())
+    return buf.getvalue()
+
+
+# ----------------- engines -----------------
+class StubEngine:
+    name, version = "stub", "1"
+    lang = voice = ""
+
+    def __init__(self, sec_per_char=0.06, delay=0.0):
+        self.sec_per_char = sec_per_char
+        self.delay = delay    # simulasi waktu render
+
+    def synth(self, text, rate=TTS_RATE):
+        if self.delay:
+            time.sleep(self.delay)
+        n = int(rate * self.sec_per_char * max(1, len(text)))
+        t = np.arange(n) / rate
+        return (np.sin(2 * np.pi * 440 * t) * 8000).astype(np.int16)
+
+
+class EspeakEngine:
+    name, version = "espeak", "1"
+
+    def __init__(self, voice="id", speed=150):
+        self.lang = voice
+        self.voice = f"{voice}+s{speed}"    # ikut key cache: ganti speed = clip baru
+        self._voice = voice
+        self.speed = speed
+        self.binary = shutil.which("espeak-ng") or shutil.which("espeak")
+        if self.binary is None:
+            raise RuntimeError("espeak-ng tidak ditemukan (sudo apt install espeak-ng)")
+
+    def synth(self, text, rate=TTS_RATE):
+        out = subprocess.run([self.binary, "-v", self._voice, "-s", str(self.speed), "--stdout", text],
+                             check=True, capture_output=True).stdout
+        pcm, src_rate = read_wav(out)
+        return resample(pcm, src_rate, rate)
+
+
+class GTTSEngine:
+    name, version = "gtts", "1"
+
+    def __init__(self, lang="id"):
+        from gtts import gTTS    # optional, butuh internet
+        self._gtts = gTTS
+        self.lang = lang
+        self.voice = ""
+        if shutil.which("mpg123") is None:
+            raise RuntimeError("mpg123 tidak ditemukan (dipakai untuk decode mp3 gTTS)")
+
+    def synth(self, text, rate=TTS_RATE):
+        with tempfile.NamedTemporaryFile(suffix=".mp3") as f:
+            self._gtts(text=text, lang=self.lang).save(f.name)
+            raw = subprocess.run(["mpg123", "-q", "-s", "-m", "-r", str(rate), f.name],
+                                 check=True, capture_output=True).stdout
+        return np.frombuffer(raw, dtype=np.int16).copy()
+
+
+def make_engine(spec, lang="id"):
+    if spec == "espeak":
+        return EspeakEngine(voice=lang)
+    if spec == "gtts":
+        return GTTSEngine(lang=lang)
+    if spec == "stub":
+        return StubEngine()
+    raise ValueError(f"TTS engine tidak dikenal: {spec!r}")
+
+
+# ----------------- PCM LRU -----------------
+class PCMCache:
+    """LRU teks -> PCM int16, dibatasi total byte."""
+
+    def __init__(self, max_bytes=32 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            pcm = self._items.get(key)
+            if pcm is not None:
+                self._items.move_to_end(key)
+            return pcm
+
+    def put(self, key, pcm):
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.bytes -= old.nbytes
+            self._items[key] = pcm
+            self.bytes += pcm.nbytes
+            while self.bytes > self.max_bytes and len(self._items) > 1:
+                _, dropped = self._items.popitem(last=False)
+                self.bytes -= dropped.nbytes
+
+    def __len__(self):
+        return len(self._items)
+
+
+# ----------------- output -----------------
+class AudioOutput:
+    """
+    Satu output audio yang hidup terus; clip diantrekan dan dimainkan berurutan.
+    backend "aplay": PCM mentah ke stdin satu proses aplay (ALSA).
+    backend "null": tidak bersuara, tapi tetap real-time (untuk headless / benchmark).
+    """
+
+    def __init__(self, backend="aplay", rate=TTS_RATE, max_queue=8):
+        self.backend = backend
+        self.rate = rate
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._proc = None
+        self._thread = None
+        self._running = False
+        self.stats = {"played": 0, "dropped": 0, "errors": 0}
+
+    def start(self):
+        if self.backend == "aplay" and shutil.which("aplay") is None:
+            print("❌ [audio] aplay tidak ditemukan (alsa-utils), audio dimatikan")
+            self.backend = "null"
+        if self.backend == "aplay":
+            self._open()
+        self._running = True
+        self._thread = threading.Thread(target=self._run, name="audio-out", daemon=True)
+        self._thread.start()
+        return self
+
+    def _open(self):
+        self._proc = subprocess.Popen(
+            ["aplay", "-q", "-t", "raw", "-f", "S16_LE", "-c", "1", "-r", str(self.rate), "-"],
+            stdin=subprocess.PIPE, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    def play(self, pcm, on_start=None):
+        """Antrekan clip; kalau antrean penuh, clip paling lama dibuang."""
+        item = (pcm, on_start)
+        while True:
+            try:
+                self._queue.put_nowait(item)
+                return
+            except queue.Full:
+                try:
+                    self._queue.get_nowait()
+                    self.stats["dropped"] += 1
+                except queue.Empty:
+                    pass
+
+    def stop(self):
+        self._running = False
+        self.play(None)    # bangunkan thread output (tidak blocking walau antrean penuh)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        if self._proc is not None:
+            try:
+                self._proc.stdin.close()
+                self._proc.wait(timeout=2.0)
+            except Exception:
+                self._proc.kill()
+
+    def _write(self, chunk):
+        if self._proc is None:
+            time.sleep(len(chunk) / self.rate)    # null: tetap makan waktu putar
+            return
+        if self._proc.poll() is not None:
+            self._open()    # aplay mati (mis. device dicabut): buka lagi
+        self._proc.stdin.write(chunk.tobytes())
+        self._proc.stdin.flush()
+
+    def _run(self):
+        step = int(self.rate * CHUNK_SEC)
+        while self._running:
+            pcm, on_start = self._queue.get()
+            if pcm is None:
+                return
+            try:
+                if on_start is not None:
+                    on_start()    # chunk pertama mulai diserahkan ke device
+                for i in range(0, len(pcm), step):
+                    self._write(pcm[i:i + step])
+                self.stats["played"] += 1
+            except Exception as e:
+                self.stats["errors"] += 1
+                print("❌ [audio] output error:", e)
+
+
+# ----------------- speaker -----------------
+class Speaker:
+    """
+    speak(text) tidak pernah blocking: PCM diambil dari LRU, lalu WAV di
+    TTSCache (persisten), dan baru kalau dua-duanya miss dirender engine
+    (di thread render). `cache` boleh TTSCache atau path folder.
+    """
+
+    def __init__(self, engine, cache, output=None, lru_bytes=32 * 1024 * 1024):
+        self.engine = engine
+        self.cache = TTSCache(cache) if isinstance(cache, str) else cache
+        self.output = output or AudioOutput()
+        self.pcm = PCMCache(lru_bytes)
+        self._jobs = queue.Queue()
+        self._thread = None
+        self.latency_ms = deque(maxlen=1000)    # tap -> chunk audio pertama ditulis ke output
+        self.observer = None     # callable(stage, detik), mis. histogram metrics
+        self.stats = {"spoken": 0, "lru_hits": 0, "disk_hits": 0, "rendered": 0, "errors": 0}
+
+    def start(self):
+        self.output.start()
+        self._thread = threading.Thread(target=self._run, name="tts", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._jobs.put(None)
+        if self._thread is not None:
+            self._thread.join(timeout=2.0)
+        self.output.stop()
+        self.cache.save()
+
+    def key_for(self, text):
+        e = self.engine
+        return cache_key(text, e.lang, e.voice, e.name, e.version)
+
+    def speak(self, text):
+        t = time.perf_counter()
+        pcm = self.pcm.get(text)
+        if pcm is not None:
+            self.stats["lru_hits"] += 1
+            self._play(pcm, t)
+        else:
+            self._jobs.put(("speak", text, t))
+
+    def prerender_async(self, texts):
+        self._jobs.put(("prerender", list(texts), None))
+
+    def load(self, text):
+        """PCM untuk text: LRU -> WAV di disk -> render engine (lalu disimpan). Dipanggil di thread tts."""
+        pcm = self.pcm.get(text)
+        if pcm is not None:
+            return pcm, "lru"
+        key = self.key_for(text)
+        path = self.cache.get(key)
+        pcm = None
+        if path is not None:
+            try:
+                with open(path, "rb") as f:
+                    pcm, rate = read_wav(f.read())
+                pcm, source = resample(pcm, rate, self.output.rate), "disk"
+                self.stats["disk_hits"] += 1
+            except (OSError, EOFError, ValueError, wave.Error):
+                self.cache.forget(key)    # file hilang / rusak: render ulang
+                pcm = None
+        if pcm is None:
+            pcm = self.engine.synth(text, self.output.rate)
+            self.cache.put(key, wav_bytes(pcm, self.output.rate), text)
+            source = "render"
+            self.stats["rendered"] += 1
+        self.pcm.put(text, pcm)
+        return pcm, source
+
+    def _play(self, pcm, t0):
+        def first_audio():
+            elapsed = time.perf_counter() - t0
+            self.latency_ms.append(elapsed * 1000)
+            if self.observer is not None:
+                self.observer("tts_first_audio", elapsed)
+        self.stats["spoken"] += 1
+        self.output.play(pcm, on_start=first_audio)
+
+    def _run(self):
+        while True:
+            job = self._jobs.get()
+            if job is None:
+                return
+            kind, arg, t0 = job
+            texts = [arg] if kind == "speak" else arg
+            for text in texts:
+                try:
+                    pcm, _ = self.load(text)
+                except Exception as e:
+                    self.stats["errors"] += 1
+                    print(f"❌ [tts] render gagal ({self.engine.name}): {e}")
+                    continue
+                if kind == "speak":
+                    self._play(pcm, t0)
+            if kind == "prerender":
+                print(f"[tts] pre-render {len(texts)} kalimat selesai "
+                      f"({self.stats['rendered']} render, {len(self.pcm)} di memory)")
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Pre-render kalimat TTS untuk semua user")
+    ap.add_argument("command", choices=["prerender"])
+    ap.add_argument("--users", default="users.json")
+    ap.add_argument("--cache-dir", default="/home/telkom/absensi/tts_cache")
+    ap.add_argument("--engine", default="espeak")
+    ap.add_argument("--lang", default="id")
+    args = ap.parse_args()
+
+    with open(args.users) as f:
+        users = json.load(f)
+    speaker = Speaker(make_engine(args.engine, args.lang), args.cache_dir, output=AudioOutput("null"))
+    t = time.perf_counter()
+    n = 0
+    for name in users:
+        for text in phrases_for(name).values():
+            speaker.load(text)
+            n += 1
+    speaker.cache.save()
+    print(f"✅ {n} kalimat untuk {len(users)} user siap di {args.cache_dir} "
+          f"({speaker.stats['rendered']} baru, {time.perf_counter() - t:.1f}s)")
+
+
+if __name__ == "__main__":
+    main()
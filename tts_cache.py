@@ -0,0 +1,158 @@
+"""
+Cache clip TTS persisten, content-addressed.
+
+Key = sha1(teks, bahasa, voice, engine, versi engine), jadi kalimat berbeda
+tidak pernah berbagi file dan ganti engine/voice otomatis membuat clip baru.
+File ditulis atomic (tmp + rename). index.json menyimpan ukuran & waktu
+akses tiap clip, sehingga lookup cukup cek dict tanpa stat ke filesystem;
+index ikut ditulis atomic. Eviction: clip lebih tua dari `max_age_days`
+(tidak diakses) dibuang, lalu LRU sampai total <= `max_bytes`.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+
+INDEX_FILE = "index.json"
+INDEX_VERSION = 1
+
+
+def cache_key(text, lang="", voice="", engine="", engine_version=""):
+    h = hashlib.sha1()
+    for part in (text, lang, voice, engine, engine_version):
+        h.update(str(part).encode("utf-8"))
+        h.update(b"\0")
+    return h.hexdigest()
+
+
+def atomic_write(path, data):
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+class TTSCache:
+    def __init__(self, cache_dir, max_bytes=64 * 1024 * 1024, max_age_days=180, ext=".wav",
+                 save_interval=60.0):
+        self.dir = cache_dir
+        self.max_bytes = max_bytes
+        self.max_age = max_age_days * 86400
+        self.ext = ext
+        self.save_interval = save_interval
+        self._lock = threading.Lock()
+        self._save_lock = threading.Lock()    # satu penulis index.json pada satu waktu
+        self._dirty = False
+        self._last_save = time.time()
+        self.stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+        os.makedirs(cache_dir, exist_ok=True)
+        self.index = self._load_index()
+        self.evict()
+
+    # ----------------- index -----------------
+    def _index_path(self):
+        return os.path.join(self.dir, INDEX_FILE)
+
+    def _load_index(self):
+        try:
+            with open(self._index_path()) as f:
+                data = json.load(f)
+            if data.get("version") == INDEX_VERSION:
+                return data["entries"]
+        except (OSError, ValueError, KeyError):
+            pass
+        return self._rebuild_index()
+
+    def _rebuild_index(self):
+        """Index hilang / rusak: scan folder sekali (sisa .tmp dari crash ikut dibersihkan)."""
+        entries = {}
+        for fn in os.listdir(self.dir):
+            path = os.path.join(self.dir, fn)
+            if ".tmp" in fn:
+                os.remove(path)
+            elif fn.endswith(self.ext):
+                st = os.stat(path)
+                entries[fn[:-len(self.ext)]] = {"size": st.st_size, "atime": st.st_mtime, "text": ""}
+        if entries:
+            print(f"[tts-cache] index dibangun ulang: {len(entries)} clip")
+        self._dirty = True
+        return entries
+
+    def save(self, force=True):
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty or (not force and time.time() - self._last_save < self.save_interval):
+                    return
+                data = json.dumps({"version": INDEX_VERSION, "entries": self.index}).encode("utf-8")
+                self._dirty = False
+                self._last_save = time.time()
+            atomic_write(self._index_path(), data)
+
+    # ----------------- lookup / store -----------------
+    def path(self, key):
+        return os.path.join(self.dir, key + self.ext)
+
+    def get(self, key):
+        """Path clip kalau ada di index (tanpa stat), atau None."""
+        with self._lock:
+            entry = self.index.get(key)
+            if entry is None:
+                self.stats["misses"] += 1
+                return None
+            self.stats["hits"] += 1
+            entry["atime"] = time.time()
+            self._dirty = True
+        self.save(force=False)
+        return self.path(key)
+
+    def put(self, key, data, text=""):
+        atomic_write(self.path(key), data)
+        with self._lock:
+            self.index[key] = {"size": len(data), "atime": time.time(), "text": text[:200]}
+            self.stats["writes"] += 1
+            self._dirty = True
+        self.evict()
+        self.save(force=False)
+        return self.path(key)
+
+    def forget(self, key):
+        """Clip di index tapi filenya hilang (dihapus manual): buang dari index."""
+        with self._lock:
+            self.index.pop(key, None)
+            self._dirty = True
+
+    def evict(self):
+        now = time.time()
+        with self._lock:
+            drop = [k for k, e in self.index.items() if now - e["atime"] > self.max_age]
+            total = sum(e["size"] for e in self.index.values()) - sum(self.index[k]["size"] for k in drop)
+            if total > self.max_bytes:
+                dropped = set(drop)
+                keep = sorted((k for k in self.index if k not in dropped), key=lambda k: self.index[k]["atime"])
+                for k in keep:
+                    if total <= self.max_bytes:
+                        break
+                    drop.append(k)
+                    total -= self.index[k]["size"]
+            for k in drop:
+                del self.index[k]
+            self.stats["evictions"] += len(drop)
+            if drop:
+                self._dirty = True
+        for k in drop:
+            try:
+                os.remove(self.path(k))
+            except OSError:
+                pass
+        return len(drop)
+
+    def total_bytes(self):
+        with self._lock:
+            return sum(e["size"] for e in self.index.values())
+
+    def hit_rate(self):
+        n = self.stats["hits"] + self.stats["misses"]
+        return self.stats["hits"] / n if n else 0.0
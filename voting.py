@@ -0,0 +1,66 @@
+import time
+from collections import deque
+
+PENDING, ACCEPTED, REJECTED = "pending", "accepted", "rejected"
+
+
+class IdentityVoter:
+    """
+    Keputusan identitas per track dari beberapa encoding, bukan satu frame.
+
+    Setiap hasil match (name, distance) untuk sebuah track masuk ke jendela
+    evidence (maks `window` sample, maks `window_sec` detik). Identitas
+    di-commit kalau:
+      - satu sample sudah sangat dekat (distance <= instant_dist), atau
+      - nama yang sama muncul >= min_votes kali, menjadi porsi >= ratio dari
+        jendela, dan rata-rata distance-nya <= accept_dist.
+    Track ditolak (UNKNOWN) kalau >= reject_votes sample tidak cocok dengan
+    siapa pun dan porsinya >= ratio, atau kalau jendela sudah penuh tanpa
+    keputusan (evidence bolak-balik = tidak cukup yakin). Selain itu track
+    tetap pending dan di-encode lagi di deteksi berikutnya.
+    """
+
+    def __init__(self, window=5, window_sec=3.0, min_votes=2, ratio=0.6,
+                 accept_dist=0.42, instant_dist=0.35, reject_votes=3, clock=time.monotonic):
+        self.window = window
+        self.window_sec = window_sec
+        self.min_votes = min_votes
+        self.ratio = ratio
+        self.accept_dist = accept_dist
+        self.instant_dist = instant_dist
+        self.reject_votes = reject_votes
+        self.clock = clock
+        self.stats = {"samples": 0, "accepted": 0, "rejected": 0, "flipped": 0}
+
+    def new_evidence(self):
+        return deque(maxlen=self.window)
+
+    def add(self, evidence, name, distance, now=None):
+        """Tambah satu sample; return (state, name, distance rata-rata nama itu)."""
+        now = self.clock() if now is None else now
+        self.stats["samples"] += 1
+        evidence.append((now, name, distance))
+        while evidence and now - evidence[0][0] > self.window_sec:
+            evidence.popleft()
+        return self.decide(evidence)
+
+    def decide(self, evidence):
+        n = len(evidence)
+        if not n:
+            return PENDING, None, float("inf")
+        _, last_name, last_dist = evidence[-1]
+        if last_name is not None and last_dist <= self.instant_dist:
+            return ACCEPTED, last_name, last_dist
+
+        dists = {}
+        for _, name, dist in evidence:
+            dists.setdefault(name, []).append(dist)
+        unknown = len(dists.pop(None, ()))
+        if dists:
+            name, d = max(dists.items(), key=lambda kv: (len(kv[1]), -sum(kv[1])))
+            votes, mean = len(d), sum(d) / len(d)
+            if votes >= self.min_votes and votes / n >= self.ratio and mean <= self.accept_dist:
+                return ACCEPTED, name, mean
+        if (unknown >= self.reject_votes and unknown / n >= self.ratio) or n >= self.window:
+            return REJECTED, None, float("inf")
+        return PENDING, None, float("inf")